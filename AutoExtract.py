@@ -8,15 +8,9 @@ __version__ = "1.1.0"
 import os
 import sys
 
-# 禁用输出缓冲（必须在最开始！）
-os.environ["PYTHONUNBUFFERED"] = "1"
-if hasattr(sys.stdout, 'reconfigure'):
-    sys.stdout.reconfigure(line_buffering=True)
-else:
-    sys.stdout = os.fdopen(sys.stdout.fileno(), 'w', 1)
-
 # 从 i18n 模块导入
 from i18n import get_system_language, MESSAGES, get_available_languages
+from metrics import MetricsRegistry
 
 class I18N:
     def __init__(self, lang: str):
@@ -24,31 +18,61 @@ class I18N:
             self.lang = get_system_language()
         else:
             self.lang = lang
+        self.messages = MESSAGES[self.lang] if self.lang in MESSAGES else MESSAGES['en']
         self._ = self._get_message
 
     def _get_message(self, key: str, **kwargs) -> str:
-        msg = MESSAGES.get(self.lang, MESSAGES['en']).get(key, f"[MISSING_KEY: {key}]")
+        msg = self.messages.get(key, f"[MISSING_KEY: {key}]")
+        if not kwargs:
+            return msg
         try:
             return msg.format(**kwargs)
         except KeyError as e:
             return f"[FORMAT_ERROR: {key} - {e}] {msg}"
 
+    def lazy(self, key: str, **kwargs) -> 'LazyMessage':
+        """供日志使用的延迟格式化消息：记录被丢弃（级别不足）时不会查表和 format"""
+        return LazyMessage(self, key, kwargs)
+
+class LazyMessage:
+    """
+    延迟格式化的日志消息，只在日志记录真正输出时（后台线程中）才转换为文本。
+    JSON 事件模式下 key 作为事件名，kwargs 作为事件字段。
+    """
+    __slots__ = ('i18n', 'key', 'kwargs', 'suffix')
+
+    def __init__(self, i18n: I18N, key: str, kwargs: dict, suffix: str = ''):
+        self.i18n = i18n
+        self.key = key
+        self.kwargs = kwargs
+        self.suffix = suffix
+
+    def __str__(self) -> str:
+        return self.i18n._get_message(self.key, **self.kwargs) + self.suffix
+
+    def __add__(self, other: str) -> 'LazyMessage':
+        return LazyMessage(self.i18n, self.key, self.kwargs, self.suffix + other)
+
 # =============================================================================
 # 初始化与依赖导入
 # =============================================================================
-import shutil
-import subprocess
+# 这里只导入每次运行都会用到的模块；subprocess、shutil、json、zipfile/tarfile、线程池、
+# archive_headers / stream_extract 等较重的模块在用到它们的函数内导入，空跑时不加载
 import time
 import re
-import filetype
 import logging
-import argparse
-import platform
-from dataclasses import dataclass
-from typing import Set, Dict, Tuple, List, Optional
+import queue
+import threading
+import weakref
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Set, Dict, Tuple, List, Optional, Iterable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from journal import ProcessingJournal
 
 # Windows 注册表支持
-if platform.system() == "Windows":
+if os.name == 'nt':
     try:
         import winreg
     except ImportError:
@@ -63,31 +87,49 @@ CONTEXT_MENU_KEY = "CikeZZZ_AutoExtract"
 
 @dataclass
 class Config:
-    delete_target_files: bool            # 是否删除目标文件
-    delete_empty_folders: bool           # 是否删除空文件夹
-    auto_yes: bool                       # 是否自动确认（是）
-    auto_no: bool                        # 是否自动确认（否）
-    delete_list: List[str]               # 删除列表
-    delete_list_file: Optional[str]      # 删除列表文件路径
-    generate_delete_list_file: bool      # 是否生成删除列表文件
-    language: str                        # 语言
-    add_context_menu: bool               # 是否添加右键菜单
-    remove_context_menu: bool            # 是否移除右键菜单
-    max_unpacked_gb: int                 # 最大允许解压大小（GB）
-    max_files: int                       # 最大允许文件数
-# ---------------- 全局状态 ----------------
-DETECTED_FILES: Set[str] = set()
-FAILED_ARCHIVES: Dict[str, str] = {}
-DETECTION_FAILED: Dict[str, str] = {}
+    delete_target_files: bool = False    # 是否删除目标文件
+    delete_empty_folders: bool = False   # 是否删除空文件夹
+    auto_yes: bool = False               # 是否自动确认（是）
+    auto_no: bool = False                # 是否自动确认（否）
+    delete_list: List[str] = field(default_factory=list)  # 删除列表
+    delete_list_file: Optional[str] = None  # 删除列表文件路径
+    generate_delete_list_file: bool = False  # 是否生成删除列表文件
+    language: str = 'auto'               # 语言
+    add_context_menu: bool = False       # 是否添加右键菜单
+    remove_context_menu: bool = False    # 是否移除右键菜单
+    max_unpacked_gb: int = 50            # 最大允许解压大小（GB）
+    max_files: int = 10000               # 最大允许文件数
+    jobs: int = 1                        # 并行解压任务数
+    watch: bool = False                  # 是否持续监视目录
+    recursive: bool = False              # 是否递归处理子目录
+    max_depth: int = 5                   # 递归的最大目录深度
+    tree_quota: int = 1000               # 每棵顶层子树最多解压的压缩包数
+    use_cache: bool = True               # 是否使用安全分析磁盘缓存
+    runtime_guard: bool = True           # 解压过程中是否实时限制输出大小与文件数
+    separate_folders: bool = False       # 是否把每个压缩包解压到单独的同名文件夹
+    backend: str = 'auto'                # 解压后端：auto（优先进程内解压，回退 7z）、python、7z
+    batch_size: int = 0                  # 每次 7-Zip 调用批量解压的小压缩包数上限（0 表示不批量）
+    metrics_json: Optional[str] = None   # 退出时写出 JSON 指标摘要的路径（'-' 为标准输出）
+    metrics_textfile: Optional[str] = None  # Prometheus textfile collector 文件路径
+    quiet: bool = False                  # 安静模式：只输出汇总、警告与错误
+    log_format: str = 'text'             # 日志格式：text（终端文本）或 json（每行一个 JSON 事件）
+    journal: bool = True                 # 是否记录断点续处理日志（崩溃或中断后从中断处继续）
+    roots: List[str] = field(default_factory=list)  # 要处理的根目录（为空时处理当前目录）
+    roots_file: Optional[str] = None     # 根目录列表文件（每行一个目录，'-' 为标准输入）
+    order: str = 'name'                  # 解压顺序：name（按名称）、smallest（小的优先）、largest（大的优先）
+    dedup: bool = True                   # 是否按内容去重：相同的压缩包只解压一份
+# 处理状态（已处理文件、失败原因等）保存在各自的 Session 中，模块中不保存任何会话状态
 
 # ---------------- 日志配置 ----------------
-logging.basicConfig(
-    format="%(asctime)s | %(levelname)s | %(message)s",
-    level=logging.INFO,
-    datefmt="%Y-%m-%d %H:%M:%S",
-    force=True
-)
+LOG_FORMAT = "%(asctime)s | %(levelname)s | %(message)s"
+LOG_DATEFMT = "%Y-%m-%d %H:%M:%S"
+# 导入本模块不配置日志与标准输出（嵌入方自己的日志处理器保持不变），命令行入口在 main() 中配置
 logger = logging.getLogger(__name__)
+# 介于 INFO 与 WARNING 之间：安静模式下仍会输出的汇总信息
+SUMMARY = 25
+logging.addLevelName(SUMMARY, 'SUMMARY')
+# 仅用于终端排版的记录（分隔线、功能列表等），JSON 事件模式下不输出
+_TEXT_ONLY = {'text_only': True}
 
 # ---------------- 安全配置 ----------------
 SAFE_EXTENSIONS = {
@@ -108,74 +150,170 @@ SUPPORTED_ARCHIVE_TYPES = {'rar', 'zip', '7z', 'gz', 'bz2', 'xz', 'lzma', 'tar',
 
 VOLUME_PATTERNS = [
     re.compile(r'(part|vol|volume)[_-]?(\d+)', re.IGNORECASE | re.UNICODE),
-    re.compile(r'\.z(\d+)', re.IGNORECASE | re.UNICODE),
+    re.compile(r'\.z(\d+)$', re.IGNORECASE | re.UNICODE),
     re.compile(r'\.(\d{3})$', re.IGNORECASE | re.UNICODE)
 ]
+# 与 VOLUME_PATTERNS 一一对应的分卷方案名
+VOLUME_SCHEMES = ('part', 'zip_split', 'numbered')
+
+# ---------------- 解压运行时配置 ----------------
+EXTRACTION_MIN_TIMEOUT = 300            # 单个压缩包的最短解压时限（秒）
+EXTRACTION_STALL_TIMEOUT = 120          # 无任何进度超过该时间即视为卡死（秒）
+EXTRACTION_TIMEOUT_SLACK = 3            # 时限 = 预计耗时 × 该系数
+INITIAL_THROUGHPUT = 20 * 1024**2       # 尚无实测数据时假定的解压吞吐量（字节/秒）
+MIN_THROUGHPUT = 1 * 1024**2            # 吞吐量估计的下限（字节/秒）
+THROUGHPUT_SAMPLE_MIN_BYTES = 64 * 1024**2  # 只用足够大的解压更新吞吐量估计
+GUARD_POLL_INTERVAL = 0.5               # 守护线程检查进度与输出大小的间隔（秒）
+PROGRESS_LOG_INTERVAL = 10              # 长时间解压时输出进度的间隔（秒）
+STREAM_CHUNK_SIZE = 1024 * 1024         # 解压数据流转发给 tar 解包进程的块大小（字节）
+# 这些 tar 包由一个 7z 进程解压成数据流，直接管道给另一个 7z 进程解包，不落地中间 .tar
+COMPRESSED_TARBALL_EXTENSIONS = ('.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tbz', '.tar.xz', '.txz')
+
+# ---------------- 磁盘空间预留配置 ----------------
+DISK_HEADROOM_BYTES = 1 * 1024**3       # 扣除全部预留后仍须保留的剩余空间（字节）
+DISK_RESERVE_SLACK = 0.1                # 预留量 = 预计解压大小 × (1 + 该比例)，覆盖文件系统开销
+
+# ---------------- 去重配置 ----------------
+HASH_CHUNK_SIZE = 1024 * 1024           # 计算内容摘要时每次读取的字节数（页大小的整数倍，读取位置始终对齐）
+HASH_WORKERS = 4                        # 并发计算摘要的线程数
+
+# ---------------- 批量解压配置 ----------------
+BATCH_MAX_ARCHIVE_BYTES = 8 * 1024**2   # 不超过该大小的压缩包才参与批量解压（字节）
+BATCH_LIST_FILE = ".batch-list.txt"     # 暂存目录中传给 7z 的列表文件名
+
+# ---------------- 解压暂存配置 ----------------
+# 每个压缩包先解压到目标目录内的隐藏暂存目录（与目标同一文件系统），成功后再以重命名提交
+STAGING_PREFIX = ".autoextract-"
+FILE_ATTRIBUTE_HIDDEN = 0x2
+
+# ---------------- 断点续处理配置 ----------------
+# 追加式状态日志位于处理根目录内；以暂存前缀开头，因此索引、递归与监视都会忽略它
+JOURNAL_FILE = STAGING_PREFIX + "journal.jsonl"
+
+# ---------------- 多根目录调度配置 ----------------
+# Ctrl+C 后等待各根目录的处理线程收尾（关闭日志、写回缓存）的最长时间（秒）
+SESSION_SHUTDOWN_GRACE = 10
+
+# ---------------- 缓存配置 ----------------
+CACHE_MAX_ENTRIES = 50000
+SAFETY_CACHE_FILE = "safety_cache.json"
+SAFETY_CACHE_VERSION = 3        # 3：不再缓存超时与“无法列出”的结果
+DETECTION_CACHE_FILE = "detection_cache.json"
+DETECTION_CACHE_VERSION = 1
+HASH_CACHE_FILE = "hash_cache.json"
+HASH_CACHE_VERSION = 1
+DETECTION_WORKERS = 16          # 并发读取文件头的线程数（用于掩盖网络存储的 I/O 延迟）
+# read_archive_listing 表示“读取元数据超时”的返回值（不写入缓存）
+LISTING_TIMEOUT = "timeout"
+
+# ---------------- 监视模式配置 ----------------
+WATCH_POLL_INTERVAL = 1.0      # 无 inotify 时的轮询间隔（秒）
+WATCH_SETTLE_SECONDS = 0.05    # 收到事件后等待后续事件合并的静默时间（秒）
+WATCH_MAX_BATCH_SECONDS = 0.5  # 单批事件最长合并时间（秒）
+WATCH_STOP_CHECK_SECONDS = 0.5  # 等待事件时检查停止请求的间隔（秒）
+
+# ---------------- 清理配置 ----------------
+CLEANUP_WORKERS = 16           # 并行遍历与删除的线程数
+CLEANUP_ERROR_LOG_LIMIT = 20   # 逐条输出的删除失败数上限，其余只计入汇总
+
+# ---------------- 运行指标 ----------------
+# 各阶段的计数器与耗时直方图，退出时按 --metrics-json / --metrics-textfile 导出
+METRICS = MetricsRegistry()
+METRIC_HELP = {
+    'stage_seconds': "Wall time of one detect/extract pass over a directory",
+    'scandir_seconds': "Time spent in a full directory scan",
+    'scandir_entries_total': "Directory entries seen by full scans",
+    'detection_calls_total': "Archive signature detections",
+    'detection_cache_hits_total': "Signature detections answered from the detection cache",
+    'listing_seconds': "Latency of reading an archive listing, by source",
+    'listing_timeouts_total': "Archive listings that timed out",
+    'extraction_seconds': "Time spent extracting archives, by backend",
+    'extracted_bytes_total': "Bytes written by extraction, by backend",
+    'extracted_entries_total': "Files and folders written by extraction, by backend",
+    'archives_total': "Archives handled, by result",
+    'deleted_total': "Deleted files and folders, by kind",
+    'journal_recoveries_total': "Interrupted extractions finished or rolled back from the journal, by action",
+    'queue_wait_seconds': "Time extraction tasks waited in the global worker queue",
+    'disk_reserved_bytes': "Disk space currently reserved for in-flight extractions and not yet written",
+    'disk_waits_total': "Extractions that waited for in-flight extractions to release disk space",
+    'hashed_bytes_total': "Bytes read to compute content hashes for deduplication",
+    'hash_cache_hits_total': "Content hashes answered from the hash cache",
+    'sleep_seconds_total': "Time spent sleeping between passes or polls",
+    'run_duration_seconds': "Seconds since the run started",
+    'last_export_timestamp_seconds': "Unix time of the last metrics export",
+}
+for _name, _text in METRIC_HELP.items():
+    METRICS.describe(_name, _text)
 
 # =============================================================================
 # 工具函数
 # =============================================================================
 
-def mark_file_as_processed(
-    file_path: str,
-    *,
-    failed_reason: Optional[str] = None,
-    is_detection_failed: bool = False
-) -> None:
-    """标记文件为已处理，记录失败原因（如果有）"""
-    DETECTED_FILES.add(file_path)
-    if failed_reason:
-        if is_detection_failed:
-            DETECTION_FAILED[file_path] = failed_reason
-        else:
-            FAILED_ARCHIVES[file_path] = failed_reason
+@dataclass
+class VolumeInfo:
+    """文件名的分卷解析结果"""
+    number: int       # 分卷号
+    group_key: str    # 分卷组键（含方案名，不同方案的同名分卷互不混淆）
+    scheme: str       # 分卷方案，取值见 VOLUME_SCHEMES
 
-def get_volume_number(filename: str) -> Tuple[bool, int, Optional[re.Pattern]]:
-    """分析文件名，判断是否为分卷文件，并返回分卷号及匹配的正则模式"""
-    for pattern in VOLUME_PATTERNS:
+def parse_volume(filename: str) -> Optional[VolumeInfo]:
+    """对文件名做一次分卷解析，非分卷文件返回 None"""
+    for scheme, pattern in zip(VOLUME_SCHEMES, VOLUME_PATTERNS):
         match = pattern.search(filename)
         if match:
             for group in match.groups():
                 if group and group.isdigit():
-                    return (True, int(group), pattern)
-    return (False, 0, None)
+                    return VolumeInfo(int(group), f"{scheme}:{_volume_group_key(filename, pattern)}", scheme)
+    return None
+
+def get_volume_number(filename: str) -> Tuple[bool, int, Optional[re.Pattern]]:
+    """分析文件名，判断是否为分卷文件，并返回分卷号及匹配的正则模式"""
+    info = parse_volume(filename)
+    if info is None:
+        return (False, 0, None)
+    return (True, info.number, VOLUME_PATTERNS[VOLUME_SCHEMES.index(info.scheme)])
 
 def is_first_volume(filename: str) -> bool:
     """判断文件是否为分卷的第一卷"""
-    is_volume, number, _ = get_volume_number(filename)
-    return is_volume and number == 1
+    info = parse_volume(filename)
+    return info is not None and info.number == 1
 
 def get_volume_group_key(filename: str) -> Optional[str]:
     """获取分卷组的键，用于识别属于同一分卷组的文件"""
-    is_volume, _, pattern = get_volume_number(filename)
-    if not is_volume:
-        return None
+    info = parse_volume(filename)
+    return info.group_key if info else None
+
+def _volume_group_key(filename: str, pattern: re.Pattern) -> str:
+    """根据已匹配的分卷正则计算分卷组键"""
     base = pattern.sub('', filename, count=1)
     ext = next((e for e in ARCHIVE_EXTENSIONS if base.lower().endswith(e)), '')
-    return f"{base[:-len(ext)].lower()}|{ext}"
+    return f"{base[:len(base) - len(ext)].lower()}|{ext}"
+
+def _zip_split_group_key(filename: str) -> Optional[str]:
+    """foo.zip 作为 foo.z01、foo.z02… 的末卷时所属的分卷组键"""
+    if not filename.lower().endswith('.zip'):
+        return None
+    return f"zip_split:{filename[:-4].lower()}|"
 
-def _check_files() -> Tuple[bool, bool]:
-    """检查当前目录下是否有未检测的文件或压缩包"""
+def is_compressed_tarball(name: str) -> bool:
+    """是否为可单遍解压的压缩 tar 包（.tar.gz / .tar.bz2 / .tar.xz 及其简写）"""
+    return name.lower().endswith(COMPRESSED_TARBALL_EXTENSIONS)
+
+def is_staging_name(name: str) -> bool:
+    """是否为解压暂存目录（索引、递归与监视均忽略这些目录）"""
+    return name.startswith(STAGING_PREFIX)
+
+def _check_files(index: 'DirectoryIndex') -> Tuple[bool, bool]:
+    """检查索引前沿中是否有未检测的文件或压缩包"""
     has_undetected = False
     has_archives = False
-    current_dir = os.getcwd()
-    with os.scandir(current_dir) as entries:
-        for entry in entries:
-            if not entry.is_file():
-                continue
-            if (entry.path in DETECTED_FILES or
-                entry.path in FAILED_ARCHIVES or
-                entry.path in DETECTION_FAILED):
-                continue
-            name = entry.name
-            is_volume, _, _ = get_volume_number(name)
-            is_known_archive = any(name.lower().endswith(ext) for ext in ARCHIVE_EXTENSIONS)
-            if is_known_archive or is_volume:
-                has_archives = True
-            else:
-                has_undetected = True
-            if has_undetected and has_archives:
-                break
+    for entry in index.pending_entries():
+        if entry.is_archive_candidate:
+            has_archives = True
+        else:
+            has_undetected = True
+        if has_undetected and has_archives:
+            break
     return has_undetected, has_archives
 
 def get_executable_path() -> str:
@@ -185,14 +323,262 @@ def get_executable_path() -> str:
     else:
         return os.path.abspath(sys.argv[0])
 
+# =============================================================================
+# 目录索引
+# =============================================================================
+
+@dataclass
+class IndexEntry:
+    """目录索引中的单个文件，分类结果只在加入索引时计算一次"""
+    name: str
+    path: str
+    volume: Optional[VolumeInfo]
+    is_known_archive: bool
+
+    @property
+    def is_volume(self) -> bool:
+        return self.volume is not None
+
+    @property
+    def volume_number(self) -> int:
+        return self.volume.number if self.volume else 0
+
+    @property
+    def group_key(self) -> Optional[str]:
+        return self.volume.group_key if self.volume else None
+
+    @property
+    def is_archive_candidate(self) -> bool:
+        return self.is_known_archive or self.is_volume
+
+def classify_entry(root: str, name: str) -> IndexEntry:
+    """对文件名做一次性分类（分卷信息 + 已知压缩扩展名）"""
+    name_lower = name.lower()
+    return IndexEntry(
+        name=name,
+        path=os.path.join(root, name),
+        volume=parse_volume(name),
+        is_known_archive=any(name_lower.endswith(ext) for ext in ARCHIVE_EXTENSIONS),
+    )
+
+@dataclass
+class VolumeSet:
+    """
+    一个分卷组：按卷号排序的成员、交给 7-Zip 打开的入口文件以及预计的压缩数据总量。
+
+    完整性只根据文件名判断（卷号是否从 1 开始连续、zip 分卷的 .zip 末卷是否存在），
+    不需要调用 7-Zip，因此不完整的分卷组可以很廉价地推迟处理。
+    """
+    group_key: str
+    scheme: str
+    members: List[IndexEntry]          # 按卷号排序
+    entry_point: Optional[IndexEntry]  # 解压入口（通常为第一卷，zip 分卷为 .zip 文件）
+    total_size: int = 0                # 全部现存成员的字节数之和
+
+    @property
+    def name(self) -> str:
+        return (self.entry_point or self.members[0]).name
+
+    @property
+    def paths(self) -> List[str]:
+        """分卷组包含的全部文件（解压成功后一并删除）"""
+        paths = [entry.path for entry in self.members]
+        if self.entry_point is not None and self.entry_point.path not in paths:
+            paths.append(self.entry_point.path)
+        return paths
+
+    def missing(self) -> List[str]:
+        """返回缺失的分卷（卷号或 .zip 末卷），完整时返回空列表"""
+        numbers = {entry.volume_number for entry in self.members}
+        missing = [str(n) for n in range(1, max(numbers)) if n not in numbers]
+        if self.scheme == 'zip_split' and self.entry_point is None:
+            missing.append('.zip')
+        return missing
+
+class DirectoryIndex:
+    """
+    目录的内存索引，由各处理阶段共享。
+
+    只在创建时全量扫描一次，之后根据重命名、删除以及每次解压实际写出的文件增量更新。
+    pending 为增量前沿：尚未被任何阶段最终处理的文件；archives 为当前存在的压缩包候选；
+    subdirs 为直接子目录（递归模式的下一层工作项）。tree 为所属顶层子树，用于配额统计。
+    session 为所属会话，文件是否已处理由它判断。
+    """
+
+    def __init__(self, root: str, session: 'Session', tree: str = '.'):
+        self.root = root
+        self.session = session
+        self.tree = tree
+        self.entries: Dict[str, IndexEntry] = {}
+        self.pending: Set[str] = set()
+        self.archives: Set[str] = set()
+        self.volume_groups: Dict[str, Set[str]] = {}
+        self.subdirs: Set[str] = set()
+        self._lock = threading.Lock()
+        self.scan()
+
+    def scan(self) -> None:
+        """全量扫描目录，同步新增与消失的文件（仅在初始化或无法获知解压产物时使用）"""
+        present = set()
+        subdirs = set()
+        seen = 0
+        with METRICS.timer('scandir_seconds'), os.scandir(self.root) as entries:
+            for entry in entries:
+                seen += 1
+                if is_staging_name(entry.name):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.add(entry.name)
+                elif entry.is_file():
+                    present.add(entry.name)
+        METRICS.inc('scandir_entries_total', seen)
+        with self._lock:
+            self.subdirs = subdirs
+            for name in list(self.entries):
+                if name not in present:
+                    self._remove(name)
+            for name in present:
+                if name not in self.entries:
+                    self._add(name)
+
+    def _add(self, name: str) -> None:
+        entry = classify_entry(self.root, name)
+        self.entries[name] = entry
+        self.pending.add(name)
+        if entry.is_archive_candidate:
+            self.archives.add(name)
+        if entry.group_key:
+            self.volume_groups.setdefault(entry.group_key, set()).add(name)
+
+    def _remove(self, name: str) -> None:
+        entry = self.entries.pop(name, None)
+        if entry is None:
+            return
+        self.pending.discard(name)
+        self.archives.discard(name)
+        if entry.group_key:
+            members = self.volume_groups.get(entry.group_key)
+            if members is not None:
+                members.discard(name)
+                if not members:
+                    del self.volume_groups[entry.group_key]
+
+    def add(self, name: str) -> None:
+        """加入（或重新加入）一个文件；文件已不存在时将其移出索引"""
+        exists = os.path.isfile(os.path.join(self.root, name)) and not is_staging_name(name)
+        with self._lock:
+            self._remove(name)
+            if exists:
+                self._add(name)
+
+    def remove(self, name: str) -> None:
+        with self._lock:
+            self._remove(name)
+
+    def rename(self, old_name: str, new_name: str) -> None:
+        with self._lock:
+            self._remove(old_name)
+            self._add(new_name)
+
+    def add_subdir(self, name: str) -> None:
+        """记录新出现的直接子目录"""
+        with self._lock:
+            self.subdirs.add(name)
+
+    def add_outputs(self, names: List[str]) -> None:
+        """记录一次解压写出的顶层文件；无法获知产物时退化为全量扫描"""
+        existing = [name for name in names if os.path.isfile(os.path.join(self.root, name))]
+        dirs = [name for name in names if os.path.isdir(os.path.join(self.root, name))]
+        if names and not existing and not dirs:
+            self.scan()
+            return
+        for name in existing:
+            self.add(name)
+        with self._lock:
+            self.subdirs.update(dirs)
+
+    def pending_entries(self) -> List[IndexEntry]:
+        """返回前沿中尚未处理的条目，并顺带剔除已处理的文件"""
+        with self._lock:
+            done = [name for name in self.pending if self.session.is_processed(self.entries[name].path)]
+            self.pending.difference_update(done)
+            return [self.entries[name] for name in sorted(self.pending)]
+
+    def archive_entries(self) -> List[IndexEntry]:
+        """返回当前存在的压缩包候选（含分卷）"""
+        with self._lock:
+            return [self.entries[name] for name in sorted(self.archives)]
+
+    def volume_sets(self) -> List[VolumeSet]:
+        """按分卷组构建 VolumeSet（成员的分卷信息在加入索引时已解析，这里只做分组与求和）"""
+        with self._lock:
+            groups = [(key, [self.entries[name] for name in names])
+                      for key, names in sorted(self.volume_groups.items())]
+            zip_tails = {}
+            if any(key.startswith('zip_split:') for key, _ in groups):
+                for name in self.archives:
+                    key = _zip_split_group_key(name)
+                    if key in self.volume_groups:
+                        zip_tails[key] = self.entries[name]
+        sets = []
+        for key, members in groups:
+            members.sort(key=lambda entry: (entry.volume_number, entry.name))
+            scheme = members[0].volume.scheme
+            if scheme == 'zip_split':
+                entry_point = zip_tails.get(key)
+            else:
+                entry_point = members[0] if members[0].volume_number == 1 else None
+            total_size = 0
+            for entry in members + ([entry_point] if scheme == 'zip_split' and entry_point else []):
+                try:
+                    total_size += os.path.getsize(entry.path)
+                except OSError:
+                    pass
+            sets.append(VolumeSet(key, scheme, members, entry_point, total_size))
+        return sets
+
+    def volume_set_of(self, name: str) -> Optional[VolumeSet]:
+        """返回文件所属的分卷组（包括作为 zip 分卷末卷的 .zip 文件）"""
+        path = os.path.join(self.root, name)
+        return next((volume_set for volume_set in self.volume_sets() if path in volume_set.paths), None)
+
+class TreeQuota:
+    """
+    递归模式下每棵顶层子树在一轮处理中允许解压的压缩包数量（防止嵌套炸弹无限展开）。
+
+    根目录自身（tree 为 '.'）的压缩包不计入：配额限制的是解压产物中层层嵌套的压缩包，
+    而不是用户放入根目录的压缩包数。每轮处理开始时清零，监视模式下的名额不会随运行时间耗尽。
+    """
+    ROOT = '.'
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts.clear()
+
+    def acquire(self, tree: str) -> bool:
+        """为 tree 占用一个名额，超出配额时返回 False"""
+        if tree == self.ROOT:
+            return True
+        with self._lock:
+            used = self.counts.get(tree, 0)
+            if self.limit and used >= self.limit:
+                return False
+            self.counts[tree] = used + 1
+            return True
+
 # =============================================================================
 # 右键菜单管理（仅 Windows）
 # =============================================================================
 
 def add_to_context_menu(i18n: I18N) -> None:
     """将程序添加到右键菜单（仅 Windows）"""
-    if platform.system() != "Windows" or winreg is None:
-        logger.error(i18n._('not_windows'))
+    if os.name != 'nt' or winreg is None:
+        logger.error(i18n.lazy('not_windows'))
         sys.exit(1)
 
     exe_path = get_executable_path()
@@ -214,19 +600,19 @@ def add_to_context_menu(i18n: I18N) -> None:
         winreg.CloseKey(key2)
 
         cmd2 = winreg.CreateKey(winreg.HKEY_CLASSES_ROOT, f"Directory\\Background\\shell\\{CONTEXT_MENU_KEY}\\command")
-        winreg.SetValue(cmd2, "", winreg.REG_SZ, f'cmd /c "cd /d \"%V\" && \"{exe_path}\" -y"')
+        winreg.SetValue(cmd2, "", winreg.REG_SZ, f'"{exe_path}" -y "%V"')
         winreg.CloseKey(cmd2)
 
-        logger.info(i18n._('context_menu_added', path=exe_path))
+        logger.info(i18n.lazy('context_menu_added', path=exe_path))
         sys.exit(0)
     except OSError as e:
-        logger.error(i18n._('context_menu_add_failed', error=str(e)))
+        logger.error(i18n.lazy('context_menu_add_failed', error=str(e)))
         sys.exit(1)
 
 def remove_from_context_menu(i18n: I18N) -> None:
     """从右键菜单中移除程序入口（仅 Windows）"""
-    if platform.system() != "Windows" or winreg is None:
-        logger.error(i18n._('not_windows'))
+    if os.name != 'nt' or winreg is None:
+        logger.error(i18n.lazy('not_windows'))
         sys.exit(1)
 
     try:
@@ -235,308 +621,2317 @@ def remove_from_context_menu(i18n: I18N) -> None:
         winreg.DeleteKey(winreg.HKEY_CLASSES_ROOT, f"Directory\\shell\\{CONTEXT_MENU_KEY}")
         winreg.DeleteKey(winreg.HKEY_CLASSES_ROOT, f"Directory\\Background\\shell\\{CONTEXT_MENU_KEY}\\command")
         winreg.DeleteKey(winreg.HKEY_CLASSES_ROOT, f"Directory\\Background\\shell\\{CONTEXT_MENU_KEY}")
-        logger.info(i18n._('context_menu_removed'))
+        logger.info(i18n.lazy('context_menu_removed'))
         sys.exit(0)
     except OSError as e:
-        logger.error(i18n._('context_menu_remove_failed', error=str(e)))
+        logger.error(i18n.lazy('context_menu_remove_failed', error=str(e)))
         sys.exit(1)
 
+# =============================================================================
+# 持久化缓存
+# =============================================================================
+
+def get_cache_dir() -> str:
+    """返回本程序的用户缓存目录（Windows 使用 LOCALAPPDATA，其余遵循 XDG）"""
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'AutoExtract')
+
+class FileResultCache:
+    """
+    按文件身份缓存分析结果的磁盘缓存，键为 (设备, inode, 大小, mtime_ns)，按 LRU 淘汰。
+    文件内容未变时无需重新读取；version 变化时旧缓存整体失效。
+    """
+
+    def __init__(self, path: str, version: int, max_entries: int = CACHE_MAX_ENTRIES):
+        self.path = path
+        self.version = version
+        self.max_entries = max_entries
+        self.entries: 'OrderedDict[str, object]' = OrderedDict()
+        self.dirty = False
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # 多个会话可能同时写回，临时文件名相同，必须串行
+        self.load()
+
+    @staticmethod
+    def make_key(st: os.stat_result) -> str:
+        return f"{st.st_dev}:{st.st_ino}:{st.st_size}:{st.st_mtime_ns}"
+
+    def load(self) -> None:
+        import json
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.version:
+                self.entries = OrderedDict((key, value) for key, value in data['entries'])
+        except (OSError, ValueError, KeyError, TypeError):
+            self.entries = OrderedDict()
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            if key not in self.entries:
+                return default
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+    def put(self, key: str, value) -> None:
+        with self._lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self.dirty = True
+
+    def save(self) -> None:
+        """原子写回缓存文件（仅在有变化时）"""
+        import json
+        with self._lock:
+            if not self.dirty:
+                return
+            data = {'version': self.version, 'entries': list(self.entries.items())}
+            self.dirty = False
+        with self._save_lock:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                # 同一进程中的多个引擎可能共用缓存目录：临时文件名带上线程号，互不覆盖
+                tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, separators=(',', ':'))
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.debug(f"Failed to save cache {self.path}: {e}")
+
+_CACHE_MISS = object()
+
+# =============================================================================
+# 断点续处理日志
+# =============================================================================
+
+def _finish_commit(session: 'Session', journal: 'ProcessingJournal', archive_path: str, record: dict) -> None:
+    """完成上次运行中已完整解压、但尚未提交或尚未删除源文件的压缩包"""
+    i18n = session.i18n
+    name = os.path.basename(archive_path)
+    try:
+        output = journal.resolve(record['output'])
+        if os.path.isdir(output):
+            # 提交可能进行到一半：已移走的条目不在暂存目录中，只需继续移动其余条目
+            root = journal.resolve(record['root'])
+            session.add_outputs(archive_path, root, commit_staging_dir(output, root, record.get('folder')))
+        for rel_path, key in record.get('sources', ()):
+            path = journal.resolve(rel_path)
+            try:
+                if FileResultCache.make_key(os.stat(path)) != key:
+                    continue
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            METRICS.inc('deleted_total', kind='source')
+        METRICS.inc('journal_recoveries_total', action='committed')
+        session.record_outcome(archive_path, 'resumed')
+        logger.info(i18n.lazy('journal_committed', name=name))
+    except (KeyError, ValueError, OSError) as e:
+        logger.error(i18n.lazy('unzip_failed', name=name, error=f"Resume failed: {e}"))
+
+def resume_from_journal(session: 'Session', journal: 'ProcessingJournal') -> None:
+    """
+    按上次运行遗留的日志恢复到一致状态：
+    detected / analyzed 回填检测与安全分析缓存，重启后不必重新读取这些文件；
+    extracting 表示解压未完成，丢弃其暂存目录，压缩包仍在原处，稍后正常重新解压；
+    committing / committed 表示解压已完整，完成提交并删除源文件，不会在已有结果上重复解压。
+    """
+    for record in journal.replay():
+        if record['state'] == 'detected' and session.detection_cache is not None:
+            session.detection_cache.put(record['key'], record['kind'])
+        elif (record['state'] == 'analyzed' and session.safety_cache is not None
+                and isinstance(record.get('listing'), list)):
+            session.safety_cache.put(record['key'], record['listing'])
+    leftovers: Set[str] = set()
+    finished = discarded = 0
+    for rel_path, record in journal.last_states().items():
+        state = record['state']
+        if state in ('committing', 'committed'):
+            _finish_commit(session, journal, journal.resolve(rel_path), record)
+            finished += 1
+        elif state == 'extracting':
+            staging = journal.resolve(record['staging'])
+            if os.path.isdir(staging):
+                METRICS.inc('journal_recoveries_total', action='discarded')
+                discarded += 1
+        if state in ('extracting', 'committing', 'committed') and record.get('staging'):
+            leftovers.add(journal.resolve(record['staging']))
+    for staging in sorted(leftovers):
+        # 只删除日志中记录过的暂存目录，不碰其他进程可能正在使用的同类目录
+        if is_staging_name(os.path.basename(staging)) and os.path.isdir(staging):
+            discard_staging_dir(staging)
+    if finished or discarded:
+        logger.log(SUMMARY, session.i18n.lazy('journal_resumed', finished=finished, discarded=discarded))
+    session.checkpoint()
+
+def open_journal(session: 'Session') -> None:
+    """启用会话根目录的断点续处理日志；存在遗留日志说明上次运行没有正常结束，先据此恢复"""
+    from journal import ProcessingJournal
+    path = os.path.join(session.root, JOURNAL_FILE)
+    try:
+        session.journal = ProcessingJournal(path, session.root)
+    except OSError as e:
+        logger.warning(session.i18n.lazy('journal_unavailable', path=path, error=e))
+        return
+    if session.journal.records:
+        resume_from_journal(session, session.journal)
+
+def close_journal(session: 'Session', completed: bool) -> None:
+    """
+    关闭日志：正常完成时删除日志文件；被中断时保留，下次运行从中断处继续。
+    中断时日志中没有待重放的记录（例如监视模式在两批处理之间按下 Ctrl+C，上一批已在检查点清空）同样删除。
+    """
+    journal = session.journal
+    if journal is None:
+        return
+    if journal.error is not None:
+        logger.warning(session.i18n.lazy('journal_unavailable', path=journal.path, error=journal.error))
+    journal.close(remove=completed or not journal.pending)
+    session.journal = None
+
 # =============================================================================
 # 文件检测与重命名
 # =============================================================================
 
-def detect_and_rename_archives(i18n: I18N) -> None:
+def sniff_file(session: 'Session', path: str) -> Optional[Tuple[str, str]]:
+    """读取文件头并按签名识别压缩格式，返回 (扩展名, MIME) 或 None；结果按文件身份缓存"""
+    from archive_headers import sniff_archive_type, SNIFF_SIZE
+    METRICS.inc('detection_calls_total')
+    cache = session.detection_cache
+    key = None
+    if cache is not None:
+        key = FileResultCache.make_key(os.stat(path))
+        cached = cache.get(key, _CACHE_MISS)
+        if cached is not _CACHE_MISS:
+            METRICS.inc('detection_cache_hits_total')
+            return tuple(cached) if cached else None
+    with open(path, 'rb') as f:
+        kind = sniff_archive_type(f.read(SNIFF_SIZE))
+    if key is not None:
+        cache.put(key, list(kind) if kind else None)
+        session.journal_record(path, 'detected', key=key, kind=list(kind) if kind else None)
+    return kind
+
+def _sniff_or_error(session: 'Session', path: str):
+    """线程池任务：返回识别结果，出错时返回异常对象"""
+    try:
+        return sniff_file(session, path)
+    except OSError as e:
+        return e
+
+def detect_and_rename_archives(session: 'Session', index: DirectoryIndex) -> None:
     """检测未知文件类型并重命名为正确的压缩包扩展名"""
-    current_dir = os.getcwd()
-    for entry in os.scandir(current_dir):
-        if not entry.is_file():
-            continue
+    import shutil
+    from concurrent.futures import ThreadPoolExecutor
+    i18n = session.i18n
+    current_dir = index.root
+    candidates = []
+    for entry in index.pending_entries():
         original_ext = os.path.splitext(entry.name)[1].lower()
         if original_ext not in SAFE_EXTENSIONS:
-            mark_file_as_processed(entry.path)
+            session.mark_processed(entry.path)
             continue
-        if (entry.path in DETECTED_FILES or
-            entry.path in DETECTION_FAILED or
-            any(entry.name.lower().endswith(ext) for ext in ARCHIVE_EXTENSIONS)):
+        if entry.is_known_archive:
             continue
+        candidates.append(entry)
+    if not candidates:
+        return
+    # 文件头读取在线程池中并发进行，重命名仍按顺序执行以保证冲突检查正确
+    if len(candidates) == 1:
+        results = [_sniff_or_error(session, candidates[0].path)]
+    else:
+        with ThreadPoolExecutor(max_workers=min(DETECTION_WORKERS, len(candidates))) as pool:
+            results = list(pool.map(lambda path: _sniff_or_error(session, path), [entry.path for entry in candidates]))
+    for entry, kind in zip(candidates, results):
         try:
-            kind = filetype.guess(entry.path)
+            if isinstance(kind, OSError):
+                raise kind
             if kind is None:
-                logger.info(i18n._('file_verified', name=entry.name))
-                mark_file_as_processed(entry.path)
+                logger.info(i18n.lazy('file_verified', name=entry.name))
+                session.mark_processed(entry.path)
                 continue
-            if kind.extension in SUPPORTED_ARCHIVE_TYPES:
-                new_ext = '.' + kind.extension
-                base_name = os.path.splitext(entry.name)[0]
-                new_name = f"{base_name}{new_ext}"
-                new_path = os.path.join(current_dir, new_name)
-                if os.path.exists(new_path):
-                    logger.info(i18n._('rename_skipped', new_path=new_path, old=entry.name))
-                    mark_file_as_processed(entry.path)
-                    continue
-                shutil.move(entry.path, new_name)
-                logger.info(i18n._('rename_success', old=entry.name, new=new_name, mime=kind.mime))
-            else:
-                logger.info(i18n._('file_verified_with_mime', name=entry.name, mime=kind.mime))
-                mark_file_as_processed(entry.path)
+            extension, mime = kind
+            new_ext = '.' + extension
+            base_name = os.path.splitext(entry.name)[0]
+            new_name = f"{base_name}{new_ext}"
+            new_path = os.path.join(current_dir, new_name)
+            if os.path.exists(new_path):
+                logger.info(i18n.lazy('rename_skipped', new_path=new_path, old=entry.name))
+                session.mark_processed(entry.path)
+                continue
+            shutil.move(entry.path, new_path)
+            index.rename(entry.name, new_name)
+            session.renamed[entry.path] = new_path
+            logger.info(i18n.lazy('rename_success', old=entry.name, new=new_name, mime=mime))
+        except FileNotFoundError:
+            index.remove(entry.name)
         except (PermissionError, OSError) as e:
             error_msg = f"Exception: {str(e)}"
-            mark_file_as_processed(entry.path, failed_reason=error_msg, is_detection_failed=True)
-            logger.error(i18n._('detect_failed', name=entry.name, error=error_msg))
+            session.mark_processed(entry.path, failed_reason=error_msg, is_detection_failed=True)
+            logger.error(i18n.lazy('detect_failed', name=entry.name, error=error_msg))
 
 # =============================================================================
 # 压缩包安全分析与解压
 # =============================================================================
 
-def locate_7zip() -> str:
-    """定位 7-Zip 可执行文件路径"""
+def hash_file(session: 'Session', path: str) -> str:
+    """
+    流式计算文件内容的 BLAKE2b 摘要：以 HASH_CHUNK_SIZE 的对齐整块无缓冲读入同一个缓冲区，
+    不为每块分配内存；结果按文件身份缓存，内容未变时不再读取。
+    """
+    import hashlib
+    st = os.stat(path)
+    cache = session.hash_cache
+    key = FileResultCache.make_key(st)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            METRICS.inc('hash_cache_hits_total')
+            return cached
+    digest = hashlib.blake2b(digest_size=20)
+    buffer = bytearray(HASH_CHUNK_SIZE)
+    view = memoryview(buffer)
+    with open(path, 'rb', buffering=0) as f:
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            digest.update(view[:n])
+    METRICS.inc('hashed_bytes_total', st.st_size)
+    value = digest.hexdigest()
+    if cache is not None:
+        cache.put(key, value)
+    return value
+
+def _hash_or_none(session: 'Session', path: str) -> Optional[str]:
+    """线程池任务：返回内容摘要，读取失败时返回 None（该文件不参与去重）"""
+    try:
+        return hash_file(session, path)
+    except OSError as e:
+        logger.debug(f"Cannot hash {path}: {e}")
+        return None
+
+def find_duplicates(session: 'Session', paths: List[str]) -> Dict[str, List[str]]:
+    """
+    找出内容完全相同的压缩包：先按大小分组，只有大小相同的文件才计算内容摘要。
+    返回 保留者 → 重复副本列表；每组保留名称最短的一个（foo.zip 而非 foo (1).zip），其余为重复副本。
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    by_size: Dict[int, List[str]] = {}
+    for path in paths:
+        try:
+            by_size.setdefault(os.path.getsize(path), []).append(path)
+        except OSError:
+            continue
+    # 沿用分组时取得的大小：监视或多根目录模式下文件随时可能被移走，摘要之后不再访问文件
+    candidates = [(size, path) for size, group in by_size.items() if len(group) > 1 for path in group]
+    if not candidates:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(HASH_WORKERS, len(candidates))) as pool:
+        digests = list(pool.map(lambda candidate: _hash_or_none(session, candidate[1]), candidates))
+    groups: Dict[Tuple[int, str], List[str]] = {}
+    for (size, path), digest in zip(candidates, digests):
+        if digest is not None:
+            groups.setdefault((size, digest), []).append(path)
+    duplicates = {}
+    for group in groups.values():
+        if len(group) < 2:
+            continue
+        group.sort(key=lambda path: (len(os.path.basename(path)), path))
+        duplicates[group[0]] = group[1:]
+    return duplicates
+
+def _delete_duplicates(session: 'Session', index: DirectoryIndex, original: str, duplicates: List[str]) -> None:
+    """保留的一份已成功解压：删除与它内容相同的副本"""
+    for path in duplicates:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            continue
+        except OSError as e:
+            logger.warning(session.i18n.lazy('delete_failed', path=path, error=e))
+            continue
+        METRICS.inc('deleted_total', kind='duplicate')
+        index.remove(os.path.basename(path))
+        logger.info(session.i18n.lazy('duplicate_deleted', name=os.path.basename(path), original=os.path.basename(original)))
+
+def locate_7zip() -> Optional[str]:
+    """定位 7-Zip 可执行文件路径，找不到时返回 None（仅能使用进程内解压后端）"""
     bundled = os.path.join(os.path.dirname(sys.executable if getattr(sys, 'frozen', False) else __file__), "7z.exe")
     if os.path.exists(bundled):
         return bundled
+    import shutil
     # 应急: 尝试系统 7z
-    return "7z"
+    for name in ("7z", "7za", "7zz"):
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+def _parse_unpacked_size(unpacked_str: str) -> int:
+    """解析 7z 列表中的 "Unpacked Size" 值"""
+    try:
+        if unpacked_str.endswith(' B'):
+            return int(unpacked_str.replace(' B', '').replace(',', ''))
+        elif unpacked_str.endswith(' KB'):
+            return int(float(unpacked_str.replace(' KB', '').replace(',', '')) * 1024)
+        elif unpacked_str.endswith(' MB'):
+            return int(float(unpacked_str.replace(' MB', '').replace(',', '')) * 1024**2)
+        elif unpacked_str.endswith(' GB'):
+            return int(float(unpacked_str.replace(' GB', '').replace(',', '')) * 1024**3)
+        elif unpacked_str.endswith(' TB'):
+            return int(float(unpacked_str.replace(' TB', '').replace(',', '')) * 1024**4)
+        else:
+            return int(unpacked_str.replace(',', ''))
+    except (ValueError, OverflowError):
+        return 0
+
+def list_archive_with_7zip(
+    sevenzip: Optional[str],
+    archive_path: str,
+    max_bytes: int = 0,
+    max_files: int = 0
+) -> Optional[Tuple[int, int, bool]]:
+    """
+    流式读取 `7z l -slt` 输出，返回 (解压大小, 文件数, 是否完整)；7z 无法列出时返回 None。
+
+    逐条累加各条目的 Size，内存占用与条目数无关；一旦超过 max_bytes 或 max_files
+    立即终止 7z 进程，此时返回的是已超限的部分统计（是否完整为 False）。
+    """
+    import subprocess
+    if sevenzip is None:
+        return None
+    proc = subprocess.Popen(
+        [sevenzip, 'l', '-slt', archive_path],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        errors='replace'
+    )
+    timed_out = threading.Event()
+
+    def _on_timeout():
+        timed_out.set()
+        proc.kill()
+
+    timer = threading.Timer(30, _on_timeout)
+    timer.start()
+    unpacked_bytes = 0
+    file_count = 0
+    summary_bytes = 0
+    summary_files = 0
+    in_entries = False
+    entry_size = 0
+    entry_is_dir = False
+    has_entry = False
+    aborted = False
+    try:
+        for line in proc.stdout:
+            line = line.rstrip('\r\n')
+            if line.startswith('----------'):
+                in_entries = True
+            elif line.startswith('Unpacked Size = '):
+                summary_bytes = _parse_unpacked_size(line.split(' = ', 1)[1].strip())
+            elif line.startswith('Files = '):
+                try:
+                    summary_files = int(line.split(' = ', 1)[1].strip().replace(',', ''))
+                except ValueError:
+                    pass
+            elif not in_entries:
+                continue
+            elif line.startswith('Path = '):
+                has_entry = True
+                entry_size = 0
+                entry_is_dir = False
+            elif line.startswith('Size = '):
+                try:
+                    entry_size = int(line[len('Size = '):].strip() or 0)
+                except ValueError:
+                    entry_size = 0
+            elif line == 'Folder = +' or (line.startswith('Attributes = ') and line[len('Attributes = '):].startswith('D')):
+                entry_is_dir = True
+            elif not line and has_entry:
+                # 空行结束一个条目
+                has_entry = False
+                if not entry_is_dir:
+                    unpacked_bytes += entry_size
+                    file_count += 1
+                    if (max_bytes and unpacked_bytes > max_bytes) or (max_files and file_count > max_files):
+                        aborted = True
+                        proc.kill()
+                        break
+        if has_entry and not entry_is_dir and not aborted:
+            unpacked_bytes += entry_size
+            file_count += 1
+    finally:
+        proc.stdout.close()
+        returncode = proc.wait()
+        timer.cancel()
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(proc.args, 30)
+    if aborted:
+        return unpacked_bytes, file_count, False
+    if returncode != 0:
+        return None
+    return max(unpacked_bytes, summary_bytes), max(file_count, summary_files), True
+
+
+def _listing_exceeds(listing, max_bytes: int, max_files: int) -> bool:
+    return listing[0] > max_bytes or listing[1] > max_files
+
+def read_archive_listing(session: 'Session', archive_path: str, max_bytes: int, max_files: int, use_7zip: bool = True):
+    """
+    返回压缩包的 (解压大小, 文件数, 是否完整)，7z 无法列出时返回 None，超时返回 LISTING_TIMEOUT。
+    use_7zip 为 False 时只查缓存与原生头部解析，得不到结果直接返回 None。
+    查询顺序：磁盘缓存 → 原生头部解析 → 7z 流式列表。
+    缓存的是原始列表结果，阈值每次重新判断，因此修改限制参数不会使缓存失效；
+    不完整的（提前终止的）缓存结果只有在仍超出当前限制时才会被采用。
+    只缓存确定的列表结果：超时（可能只是网络存储一时缓慢）与无法列出（例如当时没有 7-Zip）下次重新读取。
+    """
+    import subprocess
+    from archive_headers import read_archive_stats
+    started = time.perf_counter()
+    cache = session.safety_cache
+    key = None
+    if cache is not None:
+        key = FileResultCache.make_key(os.stat(archive_path))
+        cached = cache.get(key)
+        if isinstance(cached, list):
+            if cached[2] or _listing_exceeds(cached, max_bytes, max_files):
+                METRICS.observe('listing_seconds', time.perf_counter() - started, source='cache')
+                return tuple(cached)
+    # 分卷的单个成员不能代表整组：头部解析只看得到第一卷（tar 被截断、7z/zip 缺少目录），一律交给 7z
+    stats = read_archive_stats(archive_path) if parse_volume(os.path.basename(archive_path)) is None else None
+    if stats is not None:
+        listing = (stats.unpacked_bytes, stats.file_count, True)
+        METRICS.observe('listing_seconds', time.perf_counter() - started, source='native')
+    elif not use_7zip:
+        return None
+    else:
+        try:
+            listing = list_archive_with_7zip(session.sevenzip, archive_path, max_bytes, max_files)
+        except subprocess.TimeoutExpired:
+            listing = LISTING_TIMEOUT
+            METRICS.inc('listing_timeouts_total')
+        METRICS.observe('listing_seconds', time.perf_counter() - started, source='7z')
+    if key is not None and isinstance(listing, tuple):
+        cache.put(key, list(listing))
+        session.journal_record(archive_path, 'analyzed', key=key, listing=list(listing))
+    return listing
 
 def analyze_archive_safety(
+    session: 'Session',
     archive_path: str,
-    i18n: I18N,
     max_unpacked_gb: int,
-    max_files: int
+    max_files: int,
+    use_7zip: bool = True
 ) -> Tuple[bool, str, Optional[int]]:
     """分析压缩包的安全性，返回 (是否危险, 原因, 预估解压大小)"""
     try:
-        result = subprocess.run(
-            [SEVENZIP, 'l', '-slt', archive_path],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            timeout=30
-        )
-        if result.returncode != 0:
+        max_bytes = max_unpacked_gb * (1024 ** 3)
+        listing = read_archive_listing(session, archive_path, max_bytes, max_files, use_7zip)
+        if listing == LISTING_TIMEOUT:
+            return (True, "Metadata read timeout (possibly malicious)", None)
+        if listing is None:
             return (False, "", 0)
-        output = result.stdout
-        unpacked_bytes = 0
-        file_count = 0
-        unpacked_line = next((l for l in output.splitlines() if l.startswith('Unpacked Size = ')), None)
-        if unpacked_line:
-            unpacked_str = unpacked_line.split(' = ')[1].strip()
-            try:
-                if unpacked_str.endswith(' B'):
-                    unpacked_bytes = int(unpacked_str.replace(' B', '').replace(',', ''))
-                elif unpacked_str.endswith(' KB'):
-                    unpacked_bytes = int(float(unpacked_str.replace(' KB', '').replace(',', '')) * 1024)
-                elif unpacked_str.endswith(' MB'):
-                    unpacked_bytes = int(float(unpacked_str.replace(' MB', '').replace(',', '')) * 1024**2)
-                elif unpacked_str.endswith(' GB'):
-                    unpacked_bytes = int(float(unpacked_str.replace(' GB', '').replace(',', '')) * 1024**3)
-                elif unpacked_str.endswith(' TB'):
-                    unpacked_bytes = int(float(unpacked_str.replace(' TB', '').replace(',', '')) * 1024**4)
-                else:
-                    unpacked_bytes = int(unpacked_str.replace(',', ''))
-            except (ValueError, OverflowError):
-                unpacked_bytes = 0
-        files_line = next((l for l in output.splitlines() if l.startswith('Files = ')), None)
-        if files_line:
-            try:
-                file_count = int(files_line.split(' = ')[1].strip().replace(',', ''))
-            except ValueError:
-                file_count = 0
+        unpacked_bytes, file_count, complete = listing
+        # 提前终止的列表只给出下限，用 ">" 提示
+        more = "" if complete else ">"
+        if file_count > max_files:
+            return (True, f"Too many files ({more}{file_count} > {max_files})", None)
         if unpacked_bytes > 0:
-            max_bytes = max_unpacked_gb * (1024 ** 3)
             if unpacked_bytes > max_bytes:
-                return (True, f"Unpacked size too large ({unpacked_bytes / (1024**3):.1f} GB > {max_unpacked_gb} GB)", None)
-            if file_count > max_files:
-                return (True, f"Too many files ({file_count} > {max_files})", None)
+                return (True, f"Unpacked size too large ({more}{unpacked_bytes / (1024**3):.1f} GB > {max_unpacked_gb} GB)", None)
             archive_size = os.path.getsize(archive_path)
             if archive_size > 0 and unpacked_bytes / archive_size > 1000:
                 return (True, f"Compression ratio too high ({unpacked_bytes / archive_size:.0f}:1)", None)
         return (False, "", unpacked_bytes)
-    except subprocess.TimeoutExpired:
-        return (True, "Metadata read timeout (possibly malicious)", None)
     except Exception as e:
         return (True, f"Check exception: {str(e)}", None)
 
-def unzip(i18n: I18N, config: Config) -> None:
-    """解压操作"""
-    current_dir = os.getcwd()
-    volume_groups: Dict[str, List[str]] = {}
-    for entry in os.scandir(current_dir):
-        if entry.is_file() and entry.path not in FAILED_ARCHIVES:
-            is_volume, _, _ = get_volume_number(entry.name)
-            if is_volume:
-                group_key = get_volume_group_key(entry.name)
-                if group_key:
-                    volume_groups.setdefault(group_key, []).append(entry.path)
-    processed_groups = set()
-    for entry in os.scandir(current_dir):
-        if not entry.is_file() or entry.path in FAILED_ARCHIVES:
-            continue
-        name_lower = entry.name.lower()
-        is_volume, _, _ = get_volume_number(entry.name)
-        is_known_archive = any(name_lower.endswith(ext) for ext in ARCHIVE_EXTENSIONS)
-        if not (is_known_archive or is_volume):
-            continue
-        group_key = get_volume_group_key(entry.name) if is_volume else None
-        if is_volume:
-            if not is_first_volume(entry.name) or group_key in processed_groups:
-                continue
-            processed_groups.add(group_key)
-        is_dangerous, reason, unpacked_bytes = analyze_archive_safety(entry.path, i18n, max_unpacked_gb=config.max_unpacked_gb, max_files=config.max_files)
-        if is_dangerous:
-            error_msg = f"Safety check failed: {reason}"
-            mark_file_as_processed(entry.path, failed_reason=error_msg)
-            logger.warning(i18n._('unsafe_archive', name=entry.name, reason=reason))
-            continue
-        try:
-            free_bytes = shutil.disk_usage('.').free
-            buffer_bytes = max(unpacked_bytes // 10, 1 * (1024**3))
-            required_bytes = unpacked_bytes + buffer_bytes
-            if free_bytes < required_bytes:
-                needed_gb = required_bytes / (1024**3)
-                free_gb = free_bytes / (1024**3)
-                error_msg = f"Insufficient disk space (need {needed_gb:.1f} GB, free {free_gb:.1f} GB)"
-                mark_file_as_processed(entry.path, failed_reason=error_msg)
-                logger.warning(i18n._('disk_low', name=entry.name, error=error_msg))
-                continue
-        except OSError as e:
-            error_msg = f"Disk check failed: {e}"
-            mark_file_as_processed(entry.path, failed_reason=error_msg)
-            logger.warning(i18n._('disk_low', name=entry.name, error=error_msg))
-            continue
+def _output_line_path(line: str) -> Optional[str]:
+    """解析 7z -bb1 输出中的一行，返回写出的相对路径（非文件行返回 None）"""
+    if line.startswith('- '):
+        rel = line[2:]
+    elif line.startswith('Extracting  '):
+        rel = line[len('Extracting  '):]
+    else:
+        return None
+    rel = rel.rstrip('\r\n')
+    return rel or None
+
+@dataclass
+class ExtractionResult:
+    returncode: int
+    stderr: str
+    written: List[str]                   # 按写出顺序记录的相对路径
+    timed_out: bool = False
+    stalled: bool = False
+    limit_error: Optional[str] = None    # 运行时守护触发的原因
+    percent: int = 0                     # 7z 报告的完成百分比
+    bytes_written: int = 0               # 实际写出的字节数
+    elapsed: float = 0.0                 # 耗时（秒）
+    archives: Dict[str, List[str]] = field(default_factory=dict)  # 批量解压：已开始处理的压缩包 → 错误行
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.bytes_written / (1024**2) / self.elapsed if self.elapsed > 0 else 0.0
+
+class ThroughputEstimator:
+    """以指数滑动平均估计本机解压吞吐量，用于推算大文件的解压时限"""
+
+    def __init__(self, initial: float = INITIAL_THROUGHPUT, alpha: float = 0.3):
+        self.value = initial
+        self.alpha = alpha
+        self._lock = threading.Lock()
+
+    def update(self, nbytes: int, seconds: float) -> None:
+        if nbytes < THROUGHPUT_SAMPLE_MIN_BYTES or seconds <= 0:
+            return
+        with self._lock:
+            self.value = (1 - self.alpha) * self.value + self.alpha * (nbytes / seconds)
+
+    def time_budget(self, expected_bytes: int) -> float:
+        """按预计解压大小与实测吞吐量给出时限，不低于 EXTRACTION_MIN_TIMEOUT"""
+        with self._lock:
+            throughput = max(self.value, MIN_THROUGHPUT)
+        return max(EXTRACTION_MIN_TIMEOUT, EXTRACTION_TIMEOUT_SLACK * expected_bytes / throughput)
+
+class DiskReservation:
+    """一次解压在某个卷上预留的空间；written 为已写出（已体现在实际剩余空间中）的字节数"""
+
+    def __init__(self, ledger: 'DiskLedger', device: int, nbytes: int):
+        self.ledger = ledger
+        self.device = device
+        self.nbytes = nbytes
+        self.written = 0
+
+    @property
+    def outstanding(self) -> int:
+        return max(0, self.nbytes - self.written)
+
+    def update(self, written: int) -> None:
+        """按解压进度扣减尚未写出的预留量"""
+        with self.ledger._cond:
+            self.written = written
+            self.ledger._publish()
+
+    def release(self) -> None:
+        """释放预留（解压结果已提交、源文件已删除，或解压失败后暂存目录已丢弃）；可重复调用"""
+        self.ledger._release(self)
+
+class DiskLedger:
+    """
+    磁盘空间预留账本：记录各个卷上已承诺给进行中解压、但尚未写出的空间。
+
+    可用空间 = 实际剩余空间 − 各预留中尚未写出的部分 − DISK_HEADROOM_BYTES。进行中的解压写出的数据
+    已体现在实际剩余空间中，因此按进度扣减其预留；提交并删除源文件后释放整个预留。
+    多个根目录位于同一个卷时共享同一份预留。
+    """
+
+    def __init__(self, headroom: int = DISK_HEADROOM_BYTES):
+        self.headroom = headroom
+        self._active: List[DiskReservation] = []
+        self._cond = threading.Condition()
+
+    def _outstanding(self, device: int) -> int:
+        return sum(r.outstanding for r in self._active if r.device == device)
+
+    def _publish(self) -> None:
+        """调用方需持有 _cond"""
+        METRICS.set('disk_reserved_bytes', sum(r.outstanding for r in self._active))
+
+    def _release(self, reservation: DiskReservation) -> None:
+        with self._cond:
+            if reservation in self._active:
+                self._active.remove(reservation)
+                self._publish()
+                self._cond.notify_all()
+
+    def reserve(self, path: str, nbytes: int, wait: bool = True) -> Tuple[Optional[DiskReservation], int]:
+        """
+        在 path 所在的卷上预留 nbytes，返回 (预留, 预留前的可用空间)；空间不足时预留为 None。
+        wait 为真且同一卷上还有进行中的解压时，先等待它们释放空间再重新判断，
+        只有不再有可等待的预留时才判定为空间不足。无法读取磁盘信息时抛出 OSError。
+        """
+        import shutil
+        device = os.stat(path).st_dev
+        waited = False
+        with self._cond:
+            while True:
+                available = shutil.disk_usage(path).free - self._outstanding(device) - self.headroom
+                if nbytes <= available:
+                    reservation = DiskReservation(self, device, nbytes)
+                    self._active.append(reservation)
+                    self._publish()
+                    return reservation, available
+                if not wait or not any(r.device == device for r in self._active):
+                    return None, available
+                if not waited:
+                    METRICS.inc('disk_waits_total')
+                    waited = True
+                self._cond.wait()
+
+def reservation_size(unpacked_bytes: int) -> int:
+    """按预计解压大小计算需要预留的空间"""
+    return unpacked_bytes + int(unpacked_bytes * DISK_RESERVE_SLACK)
+
+# 7z 用退格/回车覆盖进度行，按这些字符切分输出流
+_OUTPUT_SEGMENT_SPLIT = re.compile(rb'[\r\n\b]')
+_PROGRESS_PATTERN = re.compile(r'^\s*(\d{1,3})%')
+_BATCH_ARCHIVE_MARKER = 'Extracting archive: '
+
+def run_guarded_extraction(
+    cmd: List[str],
+    out_dir: str,
+    max_bytes: int,
+    max_files: int,
+    guard: bool = True,
+    timeout: float = EXTRACTION_MIN_TIMEOUT,
+    stall_timeout: float = EXTRACTION_STALL_TIMEOUT,
+    on_progress=None,
+    source_cmd: Optional[List[str]] = None,
+    stream_bytes: int = 0,
+    archive_dirs: Optional[Dict[str, str]] = None
+) -> ExtractionResult:
+    """
+    运行 7z 解压（需带 -bb1 -bsp1），实时统计进度以及实际写出的字节数与文件数。
+
+    每当输出下一个文件名时 stat 一次上一个文件；守护线程每隔 GUARD_POLL_INTERVAL 秒
+    stat 一次正在写入的文件，以便拦截单个巨型文件并判断是否仍有进度。
+    超出限制、超过 timeout 或 stall_timeout 内毫无进度时终止进程，由调用方决定是否回滚。
+    on_progress(percent, bytes_written, elapsed) 每 PROGRESS_LOG_INTERVAL 秒调用一次。
+
+    给出 source_cmd 时，其标准输出作为数据流转发到 cmd 的标准输入（cmd 需带 -si），
+    大小限制同时作用于数据流本身；stream_bytes 为预计的数据流长度，用于估算进度。
+
+    批量解压（一次解压多个压缩包，cmd 需带 -bse1 使错误与文件行保持顺序）时给出 archive_dirs：
+    规范化的压缩包路径 → 其在 out_dir 下的子目录。输出按 “Extracting archive:” 行归属到各压缩包，
+    result.archives 记录每个已开始处理的压缩包及其错误行。
+    """
+    import locale
+    import subprocess
+    encoding = locale.getpreferredencoding(False)
+    source = None
+    if source_cmd is not None:
+        source = subprocess.Popen(
+            source_cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE if source is not None else None,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    stderr_chunks: List[bytes] = []
+    stderr_thread = threading.Thread(target=lambda: stderr_chunks.append(proc.stderr.read()), daemon=True)
+    stderr_thread.start()
+    source_stderr: List[bytes] = []
+    result = ExtractionResult(returncode=0, stderr="", written=[])
+    started = time.monotonic()
+    state = {'bytes': 0, 'files': 0, 'current': None, 'current_size': 0, 'last_progress': started,
+             'stream': 0, 'stream_eof': False, 'archive': None, 'prefix': ''}
+    stop = threading.Event()
+
+    def _kill() -> None:
+        proc.kill()
+        if source is not None:
+            source.kill()
+
+    def _fail(reason: str) -> None:
+        if result.limit_error is None:
+            result.limit_error = reason
+        _kill()
+
+    def _over_limit(extra_bytes: int = 0) -> Optional[str]:
+        written_bytes = state['bytes'] + extra_bytes
+        if written_bytes > max_bytes:
+            return f"Runtime size limit exceeded (>{written_bytes / (1024**3):.2f} GB written)"
+        if state['files'] > max_files:
+            return f"Runtime file limit exceeded (>{max_files} files written)"
+        return None
+
+    def _finish_current() -> None:
+        current = state['current']
+        state['current'] = None
+        state['current_size'] = 0
+        if current is None:
+            return
         try:
-            logger.info(i18n._('unzipping', name=entry.name))
-            result = subprocess.run(
-                [SEVENZIP, 'x', entry.path, '-y'],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                timeout=300
-            )
-            if result.returncode == 0:
-                if is_volume and group_key in volume_groups:
-                    for vol_path in volume_groups[group_key]:
-                        if os.path.exists(vol_path):
-                            os.remove(vol_path)
-                            logger.info(i18n._('volume_deleted', name=os.path.basename(vol_path)))
-                else:
-                    if os.path.exists(entry.path):
-                        os.remove(entry.path)
-                        logger.info(i18n._('unzip_success_delete', name=entry.name))
-                mark_file_as_processed(entry.path)
-            else:
-                error_msg = result.stderr.strip() or "7-Zip returned non-zero exit code"
-                mark_file_as_processed(entry.path, failed_reason=error_msg)
-                logger.error(i18n._('unzip_failed', name=entry.name, error=error_msg))
-        except subprocess.TimeoutExpired:
-            error_msg = "Extraction timeout (300s)"
-            mark_file_as_processed(entry.path, failed_reason=error_msg)
-            logger.error(i18n._('unzip_failed', name=entry.name, error=error_msg))
-        except (PermissionError, OSError) as e:
-            error_msg = f"System error: {str(e)}"
-            mark_file_as_processed(entry.path, failed_reason=error_msg)
-            logger.error(i18n._('unzip_failed', name=entry.name, error=error_msg))
+            st = os.stat(current)
+        except OSError:
+            return
+        if not os.path.isdir(current):
+            state['bytes'] += st.st_size
+            state['files'] += 1
 
-# =============================================================================
-# 清理与报告
-# =============================================================================
+    def _monitor() -> None:
+        last_report = started
+        while not stop.wait(GUARD_POLL_INTERVAL):
+            now = time.monotonic()
+            current = state['current']
+            if current is not None:
+                try:
+                    size = os.path.getsize(current)
+                except OSError:
+                    size = state['current_size']
+                if size != state['current_size']:
+                    state['current_size'] = size
+                    state['last_progress'] = now
+                reason = _over_limit(size) if guard else None
+                if reason:
+                    _fail(reason)
+                    return
+            if now - started > timeout:
+                result.timed_out = True
+                _kill()
+                return
+            if now - state['last_progress'] > stall_timeout:
+                result.stalled = True
+                _kill()
+                return
+            if on_progress is not None and now - last_report >= PROGRESS_LOG_INTERVAL:
+                last_report = now
+                on_progress(result.percent, state['bytes'] + state['current_size'], now - started)
 
-def remove_target(
-    folder_path: str,
-    file_set: Set[str],
-    remove_target_files: bool,
-    remove_empty_dirs: bool,
-    i18n: I18N
-) -> None:
-    """删除目标文件和/或空文件夹"""
-    if not (remove_target_files or remove_empty_dirs):
-        return
-    stack = [folder_path]
-    while stack:
-        current = stack.pop()
+    def _track_archive(text: str) -> None:
+        """批量解压：记录当前正在处理的压缩包，并把错误行归属给它"""
+        if text.startswith(_BATCH_ARCHIVE_MARKER):
+            archive = os.path.normcase(os.path.abspath(text[len(_BATCH_ARCHIVE_MARKER):].strip()))
+            state['archive'] = archive
+            state['prefix'] = archive_dirs.get(archive, '')
+            result.archives.setdefault(archive, [])
+        elif 'ERROR' in text and state['archive'] is not None:
+            result.archives[state['archive']].append(text.strip())
+
+    def _handle_segment(text: str) -> bool:
+        """处理一段输出，需要终止读取时返回 False"""
+        match = _PROGRESS_PATTERN.match(text)
+        if match:
+            percent = int(match.group(1))
+            if percent != result.percent:
+                result.percent = percent
+                state['last_progress'] = time.monotonic()
+            return True
+        rel = _output_line_path(text)
+        if rel is None:
+            if archive_dirs is not None:
+                _track_archive(text)
+            return True
+        if state['prefix']:
+            rel = os.path.join(state['prefix'], rel)
+        _finish_current()
+        result.written.append(rel)
+        state['current'] = os.path.join(out_dir, rel)
+        state['last_progress'] = time.monotonic()
+        reason = _over_limit() if guard else None
+        if reason:
+            _fail(reason)
+            return False
+        return True
+
+    def _pump() -> None:
+        """把解压器输出的数据流转发给解包进程，数据流本身超出大小限制时立即终止"""
         try:
-            with os.scandir(current) as entries:
-                subdirs = []
-                has_files = False
-                for entry in entries:
-                    if entry.is_dir(follow_symlinks=False):
-                        subdirs.append(entry.path)
-                        has_files = True
-                    elif entry.is_file():
-                        if remove_target_files and entry.name in file_set:
-                            try:
-                                os.remove(entry.path)
-                                logger.info(i18n._('file_deleted', path=entry.path))
-                            except (PermissionError, OSError) as e:
-                                logger.error(i18n._('delete_failed', path=entry.path, error=e))
-                        else:
-                            has_files = True
-                if remove_empty_dirs or remove_target_files:
-                    stack.extend(reversed(subdirs))
-        except OSError as e:
-            logger.error(i18n._('dir_access_failed', path=current, error=e))
-            continue
-        if remove_empty_dirs and not has_files:
+            while True:
+                chunk = source.stdout.read1(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    state['stream_eof'] = True
+                    break
+                proc.stdin.write(chunk)
+                state['stream'] += len(chunk)
+                state['last_progress'] = time.monotonic()
+                if stream_bytes:
+                    result.percent = max(result.percent, min(99, state['stream'] * 100 // stream_bytes))
+                if guard and state['stream'] > max_bytes:
+                    _fail(f"Runtime size limit exceeded (>{state['stream'] / (1024**3):.2f} GB decompressed)")
+                    break
+        except (OSError, ValueError):
+            # 解包进程提前退出或被终止
+            pass
+        finally:
             try:
-                os.rmdir(current)
-                logger.info(i18n._('folder_deleted', path=current))
+                proc.stdin.close()
             except OSError:
                 pass
 
-def print_detection_failure_report(i18n: I18N) -> None:
-    """打印检测失败报告"""
-    if not DETECTION_FAILED:
-        return
-    logger.info(f"\n{'='*50}")
-    logger.info(i18n._('detect_fail_report_header', count=len(DETECTION_FAILED)))
-    logger.info(f"{'='*50}")
-    for path, err in DETECTION_FAILED.items():
-        logger.info(f"\n{i18n._('file_label', name=os.path.basename(path))}")
-        logger.info(f"{i18n._('path_label', path=path)}")
-        logger.info(f"{i18n._('reason_label', reason=err)}")
-    logger.info(f"{'='*50}\n")
-
-def print_failure_report(i18n: I18N) -> None:
-    """打印解压失败报告"""
-    if not FAILED_ARCHIVES:
-        return
-    logger.info(f"\n{'='*50}")
-    logger.info(i18n._('unzip_fail_report_header', count=len(FAILED_ARCHIVES)))
-    logger.info(f"{'='*50}")
-    for path, err in FAILED_ARCHIVES.items():
-        logger.info(f"\n{i18n._('file_label', name=os.path.basename(path))}")
-        logger.info(f"{i18n._('path_label', path=path)}")
-        logger.info(f"{i18n._('reason_label', reason=err)}")
-    logger.info(f"{'='*50}\n")
+    monitor_thread = threading.Thread(target=_monitor, daemon=True)
+    monitor_thread.start()
+    if source is not None:
+        pump_thread = threading.Thread(target=_pump, daemon=True)
+        pump_thread.start()
+        source_stderr_thread = threading.Thread(target=lambda: source_stderr.append(source.stderr.read()), daemon=True)
+        source_stderr_thread.start()
+    try:
+        pending = b''
+        reading = True
+        while reading:
+            chunk = proc.stdout.read1(64 * 1024)
+            if not chunk:
+                if pending:
+                    _handle_segment(pending.decode(encoding, 'replace'))
+                break
+            *segments, pending = _OUTPUT_SEGMENT_SPLIT.split(pending + chunk)
+            for segment in segments:
+                if segment and not _handle_segment(segment.decode(encoding, 'replace')):
+                    reading = False
+                    break
+        _finish_current()
+    finally:
+        proc.stdout.close()
+        result.returncode = proc.wait()
+        stop.set()
+        monitor_thread.join()
+        stderr_thread.join()
+        if source is not None:
+            if source.poll() is None:
+                source.kill()
+            pump_thread.join()
+            source_stderr_thread.join()
+            source.stdout.close()
+            source_returncode = source.wait()
+            # 只有数据流完整读完时解压器的退出码才有意义（解包进程提前结束会导致其写管道失败）
+            if state['stream_eof'] and source_returncode != 0 and result.returncode == 0:
+                result.returncode = source_returncode
+                stderr_chunks[:0] = source_stderr
+    result.stderr = b''.join(stderr_chunks).decode(encoding, 'replace')
+    result.bytes_written = state['bytes']
+    result.elapsed = time.monotonic() - started
+    if guard and result.limit_error is None:
+        result.limit_error = _over_limit()
+    return result
 
-# =============================================================================
-# 参数解析与主逻辑
-# =============================================================================
+# ---------------- 解压后端 ----------------
 
-def parse_args() -> Config:
-    """解析命令行参数"""
-    temp_parser = argparse.ArgumentParser(add_help=False)
-    temp_parser.add_argument('-L', '--language', default='auto')
-    temp_args, _ = temp_parser.parse_known_args()
-    lang = get_system_language() if temp_args.language == 'auto' else temp_args.language
-    if lang not in MESSAGES:
-        lang = 'en'
-    texts = MESSAGES[lang]['argparse']
-    parser = argparse.ArgumentParser(
-        description=texts['description'],
-        epilog=texts['epilog'],
-        formatter_class=argparse.RawDescriptionHelpFormatter
-    )
-    parser.add_argument('-v', '--version', action='version', version=f'%(prog)s {__version__}')
-    parser.add_argument('-y', '--yes', action='store_true', help=texts['yes'])
-    parser.add_argument('-n', '--no', action='store_true', help=texts['no'])
-    parser.add_argument('-t', '--delete-target-files', action='store_true', help=texts['delete_target'])
-    parser.add_argument('-e', '--delete-empty-folders', action='store_true', help=texts['delete_empty'])
-    parser.add_argument('-l', '--delete-list', nargs='*', default=[], help=texts['delete_list'])
+class ExtractionBackend:
+    """
+    解压后端接口。supports() 只做廉价判断；extract() 把压缩包解压到 out_dir 并返回 ExtractionResult，
+    中途发现无法处理时抛出 UnsupportedArchive，由调用方丢弃已写出的内容并改用下一个后端。
+    """
+    name = ''
+
+    def supports(self, archive_path: str, volumes: Optional[List[str]]) -> bool:
+        raise NotImplementedError
+
+    def extract(
+        self,
+        archive_path: str,
+        out_dir: str,
+        *,
+        max_bytes: int,
+        max_files: int,
+        guard: bool,
+        timeout: float,
+        on_progress=None,
+        stream_bytes: int = 0
+    ) -> ExtractionResult:
+        raise NotImplementedError
+
+class SevenZipBackend(ExtractionBackend):
+    """调用外部 7z 进程（sevenzip 为其路径，None 表示不可用），支持全部格式与分卷"""
+    name = '7z'
+
+    def __init__(self, sevenzip: Optional[str]):
+        self.sevenzip = sevenzip
+
+    def supports(self, archive_path: str, volumes: Optional[List[str]]) -> bool:
+        return self.sevenzip is not None
+
+    def extract(self, archive_path, out_dir, *, max_bytes, max_files, guard, timeout,
+                on_progress=None, stream_bytes=0):
+        if is_compressed_tarball(os.path.basename(archive_path)):
+            # 单遍处理：解压数据流直接解包，不在目标目录写出中间 .tar
+            cmd = [self.sevenzip, 'x', '-si', '-ttar', f'-o{out_dir}', '-y', '-bb1', '-bsp1']
+            source_cmd = [self.sevenzip, 'x', archive_path, '-so', '-bd']
+        else:
+            cmd = [self.sevenzip, 'x', archive_path, f'-o{out_dir}', '-y', '-bb1', '-bsp1']
+            source_cmd = None
+        return run_guarded_extraction(
+            cmd,
+            out_dir,
+            max_bytes=max_bytes,
+            max_files=max_files,
+            guard=guard,
+            timeout=timeout,
+            on_progress=on_progress,
+            source_cmd=source_cmd,
+            stream_bytes=stream_bytes
+        )
+
+class PythonBackend(ExtractionBackend):
+    """纯标准库的进程内流式解压（zip / tar / gz / bz2 / xz），免去启动子进程的开销"""
+    name = 'python'
+
+    def supports(self, archive_path: str, volumes: Optional[List[str]]) -> bool:
+        from stream_extract import detect_stream_format
+        return not volumes and detect_stream_format(archive_path) is not None
+
+    def extract(self, archive_path, out_dir, *, max_bytes, max_files, guard, timeout,
+                on_progress=None, stream_bytes=0):
+        import lzma
+        import tarfile
+        import zipfile
+        import zlib
+        from stream_extract import StreamExtractor, ExtractionLimitExceeded, ExtractionTimeout
+        result = ExtractionResult(returncode=0, stderr="", written=[])
+        started = time.monotonic()
+        last_report = [started]
+
+        def _on_chunk(written: int) -> None:
+            if stream_bytes:
+                result.percent = min(99, written * 100 // stream_bytes)
+            now = time.monotonic()
+            if on_progress is not None and now - last_report[0] >= PROGRESS_LOG_INTERVAL:
+                last_report[0] = now
+                on_progress(result.percent, written, now - started)
+
+        extractor = StreamExtractor(out_dir, max_bytes, max_files, guard=guard, timeout=timeout, on_chunk=_on_chunk)
+        try:
+            extractor.extract(archive_path)
+            result.percent = 100
+        except ExtractionLimitExceeded as e:
+            result.limit_error = str(e)
+        except ExtractionTimeout:
+            result.timed_out = True
+        except (OSError, EOFError, ValueError, zipfile.BadZipFile, tarfile.TarError, lzma.LZMAError, zlib.error) as e:
+            result.returncode = 2
+            result.stderr = f"{type(e).__name__}: {e}"
+        result.written = extractor.written
+        result.bytes_written = extractor.bytes_written
+        result.elapsed = time.monotonic() - started
+        return result
+
+# 后端名（--backend 的取值）对应的尝试顺序
+BACKEND_ORDER = {
+    'auto': ('python', '7z'),
+    'python': ('python',),
+    '7z': ('7z',),
+}
+
+def create_backends(name: str, sevenzip: Optional[str]) -> List[ExtractionBackend]:
+    """按后端名创建后端实例列表（按尝试顺序）；名称未知时抛出 ValueError"""
+    if name not in BACKEND_ORDER:
+        raise ValueError(f"Unknown extraction backend: {name}")
+    available = {PythonBackend.name: PythonBackend, SevenZipBackend.name: lambda: SevenZipBackend(sevenzip)}
+    return [available[backend]() for backend in BACKEND_ORDER[name]]
+
+def select_backends(session: 'Session', archive_path: str, volumes: Optional[List[str]]) -> List[ExtractionBackend]:
+    """给出会话中可处理该压缩包的后端，按尝试顺序排列"""
+    return [backend for backend in session.backends if backend.supports(archive_path, volumes)]
+
+def _set_hidden(path: str, hidden: bool) -> None:
+    """设置或清除 Windows 的隐藏属性（其他系统依靠“.”前缀隐藏）"""
+    if os.name != 'nt':
+        return
+    try:
+        import ctypes
+        attrs = ctypes.windll.kernel32.GetFileAttributesW(path)
+        if attrs == -1 or attrs == 0xFFFFFFFF:
+            return
+        attrs = attrs | FILE_ATTRIBUTE_HIDDEN if hidden else attrs & ~FILE_ATTRIBUTE_HIDDEN
+        ctypes.windll.kernel32.SetFileAttributesW(path, attrs)
+    except (ImportError, AttributeError, OSError):
+        pass
+
+def create_staging_dir(root: str) -> str:
+    """
+    在 root 内创建隐藏的暂存目录，保证与最终位置处于同一文件系统。
+    不使用 tempfile.mkdtemp：它创建的目录权限为 0700，按单独文件夹提交时会原样成为输出文件夹，
+    其他用户与服务（Samba、媒体服务器等）将无法访问；这里按进程的 umask 创建，与直接解压时一致。
+    """
+    while True:
+        path = os.path.join(root, STAGING_PREFIX + os.urandom(6).hex())
+        try:
+            os.mkdir(path)
+        except FileExistsError:
+            continue
+        _set_hidden(path, True)
+        return path
+
+def discard_staging_dir(path: str) -> None:
+    """丢弃暂存目录：失败、超时或超限时的全部清理只需这一步"""
+    import shutil
+    shutil.rmtree(path, ignore_errors=True)
+
+# 提交解压结果时按目标目录加锁：“挑选空闲名称”与“重命名”之间若有其他线程写入同名条目，
+# POSIX 上的 rename 会静默覆盖它。锁对象只在有线程使用时存活
+_COMMIT_LOCKS: 'weakref.WeakValueDictionary[str, threading.RLock]' = weakref.WeakValueDictionary()
+_COMMIT_LOCKS_GUARD = threading.Lock()
+
+def _directory_lock(path: str) -> 'threading.RLock':
+    """返回目录 path 的提交锁（同一目录在整个进程内共用一把锁）"""
+    key = os.path.normcase(os.path.abspath(path))
+    with _COMMIT_LOCKS_GUARD:
+        lock = _COMMIT_LOCKS.get(key)
+        if lock is None:
+            lock = _COMMIT_LOCKS[key] = threading.RLock()
+        return lock
+
+def _unique_path(path: str) -> str:
+    """目标已存在时生成不冲突的名称：name (1).ext、name (2).ext…"""
+    if not os.path.lexists(path):
+        return path
+    stem, ext = os.path.splitext(path)
+    if os.path.isdir(path):
+        stem, ext = path, ''
+    n = 1
+    while os.path.lexists(f"{stem} ({n}){ext}"):
+        n += 1
+    return f"{stem} ({n}){ext}"
+
+def _merge_into(src: str, dest: str) -> None:
+    """把目录 src 的内容移入已存在的目录 dest：同名子目录递归合并，同名文件改名保留"""
+    with _directory_lock(dest):
+        for name in os.listdir(src):
+            src_path = os.path.join(src, name)
+            dest_path = os.path.join(dest, name)
+            if (os.path.isdir(src_path) and not os.path.islink(src_path)
+                    and os.path.isdir(dest_path) and not os.path.islink(dest_path)):
+                _merge_into(src_path, dest_path)
+            else:
+                _rename_unique(src_path, dest_path)
+    os.rmdir(src)
+
+def _rename_unique(src: str, dest: str) -> str:
+    """
+    把 src 重命名为 dest，dest 已存在时改用 _unique_path 给出的名称，返回实际的目标路径。
+    调用方需持有目标目录的提交锁；其他进程抢先占用同名条目时（Windows 上 rename 报 FileExistsError）换下一个名称重试。
+    """
+    while True:
+        target = _unique_path(dest)
+        try:
+            os.rename(src, target)
+        except FileExistsError:
+            continue
+        return target
+
+def output_folder_name(archive_name: str) -> str:
+    """单独输出文件夹的名称：去掉分卷标记与压缩扩展名，如 foo.part1.rar → foo"""
+    base = archive_name
+    info = parse_volume(base)
+    if info is not None:
+        base = VOLUME_PATTERNS[VOLUME_SCHEMES.index(info.scheme)].sub('', base, count=1)
+    ext = max((e for e in ARCHIVE_EXTENSIONS if base.lower().endswith(e)), key=len, default='')
+    base = base[:len(base) - len(ext)].rstrip('. _-')
+    return base or archive_name
+
+def commit_staging_dir(staging: str, root: str, folder: Optional[str] = None) -> List[str]:
+    """
+    把暂存目录中的解压结果提交到 root，返回 root 下新增（或被合并）的顶层名称。
+
+    folder 非空时整个暂存目录一次重命名为 root/folder；否则逐个重命名顶层条目，
+    同名目录合并、同名文件改名保留，不会覆盖任何已有文件。
+    多个解压线程可同时提交到同一 root：选名与重命名在 root 的提交锁内完成。
+    """
+    names = sorted(os.listdir(staging))
+    if not names:
+        os.rmdir(staging)
+        return []
+    with _directory_lock(root):
+        if folder:
+            target = _rename_unique(staging, os.path.join(root, folder))
+            _set_hidden(target, False)
+            return [os.path.basename(target)]
+        committed = []
+        for name in names:
+            src_path = os.path.join(staging, name)
+            dest_path = os.path.join(root, name)
+            if (os.path.isdir(src_path) and not os.path.islink(src_path)
+                    and os.path.isdir(dest_path) and not os.path.islink(dest_path)):
+                _merge_into(src_path, dest_path)
+            else:
+                dest_path = _rename_unique(src_path, dest_path)
+            committed.append(os.path.basename(dest_path))
+    os.rmdir(staging)
+    return committed
+
+def extract_archive(
+    session: 'Session',
+    index: DirectoryIndex,
+    archive_path: str,
+    volumes: Optional[List[str]],
+    expected_bytes: int = 0,
+    duplicates: Optional[List[str]] = None
+) -> None:
+    """
+    对单个压缩包（或分卷组的入口文件）执行安全检查、解压并删除源文件；expected_bytes 为分卷组的压缩数据总量，
+    duplicates 为与它内容相同的副本，解压成功后随源文件一起删除。
+    解压前在引擎的磁盘账本中预留空间，直到提交并删除源文件（或失败回滚）后才释放。
+    """
+    from stream_extract import UnsupportedArchive
+    i18n = session.i18n
+    config = session.config
+    name = os.path.basename(archive_path)
+    is_dangerous, reason, unpacked_bytes = analyze_archive_safety(session, archive_path, max_unpacked_gb=config.max_unpacked_gb, max_files=config.max_files)
+    if is_dangerous:
+        error_msg = f"Safety check failed: {reason}"
+        session.mark_processed(archive_path, failed_reason=error_msg)
+        logger.warning(i18n.lazy('unsafe_archive', name=name, reason=reason))
+        return
+    # 元数据未给出解压大小时，至少按分卷总大小估计磁盘占用与解压耗时
+    unpacked_bytes = max(unpacked_bytes, expected_bytes)
+    required_bytes = reservation_size(unpacked_bytes)
+    try:
+        reservation, available = session.disk_ledger.reserve(index.root, required_bytes)
+    except OSError as e:
+        error_msg = f"Disk check failed: {e}"
+        session.mark_processed(archive_path, failed_reason=error_msg)
+        logger.warning(i18n.lazy('disk_low', name=name, error=error_msg))
+        return
+    if reservation is None:
+        headroom = session.disk_ledger.headroom
+        needed_gb = (required_bytes + headroom) / (1024**3)
+        free_gb = max(0, available + headroom) / (1024**3)
+        error_msg = f"Insufficient disk space (need {needed_gb:.1f} GB, free {free_gb:.1f} GB)"
+        session.mark_processed(archive_path, failed_reason=error_msg)
+        logger.warning(i18n.lazy('disk_low', name=name, error=error_msg))
+        return
+    staging = None
+    try:
+        logger.info(i18n.lazy('unzipping', name=name))
+        timeout = session.throughput.time_budget(unpacked_bytes)
+
+        def _log_progress(percent: int, written: int, elapsed: float) -> None:
+            reservation.update(written)
+            speed = written / (1024**2) / elapsed if elapsed > 0 else 0.0
+            logger.info(i18n.lazy('extraction_progress', name=name, percent=percent, speed=f"{speed:.1f}"))
+
+        result = None
+        unsupported = []
+        for backend in select_backends(session, archive_path, volumes):
+            if staging is not None:
+                # 上一个后端无法处理或解压出错：丢弃其暂存内容，由下一个后端重新解压
+                discard_staging_dir(staging)
+            staging = create_staging_dir(index.root)
+            session.journal_extracting(archive_path, staging)
+            try:
+                result = backend.extract(
+                    archive_path,
+                    staging,
+                    max_bytes=config.max_unpacked_gb * (1024 ** 3),
+                    max_files=config.max_files,
+                    guard=config.runtime_guard,
+                    timeout=timeout,
+                    on_progress=_log_progress,
+                    stream_bytes=unpacked_bytes
+                )
+            except UnsupportedArchive as e:
+                unsupported.append(str(e))
+                logger.debug(f"{backend.name} backend cannot extract {name}: {e}")
+                continue
+            METRICS.observe('extraction_seconds', result.elapsed, backend=backend.name)
+            METRICS.inc('extracted_bytes_total', result.bytes_written, backend=backend.name)
+            METRICS.inc('extracted_entries_total', len(result.written), backend=backend.name)
+            # 成功、超限与超时都是最终结果，不再换后端重试
+            if result.returncode == 0 or result.limit_error or result.timed_out or result.stalled:
+                break
+            logger.debug(f"{backend.name} backend failed on {name}: {result.stderr.strip()}")
+        if result is None:
+            if session.sevenzip is None:
+                unsupported.append("7-Zip not found")
+            error_msg = "No extraction backend can handle this archive" + (f" ({'; '.join(unsupported)})" if unsupported else "")
+            session.mark_processed(archive_path, failed_reason=error_msg)
+            logger.error(i18n.lazy('unzip_failed', name=name, error=error_msg))
+            return
+        if result.returncode != 0 or result.limit_error or result.timed_out or result.stalled:
+            # 失败时只需丢弃暂存目录，目标目录中不会留下任何残缺文件
+            discard_staging_dir(staging)
+            if result.written:
+                logger.warning(i18n.lazy('extraction_rolled_back', name=name, count=len(result.written)))
+        if result.limit_error:
+            error_msg = f"Safety check failed: {result.limit_error}"
+            session.mark_processed(archive_path, failed_reason=error_msg)
+            logger.warning(i18n.lazy('unsafe_archive', name=name, reason=result.limit_error))
+            return
+        if result.timed_out or result.stalled:
+            if result.timed_out:
+                error_msg = f"Extraction timeout ({timeout:.0f}s, {result.percent}% done)"
+            else:
+                error_msg = f"Extraction stalled (no progress for {EXTRACTION_STALL_TIMEOUT}s, {result.percent}% done)"
+            session.mark_processed(archive_path, failed_reason=error_msg)
+            logger.error(i18n.lazy('unzip_failed', name=name, error=error_msg))
+            return
+        if result.returncode != 0:
+            error_msg = result.stderr.strip() or "Extractor returned non-zero exit code"
+            session.mark_processed(archive_path, failed_reason=error_msg)
+            logger.error(i18n.lazy('unzip_failed', name=name, error=error_msg))
+            return
+        folder = output_folder_name(name) if config.separate_folders else None
+        # 提交前先让“即将提交”落盘：此后无论何时崩溃，下次运行都会完成提交，而不是重新解压
+        session.journal_committing(archive_path, staging, index.root, folder, (volumes or [archive_path]) + (duplicates or []))
+        session.journal_sync()
+        committed = commit_staging_dir(staging, index.root, folder)
+        staging = None
+        index.add_outputs(committed)
+        session.add_outputs(archive_path, index.root, committed)
+        session.journal_record(archive_path, 'committed')
+        session.throughput.update(result.bytes_written, result.elapsed)
+        if volumes:
+            for vol_path in volumes:
+                if os.path.exists(vol_path):
+                    os.remove(vol_path)
+                    METRICS.inc('deleted_total', kind='source')
+                    index.remove(os.path.basename(vol_path))
+                    logger.info(i18n.lazy('volume_deleted', name=os.path.basename(vol_path)))
+        else:
+            if os.path.exists(archive_path):
+                os.remove(archive_path)
+                METRICS.inc('deleted_total', kind='source')
+                index.remove(name)
+                logger.info(i18n.lazy('unzip_success_delete', name=name))
+        _delete_duplicates(session, index, archive_path, duplicates or [])
+        session.journal_record(archive_path, 'deleted')
+        session.mark_processed(archive_path)
+    except (PermissionError, OSError) as e:
+        error_msg = f"System error: {str(e)}"
+        session.mark_processed(archive_path, failed_reason=error_msg)
+        logger.error(i18n.lazy('unzip_failed', name=name, error=error_msg))
+    finally:
+        if staging is not None:
+            discard_staging_dir(staging)
+        reservation.release()
+
+def _plan_batches(
+    tasks: List[Tuple[str, Optional[List[str]], int]],
+    session: 'Session'
+) -> Tuple[List[List[str]], List[Tuple[str, Optional[List[str]], int]]]:
+    """
+    挑出适合批量解压的小压缩包（非分卷、非压缩 tar 包、需要 7-Zip 处理），分成若干批，返回 (批次列表, 其余任务)。
+    压缩 tar 包留给逐个解压的管道流程，一次 7z 批量调用只会解开外层，留下中间的 .tar 文件。
+    同一批内各压缩包去掉扩展名后的名称互不相同，保证 7z 为它们创建的子目录不会冲突。
+    """
+    config = session.config
+    singles = []
+    batches: List[Tuple[List[str], Set[str]]] = []
+    for task in tasks:
+        archive_path, volumes, _ = task
+        try:
+            size = os.path.getsize(archive_path)
+        except OSError:
+            size = None
+        if (volumes or size is None or size > BATCH_MAX_ARCHIVE_BYTES
+                or is_compressed_tarball(os.path.basename(archive_path))):
+            singles.append(task)
+            continue
+        # 只有首选后端是 7z 的压缩包才值得合并成一次 7z 调用
+        first = next((b for b in session.backends if b.supports(archive_path, None)), None)
+        if not isinstance(first, SevenZipBackend):
+            singles.append(task)
+            continue
+        stem = os.path.splitext(os.path.basename(archive_path))[0].lower()
+        batch = next((b for b in batches if len(b[0]) < config.batch_size and stem not in b[1]), None)
+        if batch is None:
+            batch = ([], set())
+            batches.append(batch)
+        batch[0].append(archive_path)
+        batch[1].add(stem)
+    planned = []
+    for paths, _ in batches:
+        if len(paths) > 1:
+            planned.append(paths)
+        else:
+            singles.extend((path, None, 0) for path in paths)
+    return planned, singles
+
+def extract_batch(
+    session: 'Session',
+    index: DirectoryIndex,
+    archive_paths: List[str],
+    duplicates: Optional[Dict[str, List[str]]] = None
+) -> List[str]:
+    """
+    用一次 7z 调用（列表文件 + -o…/*）解压一批小压缩包，并把结果逐个归属到各压缩包。
+
+    每个压缩包解压到暂存目录下以其名称命名的子目录：成功者各自提交并删除源文件，报错者单独记录失败原因。
+    无法确定结果的压缩包（未出现在输出中、找不到其子目录、7z 以非零状态退出时最后一个开始处理的，
+    或整批因超限/超时被终止）不提交，返回给调用方逐个重新解压。duplicates 为各压缩包内容相同的副本，随源文件一起删除。
+    """
+    duplicates = duplicates or {}
+    i18n = session.i18n
+    config = session.config
+    accepted: Dict[str, str] = {}
+    total_bytes = 0
+    for archive_path in archive_paths:
+        name = os.path.basename(archive_path)
+        # 启用运行时守护时只用缓存与原生头部解析做预检，不为每个小包单独启动 7z 列表，漏网的炸弹由守护拦截；
+        # 关闭守护时没有这道保障，原生解析不了的压缩包（如 rar）仍需 7z 列表预检
+        is_dangerous, reason, unpacked_bytes = analyze_archive_safety(session, archive_path, max_unpacked_gb=config.max_unpacked_gb, max_files=config.max_files, use_7zip=not config.runtime_guard)
+        if is_dangerous:
+            error_msg = f"Safety check failed: {reason}"
+            session.mark_processed(archive_path, failed_reason=error_msg)
+            logger.warning(i18n.lazy('unsafe_archive', name=name, reason=reason))
+            continue
+        try:
+            archive_size = os.path.getsize(archive_path)
+        except OSError:
+            # 监视模式下源文件可能在两步之间被移走，不参与本批
+            continue
+        accepted[os.path.normcase(os.path.abspath(archive_path))] = archive_path
+        total_bytes += max(unpacked_bytes, archive_size)
+    if len(accepted) < 2:
+        return list(accepted.values())
+    try:
+        # 整批一次预留；当前放不下时不等待，交给逐个解压（逐个预留、等待或报告空间不足）
+        reservation, _ = session.disk_ledger.reserve(index.root, reservation_size(total_bytes), wait=False)
+    except OSError:
+        return list(accepted.values())
+    if reservation is None:
+        return list(accepted.values())
+
+    archive_dirs = {key: os.path.splitext(os.path.basename(path))[0] for key, path in accepted.items()}
+    logger.info(i18n.lazy('batch_extracting', count=len(accepted)))
+    staging = None
+    try:
+        staging = create_staging_dir(index.root)
+        for archive_path in accepted.values():
+            session.journal_extracting(archive_path, staging)
+        list_file = os.path.join(staging, BATCH_LIST_FILE)
+        with open(list_file, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(accepted.values()) + '\n')
+        result = run_guarded_extraction(
+            [session.sevenzip, 'x', '-an', f'-ai@{list_file}', '-scsUTF-8', f'-o{os.path.join(staging, "*")}',
+             '-y', '-bb1', '-bsp1', '-bse1'],
+            staging,
+            max_bytes=config.max_unpacked_gb * (1024 ** 3),
+            max_files=config.max_files,
+            guard=config.runtime_guard,
+            timeout=session.throughput.time_budget(total_bytes),
+            archive_dirs=archive_dirs
+        )
+        METRICS.observe('extraction_seconds', result.elapsed, backend='7z-batch')
+        METRICS.inc('extracted_bytes_total', result.bytes_written, backend='7z-batch')
+        METRICS.inc('extracted_entries_total', len(result.written), backend='7z-batch')
+        if result.limit_error or result.timed_out or result.stalled:
+            # 无法判断是哪个压缩包触发的：整批丢弃，逐个重新解压以得到准确的归属
+            return list(accepted.values())
+        # 7z 逐个处理列表中的压缩包：开始处理下一个即说明上一个已结束。以非零状态退出（含崩溃或被终止）时，
+        # 最后一个开始处理的压缩包可能只解出一部分，不能据其输出判断成败
+        unconfirmed = set(list(result.archives)[-1:]) if result.returncode != 0 else set()
+        retry = []
+        ready = []
+        for key, archive_path in accepted.items():
+            name = os.path.basename(archive_path)
+            errors = result.archives.get(key)
+            out_dir = os.path.join(staging, archive_dirs[key])
+            if errors is None or key in unconfirmed or (not errors and not os.path.isdir(out_dir)):
+                retry.append(archive_path)
+                continue
+            if errors:
+                error_msg = "; ".join(errors)
+                session.mark_processed(archive_path, failed_reason=error_msg)
+                logger.error(i18n.lazy('unzip_failed', name=name, error=error_msg))
+                continue
+            folder = output_folder_name(name) if config.separate_folders else None
+            session.journal_committing(archive_path, out_dir, index.root, folder,
+                                       [archive_path] + duplicates.get(archive_path, []), staging=staging)
+            ready.append((archive_path, name, out_dir, folder))
+        # 整批只落盘一次，然后逐个提交
+        session.journal_sync()
+        for archive_path, name, out_dir, folder in ready:
+            committed = commit_staging_dir(out_dir, index.root, folder)
+            index.add_outputs(committed)
+            session.add_outputs(archive_path, index.root, committed)
+            session.journal_record(archive_path, 'committed')
+            if os.path.exists(archive_path):
+                os.remove(archive_path)
+                METRICS.inc('deleted_total', kind='source')
+                index.remove(name)
+                logger.info(i18n.lazy('unzip_success_delete', name=name))
+            _delete_duplicates(session, index, archive_path, duplicates.get(archive_path, []))
+            session.journal_record(archive_path, 'deleted')
+            session.mark_processed(archive_path)
+        return retry
+    except OSError as e:
+        logger.debug(f"Batch extraction failed: {e}")
+        return [path for path in accepted.values() if not session.is_processed(path) and os.path.exists(path)]
+    finally:
+        if staging is not None:
+            discard_staging_dir(staging)
+        reservation.release()
+
+class FairScheduler:
+    """
+    全局解压工作池：所有根目录（会话）共用 workers 个工作线程，总并发不超过 --jobs。
+
+    每个提交者（会话）有自己的任务队列，空闲的工作线程按轮转顺序依次从各队列取一个任务，
+    任务多的根目录不会让其他根目录饿死。工作线程在首次提交时按需启动。
+    """
+
+    def __init__(self, workers: int):
+        from collections import OrderedDict
+        self.workers = max(1, workers)
+        self._queues: 'OrderedDict[object, deque]' = OrderedDict()
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._idle = 0
+        self._closed = False
+
+    def submit(self, owner, func, *args):
+        """把任务放入 owner 的队列，返回 concurrent.futures.Future"""
+        from concurrent.futures import Future
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("scheduler is closed")
+            self._queues.setdefault(owner, deque()).append((future, func, args, time.perf_counter()))
+            if not self._idle and len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._work, name=f"extract-{len(self._threads)}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            else:
+                self._cond.notify()
+        return future
+
+    def cancel(self, owner=None) -> None:
+        """取消 owner（省略时为全部）尚未开始的任务；已在运行的任务不受影响"""
+        with self._cond:
+            owners = list(self._queues) if owner is None else [owner]
+            for key in owners:
+                for future, _, _, _ in self._queues.pop(key, ()):
+                    future.cancel()
+
+    def close(self) -> None:
+        """取消全部排队任务并让工作线程在当前任务结束后退出"""
+        self.cancel()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def _next(self):
+        """按轮转顺序取下一个任务（调用方需持有 _cond）：取完后该队列移到末尾"""
+        owner, queue = next(iter(self._queues.items()))
+        item = queue.popleft()
+        if queue:
+            self._queues.move_to_end(owner)
+        else:
+            del self._queues[owner]
+        return item
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queues and not self._closed:
+                    self._idle += 1
+                    self._cond.wait()
+                    self._idle -= 1
+                if not self._queues:
+                    return
+                future, func, args, queued = self._next()
+            if not future.set_running_or_notify_cancel():
+                continue
+            METRICS.observe('queue_wait_seconds', time.perf_counter() - queued)
+            try:
+                result = func(*args)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+def _task_size(task: Tuple[str, Optional[List[str]], int]) -> int:
+    """任务的压缩数据大小（分卷组为各分卷之和）"""
+    archive_path, volumes, expected_bytes = task
+    if volumes:
+        return expected_bytes
+    try:
+        return os.path.getsize(archive_path)
+    except OSError:
+        return 0
+
+def order_tasks(tasks: List[Tuple[str, Optional[List[str]], int]], order: str) -> None:
+    """
+    按策略就地排序解压任务：name 按路径；smallest 小的优先（尽快完成更多压缩包，空间紧张时能解压的数量最多）；
+    largest 大的优先（趁空间充足先放下大包，小包填补剩余空间）。大小以压缩数据大小估计，相同时按路径。
+    """
+    if order == 'name':
+        tasks.sort()
+        return
+    sizes = {task[0]: _task_size(task) for task in tasks}
+    sign = -1 if order == 'largest' else 1
+    tasks.sort(key=lambda task: (sign * sizes[task[0]], task[0]))
+
+def _is_archive_volume_set(session: 'Session', volume_set: VolumeSet) -> bool:
+    """
+    分卷组的第一卷是否确为压缩包。文件名像分卷的普通文件（notes.001、report_part1.pdf）不构成分卷组；
+    第一卷尚未出现时只能依据文件名，仅带压缩扩展名（foo.7z.002、foo.part2.rar）或 zip 分卷（.z02）时才算。
+    """
+    first = volume_set.members[0]
+    if first.volume_number != 1:
+        return volume_set.scheme == 'zip_split' or volume_set.group_key.endswith(tuple(ARCHIVE_EXTENSIONS))
+    try:
+        return sniff_file(session, first.path) is not None
+    except OSError as e:
+        logger.debug(f"Cannot sniff {first.path}: {e}")
+        return False
+
+def unzip(
+    session: 'Session',
+    index: DirectoryIndex,
+    quota: Optional[TreeQuota] = None
+) -> None:
+    """
+    解压操作：从索引中收集相互独立的压缩包/分卷组并解压。只有一个会话在运行且 config.jobs 为 1 时
+    在当前线程中串行执行，否则交给引擎的全局工作池，与其他根目录的任务公平分享 config.jobs 个并发。
+    """
+    from concurrent.futures import as_completed
+    i18n = session.i18n
+    config = session.config
+    tasks: List[Tuple[str, Optional[List[str]], int]] = []
+    claimed: Set[str] = set()
+    for volume_set in index.volume_sets():
+        paths = volume_set.paths
+        claimed.update(paths)
+        if any(path in session.failed for path in paths):
+            continue
+        if not _is_archive_volume_set(session, volume_set):
+            # 只是名字像分卷的普通文件：按普通文件处理，不报告为不完整的分卷组
+            if not all(session.is_processed(path) for path in paths):
+                logger.info(i18n.lazy('file_verified', name=volume_set.name))
+            for path in paths:
+                session.mark_processed(path)
+            continue
+        missing = volume_set.missing()
+        if missing:
+            # 不完整的分卷组不调用 7-Zip：记录原因并暂缓，监视模式下补齐分卷后会重新尝试
+            error_msg = f"Incomplete volume set (missing: {', '.join(missing)})"
+            session.mark_processed(paths[0], failed_reason=error_msg)
+            for path in paths[1:]:
+                session.mark_processed(path)
+            session.record_outcome(paths[0], 'incomplete')
+            logger.warning(i18n.lazy('volume_set_incomplete', name=volume_set.name, missing=', '.join(missing)))
+            continue
+        tasks.append((volume_set.entry_point.path, paths, volume_set.total_size))
+    for entry in index.archive_entries():
+        if entry.is_volume or entry.path in claimed or entry.path in session.failed:
+            continue
+        tasks.append((entry.path, None, 0))
+    duplicates: Dict[str, List[str]] = {}
+    if config.dedup:
+        # 去重阶段：内容相同的单个压缩包只保留一份参与解压，副本不再分析、解压或占用配额
+        duplicates = find_duplicates(session, [task[0] for task in tasks if not task[1]])
+        skipped = {path for group in duplicates.values() for path in group}
+        for original, group in duplicates.items():
+            for path in group:
+                logger.info(i18n.lazy('duplicate_found', name=os.path.basename(path), original=os.path.basename(original)))
+        tasks = [task for task in tasks if task[0] not in skipped]
+    order_tasks(tasks, config.order)
+
+    runnable = []
+    for archive_path, volumes, expected_bytes in tasks:
+        if quota is not None and not quota.acquire(index.tree):
+            error_msg = f"Tree quota exceeded ({quota.limit} archives in {index.tree})"
+            session.mark_processed(archive_path, failed_reason=error_msg)
+            for path in volumes or ():
+                session.mark_processed(path)
+            session.record_outcome(archive_path, 'quota')
+            logger.warning(i18n.lazy('unsafe_archive', name=os.path.basename(archive_path), reason=error_msg))
+            continue
+        runnable.append((archive_path, volumes, expected_bytes))
+
+    def _settle_duplicates(archive_path: str) -> None:
+        """副本随保留的一份结束处理：成功时已随源文件删除，失败时记录同样的原因"""
+        reason = session.failed.get(archive_path)
+        for path in duplicates.get(archive_path, ()):
+            if reason:
+                session.mark_processed(path, failed_reason=f"{reason} (duplicate of {os.path.basename(archive_path)})")
+                session.record_outcome(path)
+            else:
+                session.mark_processed(path)
+                session.record_outcome(path, 'duplicate')
+
+    def _run(archive_path: str, volumes: Optional[List[str]], expected_bytes: int) -> None:
+        extract_archive(session, index, archive_path, volumes, expected_bytes, duplicates.get(archive_path))
+        session.record_outcome(archive_path)
+        _settle_duplicates(archive_path)
+        # 无论成败，分卷组的其余成员都随入口文件一起结束处理，不再留在前沿中
+        for path in volumes or ():
+            session.mark_processed(path)
+
+    def _run_batch(batch: List[str]) -> None:
+        retry = extract_batch(session, index, batch, duplicates)
+        for archive_path in batch:
+            if archive_path not in retry:
+                session.record_outcome(archive_path)
+                _settle_duplicates(archive_path)
+        for archive_path in retry:
+            _run(archive_path, None, 0)
+
+    work = []
+    if config.batch_size > 1 and session.sevenzip is not None:
+        batches, runnable = _plan_batches(runnable, session)
+        work.extend((_run_batch, (batch,)) for batch in batches)
+    work.extend((_run, task) for task in runnable)
+
+    if session.extractor.active_sessions <= 1 and (config.jobs <= 1 or len(work) <= 1):
+        for func, args in work:
+            func(*args)
+        return
+    # 各任务互不共享源文件，可安全并行；会话状态由 Session 加锁维护
+    scheduler = session.extractor.scheduler
+    futures = [scheduler.submit(session, func, *args) for func, args in work]
+    try:
+        for future in as_completed(futures):
+            future.result()
+    except BaseException:
+        # 中断或某个任务出错：撤下本会话尚未开始的任务，已开始的任务各自收尾
+        scheduler.cancel(session)
+        raise
+
+# =============================================================================
+# 目录监视（--watch）
+# =============================================================================
+
+def _walk_subdirs(root: str, max_depth: int, rel: str = '') -> Iterable[str]:
+    """按相对路径列出 root 下 max_depth 层以内的子目录（不含暂存目录与符号链接）"""
+    depth = rel.count(os.sep) + 1 if rel else 0
+    if depth >= max_depth:
+        return
+    try:
+        with os.scandir(os.path.join(root, rel)) as entries:
+            names = [entry.name for entry in entries
+                     if not is_staging_name(entry.name) and entry.is_dir(follow_symlinks=False)]
+    except OSError:
+        return
+    for name in names:
+        child = os.path.join(rel, name)
+        yield child
+        yield from _walk_subdirs(root, max_depth, child)
+
+class _InotifyWatcher:
+    """
+    基于 Linux inotify 的目录监视器（通过 ctypes 调用 libc，无额外依赖）。
+
+    max_depth > 0 时同时监视该深度以内的子目录，新建或移入的子目录随即加入监视；
+    wait() 返回相对根目录的路径，子目录本身出现时也返回它的路径。
+    """
+    _IN_CLOSE_WRITE = 0x00000008
+    _IN_MOVED_TO = 0x00000080
+    _IN_CREATE = 0x00000100
+    _IN_MOVE_SELF = 0x00000800
+    _IN_Q_OVERFLOW = 0x00004000
+    _IN_IGNORED = 0x00008000
+    _IN_ISDIR = 0x40000000
+    _IN_CLOEXEC = 0o2000000
+    _EVENT_HEADER_FORMAT = 'iIII'
+
+    def __init__(self, path: str, max_depth: int = 0):
+        import ctypes
+        import ctypes.util
+        import struct
+        self._ctypes = ctypes
+        self._event_header = struct.Struct(self._EVENT_HEADER_FORMAT)
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or None, use_errno=True)
+        self.path = path
+        self.max_depth = max_depth
+        self._mask = self._IN_CLOSE_WRITE | self._IN_MOVED_TO
+        if max_depth > 0:
+            self._mask |= self._IN_CREATE | self._IN_MOVE_SELF
+        self._dirs: Dict[int, str] = {}     # 监视描述符 → 目录的相对路径（根目录为空串）
+        self.fd = self._libc.inotify_init1(self._IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        try:
+            self._add_watch('')
+        except OSError:
+            os.close(self.fd)
+            raise
+        self._add_subdirs('')
+
+    def _add_watch(self, rel: str) -> None:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(os.path.join(self.path, rel)), self._mask)
+        if wd < 0:
+            raise OSError(self._ctypes.get_errno(), "inotify_add_watch failed")
+        self._dirs[wd] = rel
+
+    def _add_subdirs(self, rel: str) -> None:
+        """监视 rel 下深度限制以内的全部子目录（目录在此期间消失时跳过）"""
+        for child in _walk_subdirs(self.path, self.max_depth, rel):
+            try:
+                self._add_watch(child)
+            except OSError:
+                continue
+
+    def _read_events(self, paths: Set[str]) -> bool:
+        """读取一批事件并写入 paths，队列溢出时返回 False"""
+        buf = os.read(self.fd, 64 * 1024)
+        offset = 0
+        header_size = self._event_header.size
+        while offset + header_size <= len(buf):
+            wd, mask, _, name_len = self._event_header.unpack_from(buf, offset)
+            offset += header_size
+            raw_name = buf[offset:offset + name_len].rstrip(b'\0')
+            offset += name_len
+            if mask & self._IN_Q_OVERFLOW:
+                return False
+            if mask & self._IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            rel = self._dirs.get(wd)
+            if rel is None:
+                continue
+            if mask & self._IN_MOVE_SELF:
+                # 子目录被移走：移到树内时新位置已重新加入监视（同一描述符），移出树外则不再监视
+                if rel and not os.path.isdir(os.path.join(self.path, rel)):
+                    self._libc.inotify_rm_watch(self.fd, wd)
+                continue
+            if not raw_name:
+                continue
+            name = os.fsdecode(raw_name)
+            path = os.path.join(rel, name)
+            if mask & self._IN_ISDIR:
+                if self.max_depth > 0 and not is_staging_name(name) and mask & (self._IN_CREATE | self._IN_MOVED_TO):
+                    if path.count(os.sep) < self.max_depth:
+                        try:
+                            self._add_watch(path)
+                        except OSError:
+                            continue
+                        self._add_subdirs(path)
+                        paths.add(path)
+            elif mask & (self._IN_CLOSE_WRITE | self._IN_MOVED_TO):
+                paths.add(path)
+        return True
+
+    def _rescan(self) -> List[str]:
+        """队列溢出后的全量补偿：重新加入子目录监视，返回根目录的全部文件与所有子目录"""
+        self._add_subdirs('')
+        return _list_file_names(self.path) + sorted(rel for rel in self._dirs.values() if rel)
+
+    def wait(self, stop: Optional[threading.Event] = None) -> List[str]:
+        """阻塞直到出现新文件或子目录，返回合并后的相对路径列表；stop 被设置时返回空列表"""
+        import select
+        paths: Set[str] = set()
+        while not select.select([self.fd], [], [], WATCH_STOP_CHECK_SECONDS if stop is not None else None)[0]:
+            if stop.is_set():
+                return []
+        if not self._read_events(paths):
+            return self._rescan()
+        deadline = time.monotonic() + WATCH_MAX_BATCH_SECONDS
+        while time.monotonic() < deadline:
+            readable, _, _ = select.select([self.fd], [], [], WATCH_SETTLE_SECONDS)
+            if not readable:
+                break
+            if not self._read_events(paths):
+                return self._rescan()
+        return sorted(paths)
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+class _PollingWatcher:
+    """
+    可移植的轮询监视器：比较相邻两次快照中文件的大小与修改时间。
+
+    max_depth > 0 时快照包含该深度以内的子目录及其中的文件，新出现的子目录也会返回。
+    """
+
+    def __init__(self, path: str, interval: float = WATCH_POLL_INTERVAL, max_depth: int = 0):
+        self.path = path
+        self.interval = interval
+        self.max_depth = max_depth
+        self.snapshot = self._take_snapshot()
+
+    def _take_snapshot(self) -> Dict[str, Optional[Tuple[int, int]]]:
+        """相对路径 → (大小, 修改时间)；子目录的值为 None"""
+        snapshot: Dict[str, Optional[Tuple[int, int]]] = {}
+        for rel in [''] + list(_walk_subdirs(self.path, self.max_depth)):
+            if rel:
+                snapshot[rel] = None
+            try:
+                with os.scandir(os.path.join(self.path, rel)) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_file():
+                                st = entry.stat()
+                                snapshot[os.path.join(rel, entry.name)] = (st.st_size, st.st_mtime_ns)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return snapshot
+
+    def wait(self, stop: Optional[threading.Event] = None) -> List[str]:
+        """阻塞直到出现新建或变化的文件（或新的子目录），返回相对路径列表；stop 被设置时返回空列表"""
+        while True:
+            METRICS.sleep(self.interval, reason='watch_poll')
+            if stop is not None and stop.is_set():
+                return []
+            current = self._take_snapshot()
+            changed = [rel for rel, sig in current.items() if rel not in self.snapshot or self.snapshot[rel] != sig]
+            self.snapshot = current
+            if changed:
+                return sorted(changed)
+
+    def close(self) -> None:
+        pass
+
+def _list_file_names(path: str) -> List[str]:
+    """返回目录下所有普通文件名（用于 inotify 队列溢出时的全量补偿）"""
+    with os.scandir(path) as entries:
+        return sorted(entry.name for entry in entries if entry.is_file())
+
+def create_directory_watcher(path: str, max_depth: int = 0):
+    """优先使用 inotify，不可用时退化为轮询；max_depth 为同时监视的子目录深度"""
+    if sys.platform.startswith('linux'):
+        try:
+            return _InotifyWatcher(path, max_depth)
+        except (OSError, AttributeError):
+            pass
+    return _PollingWatcher(path, max_depth=max_depth)
+
+def _requeue_new_file(session: 'Session', index: DirectoryIndex, name: str) -> None:
+    """把监视到的新文件放回 index 的前沿"""
+    path = os.path.join(index.root, name)
+    # 失败过的文件被重新放入时允许重试；本程序自身产生的文件已记为处理过
+    if path in session.failed or path in session.detection_failed:
+        session.reset_processed(path)
+    if path in session.detected:
+        return
+    index.add(name)
+    entry = index.entries.get(name)
+    if entry is None or not (entry.is_volume or _zip_split_group_key(name)):
+        return
+    volume_set = index.volume_set_of(name)
+    if volume_set is not None:
+        # 分卷组来了新成员：之前因不完整而暂缓的其他成员一并重新参与处理
+        for member_path in volume_set.paths:
+            if member_path != path:
+                session.reset_processed(member_path)
+                index.add(os.path.basename(member_path))
+
+def _mark_dir_changed(session: 'Session', path: str) -> None:
+    """
+    递归模式下目录内容有变：把它及其祖先、后代移出 finished_dirs，
+    下一次 process_recursive 会沿这条路径重新遍历到它（其他已完成的目录仍然跳过）。
+    """
+    prefix = path + os.sep
+    stale = {d for d in session.finished_dirs if d.startswith(prefix)}
+    while path != session.root and path.startswith(session.root):
+        stale.add(path)
+        path = os.path.dirname(path)
+    session.finished_dirs.difference_update(stale)
+
+def run_watch_loop(session: 'Session', index: DirectoryIndex) -> None:
+    """持续监视会话根目录（递归模式下连同子目录），仅对新建或移入的文件与子目录触发处理"""
+    i18n = session.i18n
+    config = session.config
+    current_dir = index.root
+    watcher = create_directory_watcher(current_dir, config.max_depth if config.recursive else 0)
+    logger.info(i18n.lazy('watch_started', path=current_dir, backend=type(watcher).__name__.strip('_')))
+    # 首轮处理已全部落地：先清空日志，在等待事件时被中断不会留下需要续处理的记录
+    session.checkpoint()
+    try:
+        while True:
+            paths = watcher.wait(session.cancelled)
+            session.check_cancelled()
+            subdir_indexes: Dict[str, DirectoryIndex] = {}
+            for rel in paths:
+                path = os.path.join(current_dir, rel)
+                parent = os.path.dirname(rel)
+                if os.path.isdir(path) and not os.path.islink(path):
+                    # 新建或移入的子目录（只有递归模式的监视器会返回目录）
+                    if not parent:
+                        index.add_subdir(rel)
+                    _mark_dir_changed(session, path)
+                    continue
+                if not parent:
+                    _requeue_new_file(session, index, rel)
+                    continue
+                dir_path = os.path.join(current_dir, parent)
+                _mark_dir_changed(session, dir_path)
+                sub_index = subdir_indexes.get(dir_path)
+                if sub_index is None:
+                    try:
+                        sub_index = subdir_indexes[dir_path] = DirectoryIndex(dir_path, session)
+                    except OSError:
+                        continue
+                _requeue_new_file(session, sub_index, os.path.basename(rel))
+            if index.pending or config.recursive:
+                process_directory(session, index, interval=0)
+                # 每批处理完没有进行中的解压，结果已落地：写回缓存并清空日志，避免日志无限增长
+                session.checkpoint()
+                # 长期运行时每批处理后刷新 textfile，采集端能看到实时数据
+                if config.metrics_textfile:
+                    export_metrics(i18n, config, json_summary=False)
+    finally:
+        watcher.close()
+
+# =============================================================================
+# 清理与报告
+# =============================================================================
+
+class DeleteMatcher:
+    """
+    把删除列表编译成一个文件名匹配器。
+
+    普通条目按文件名精确匹配；含 * 或 ? 的条目另外作为通配符（其中的 [...] 为字符集）；以 re: 开头的条目为正则表达式。
+    只含 [ 的条目仍是精确名称，[site]readme.txt 这类常见的文件名不会被当成字符集而失配。
+    通配符与正则都匹配整个文件名，并合并为一个正则，每个文件名只需匹配一次。
+    """
+
+    REGEX_PREFIX = 're:'
+
+    def __init__(self, rules: Iterable[str]):
+        import fnmatch
+        self.rules = sorted(set(rules))
+        self.exact: Set[str] = set()
+        patterns = []
+        for rule in self.rules:
+            if rule.startswith(self.REGEX_PREFIX):
+                pattern = rule[len(self.REGEX_PREFIX):]
+                try:
+                    re.compile(pattern)
+                except re.error as e:
+                    raise ValueError(f"{rule!r}: {e}") from None
+                patterns.append(pattern)
+            else:
+                self.exact.add(rule)
+                if '*' in rule or '?' in rule:
+                    patterns.append(fnmatch.translate(rule))
+        self._patterns: List[re.Pattern] = []
+        if patterns:
+            try:
+                self._patterns = [re.compile('|'.join(f'(?:{p})' for p in patterns))]
+            except re.error:
+                # 带全局标志（如 (?i)）的正则无法嵌入分组，只能逐个匹配
+                self._patterns = [re.compile(p) for p in patterns]
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+    def __call__(self, name: str) -> bool:
+        return name in self.exact or any(p.fullmatch(name) for p in self._patterns)
+
+@dataclass
+class CleanupStats:
+    """一次清理的结果统计"""
+    files: int = 0      # 删除的文件数
+    folders: int = 0    # 删除的空文件夹数
+    failed: int = 0     # 删除或访问失败的项数
+
+class _CleanupNode:
+    """清理遍历中的一个目录：pending 为尚未完成的工作（自身扫描 + 子目录），keep 表示目录非空"""
+    __slots__ = ('path', 'parent', 'pending', 'keep')
+
+    def __init__(self, path: str, parent: Optional['_CleanupNode']):
+        self.path = path
+        self.parent = parent
+        self.pending = 1
+        self.keep = False
+
+def remove_target(
+    folder_path: str,
+    file_set: Set[str],
+    remove_target_files: bool,
+    remove_empty_dirs: bool,
+    i18n: I18N,
+    workers: int = CLEANUP_WORKERS
+) -> CleanupStats:
+    """
+    并行清理目录树：删除匹配删除规则（见 DeleteMatcher）的文件，并在同一遍中自底向上删除空文件夹。
+
+    每个目录由线程池中的一个任务扫描，就地删除其中匹配的文件，子目录作为新任务提交；
+    目录的所有子目录都完成后才判断它是否为空，因此嵌套的空文件夹一次即可全部删除。
+    folder_path 本身不会被删除。逐项日志降为 debug，结束时输出一行汇总。
+    """
+    stats = CleanupStats()
+    if not (remove_target_files or remove_empty_dirs):
+        return stats
+    from concurrent.futures import ThreadPoolExecutor
+    matcher = DeleteMatcher(file_set) if remove_target_files else None
+    lock = threading.Lock()
+    done = threading.Event()
+    started = time.monotonic()
+
+    def _failed(key: str, **kwargs) -> None:
+        with lock:
+            stats.failed += 1
+            report = stats.failed <= CLEANUP_ERROR_LOG_LIMIT
+        if report:
+            logger.error(i18n.lazy(key, **kwargs))
+
+    def _complete(node: _CleanupNode) -> None:
+        """node 的一项工作完成；全部完成时尝试删除它，并逐级通知父目录"""
+        while True:
+            with lock:
+                node.pending -= 1
+                if node.pending:
+                    return
+            parent = node.parent
+            if parent is None:
+                done.set()
+                return
+            if remove_empty_dirs and not node.keep:
+                try:
+                    os.rmdir(node.path)
+                    METRICS.inc('deleted_total', kind='folder')
+                    with lock:
+                        stats.folders += 1
+                    logger.debug(i18n.lazy('folder_deleted', path=node.path))
+                except OSError:
+                    node.keep = True
+            if node.keep:
+                parent.keep = True
+            node = parent
+
+    def _visit(node: _CleanupNode) -> None:
+        try:
+            subdirs = []
+            keep = False
+            try:
+                with os.scandir(node.path) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                subdirs.append(entry.path)
+                                continue
+                            if matcher is not None and entry.is_file() and matcher(entry.name):
+                                os.remove(entry.path)
+                                METRICS.inc('deleted_total', kind='file')
+                                with lock:
+                                    stats.files += 1
+                                logger.debug(i18n.lazy('file_deleted', path=entry.path))
+                                continue
+                        except OSError as e:
+                            _failed('delete_failed', path=entry.path, error=e)
+                        keep = True
+            except OSError as e:
+                _failed('dir_access_failed', path=node.path, error=e)
+                keep = True
+            with lock:
+                node.keep = node.keep or keep
+                node.pending += len(subdirs)
+            for path in subdirs:
+                pool.submit(_visit, _CleanupNode(path, node))
+        finally:
+            _complete(node)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        pool.submit(_visit, _CleanupNode(folder_path, None))
+        done.wait()
+    if stats.files or stats.folders or stats.failed:
+        logger.log(SUMMARY, i18n.lazy('cleanup_summary', files=stats.files, folders=stats.folders,
+                           failed=stats.failed, seconds=f"{time.monotonic() - started:.1f}"))
+    return stats
+
+def export_metrics(i18n: I18N, config: Config, json_summary: bool = True) -> None:
+    """按配置写出 JSON 指标摘要与 Prometheus textfile；写入失败只记录日志，不影响处理结果"""
+    if not (config.metrics_json or config.metrics_textfile):
+        return
+    METRICS.set('run_duration_seconds', time.time() - METRICS.started)
+    METRICS.set('last_export_timestamp_seconds', time.time())
+    targets = [(config.metrics_textfile, METRICS.write_prometheus)]
+    if json_summary:
+        targets.append((config.metrics_json, METRICS.write_json))
+    for path, write in targets:
+        if not path:
+            continue
+        try:
+            write(path)
+        except OSError as e:
+            logger.error(i18n.lazy('metrics_write_failed', path=path, error=e))
+
+def _log_failure_report(i18n: I18N, header: LazyMessage, failures: Dict[str, str], event: str) -> None:
+    """以汇总级别输出失败报告；JSON 事件模式下每个失败项是一条带 path/reason 字段的 event 事件"""
+    logger.log(SUMMARY, f"\n{'='*50}", extra=_TEXT_ONLY)
+    logger.log(SUMMARY, header)
+    logger.log(SUMMARY, f"{'='*50}", extra=_TEXT_ONLY)
+    for path, err in failures.items():
+        logger.log(SUMMARY, f"\n{i18n._('file_label', name=os.path.basename(path))}",
+                   extra={'event': event, 'fields': {'path': path, 'reason': err}})
+        logger.log(SUMMARY, i18n.lazy('path_label', path=path), extra=_TEXT_ONLY)
+        logger.log(SUMMARY, i18n.lazy('reason_label', reason=err), extra=_TEXT_ONLY)
+    logger.log(SUMMARY, f"{'='*50}\n", extra=_TEXT_ONLY)
+
+def print_detection_failure_report(i18n: I18N, failures: Dict[str, str]) -> None:
+    """打印检测失败报告"""
+    if not failures:
+        return
+    _log_failure_report(i18n, i18n.lazy('detect_fail_report_header', count=len(failures)),
+                        failures, 'detection_failed')
+
+def print_failure_report(i18n: I18N, failures: Dict[str, str]) -> None:
+    """打印解压失败报告"""
+    if not failures:
+        return
+    _log_failure_report(i18n, i18n.lazy('unzip_fail_report_header', count=len(failures)),
+                        failures, 'archive_failed')
+
+def print_run_summary(i18n: I18N, results: List['SessionResult'], cleanup: CleanupStats) -> None:
+    """输出一行本次运行（全部根目录）的汇总（安静模式下也会输出）"""
+    logger.log(SUMMARY, i18n.lazy(
+        'run_summary',
+        extracted=sum(len(result.extracted) for result in results),
+        failed=sum(len(result.failed) for result in results),
+        deleted=cleanup.files + cleanup.folders,
+        seconds=f"{time.time() - METRICS.started:.1f}"
+    ))
+
+# =============================================================================
+# 日志输出
+# =============================================================================
+
+class _AsyncLogHandler(logging.Handler):
+    """
+    把日志记录原样放入队列，由后台线程交给 target 格式化并写出；调用线程只做入队。
+    （不使用 logging.handlers 中的 QueueHandler：它在调用线程中格式化消息，且导入开销较大）
+    """
+
+    def __init__(self, target: logging.Handler):
+        super().__init__()
+        self.target = target
+        self._queue: 'queue.Queue[Optional[logging.LogRecord]]' = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+        self._thread.start()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self._queue.put(record)
+
+    def _run(self) -> None:
+        while True:
+            record = self._queue.get()
+            try:
+                if record is None:
+                    return
+                self.target.handle(record)
+            except Exception:
+                self.target.handleError(record)
+            finally:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        """等待已入队的记录全部写出"""
+        if self._thread.is_alive():
+            self._queue.join()
+        self.target.flush()
+
+    def close(self) -> None:
+        """写出剩余记录并停止后台线程（logging 在解释器退出时自动调用）"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self.target.close()
+        super().close()
+
+class _TextOnlyFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        return not getattr(record, 'text_only', False)
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    每条记录输出一行 JSON：ts、level、event（i18n 键，或记录指定的事件名，其余为 message）、
+    message（当前语言的文本）以及 data（消息参数与附加字段）。
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        msg = record.msg
+        data = dict(msg.kwargs) if isinstance(msg, LazyMessage) else {}
+        data.update(getattr(record, 'fields', None) or {})
+        event = {
+            'ts': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(record.created)) + f'.{int(record.msecs):03d}',
+            'level': record.levelname,
+            'event': getattr(record, 'event', None) or (msg.key if isinstance(msg, LazyMessage) else 'message'),
+            'message': record.getMessage().strip(),
+        }
+        if data:
+            event['data'] = data
+        if record.exc_info:
+            event['exception'] = self.formatException(record.exc_info)
+        import json
+        return json.dumps(event, ensure_ascii=False, default=str)
+
+_LOG_HANDLER: Optional[_AsyncLogHandler] = None
+
+def configure_logging(config: Config) -> None:
+    """
+    把日志改为队列 + 后台线程输出：调用线程只做入队，查表、格式化与终端写入都在后台线程中进行，
+    终端 I/O 不再拖慢处理循环。quiet 时只输出汇总、警告与错误；log_format 为 json 时输出 JSON 事件流。
+    """
+    global _LOG_HANDLER
+    handler = logging.StreamHandler(sys.stderr)
+    if config.log_format == 'json':
+        handler.setFormatter(JsonLinesFormatter())
+        handler.addFilter(_TextOnlyFilter())
+    else:
+        handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt=LOG_DATEFMT))
+    root = logging.getLogger()
+    for old in root.handlers[:]:
+        root.removeHandler(old)
+    _LOG_HANDLER = _AsyncLogHandler(handler)
+    root.addHandler(_LOG_HANDLER)
+    root.setLevel(SUMMARY if config.quiet else logging.INFO)
+
+def flush_logs() -> None:
+    """等待已入队的日志全部写出（在直接 print/input 之前调用，保证输出顺序）"""
+    if _LOG_HANDLER is not None:
+        _LOG_HANDLER.flush()
+
+# =============================================================================
+# 参数解析与主逻辑
+# =============================================================================
+
+def _requested_language(argv: List[str]) -> str:
+    """在正式解析前从命令行取出 -L/--language 的值，用于选择帮助与错误信息的语言"""
+    for i, arg in enumerate(argv):
+        if arg in ('-L', '--language'):
+            return argv[i + 1] if i + 1 < len(argv) else 'auto'
+        if arg.startswith('--language='):
+            return arg.split('=', 1)[1]
+        if arg.startswith('-L') and len(arg) > 2:
+            return arg[2:]
+    return 'auto'
+
+def parse_args() -> Config:
+    """解析命令行参数"""
+    import argparse
+    requested = _requested_language(sys.argv[1:])
+    lang = get_system_language() if requested == 'auto' else requested
+    if lang not in MESSAGES:
+        lang = 'en'
+    texts = MESSAGES[lang]['argparse']
+    parser = argparse.ArgumentParser(
+        description=texts['description'],
+        epilog=texts['epilog'],
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('-v', '--version', action='version', version=f'%(prog)s {__version__}')
+    parser.add_argument('paths', nargs='*', metavar='PATH', help=texts['paths'])
+    parser.add_argument('--paths-from', type=str, default=None, metavar='FILE', help=texts['paths_from'])
+    parser.add_argument('--order', choices=['name', 'smallest', 'largest'], default='name', help=texts['order'])
+    parser.add_argument('--no-dedup', action='store_true', help=texts['no_dedup'])
+    parser.add_argument('-y', '--yes', action='store_true', help=texts['yes'])
+    parser.add_argument('-n', '--no', action='store_true', help=texts['no'])
+    parser.add_argument('-t', '--delete-target-files', action='store_true', help=texts['delete_target'])
+    parser.add_argument('-e', '--delete-empty-folders', action='store_true', help=texts['delete_empty'])
+    parser.add_argument('-l', '--delete-list', nargs='*', default=[], help=texts['delete_list'])
     parser.add_argument('-f', '--delete-list-file', type=str, default=None, help=texts['list_file'])
     parser.add_argument('-g', '--generate-delete-list-file', action='store_true', help=texts['gen_list'])
     parser.add_argument('--add-context-menu', action='store_true', help=texts['add_context_menu'])
     parser.add_argument('--remove-context-menu', action='store_true', help=texts['remove_context_menu'])
     parser.add_argument('--max-unpacked-gb', type=int, default=50, help=texts['max_unpacked_gb'])
     parser.add_argument('--max-files', type=int, default=10000, help=texts['max_files'])
+    parser.add_argument('-j', '--jobs', type=int, default=1, metavar='N', help=texts['jobs'])
+    parser.add_argument('-w', '--watch', action='store_true', help=texts['watch'])
+    parser.add_argument('-r', '--recursive', action='store_true', help=texts['recursive'])
+    parser.add_argument('--max-depth', type=int, default=5, metavar='N', help=texts['max_depth'])
+    parser.add_argument('--tree-quota', type=int, default=1000, metavar='N', help=texts['tree_quota'])
+    parser.add_argument('--no-cache', action='store_true', help=texts['no_cache'])
+    parser.add_argument('--no-runtime-guard', action='store_true', help=texts['no_runtime_guard'])
+    parser.add_argument('-s', '--separate-folders', action='store_true', help=texts['separate_folders'])
+    parser.add_argument('--backend', choices=['auto', 'python', '7z'], default='auto', help=texts['backend'])
+    parser.add_argument('--batch', type=int, default=0, metavar='N', help=texts['batch'])
+    parser.add_argument('--metrics-json', type=str, default=None, metavar='FILE', help=texts['metrics_json'])
+    parser.add_argument('--metrics-textfile', type=str, default=None, metavar='FILE', help=texts['metrics_textfile'])
+    parser.add_argument('-q', '--quiet', action='store_true', help=texts['quiet'])
+    parser.add_argument('--log-format', choices=['text', 'json'], default='text', help=texts['log_format'])
+    parser.add_argument('--no-journal', action='store_true', help=texts['no_journal'])
     language_choices = ['auto'] + get_available_languages()
     parser.add_argument('-L', '--language',
                         choices=language_choices,
@@ -546,6 +2941,8 @@ def parse_args() -> Config:
     if args.yes and args.no:
         error_msg = MESSAGES[lang].get('yes_no_conflict', "Arguments -y and -n cannot be used together")
         parser.error(error_msg)
+    if args.jobs < 1:
+        parser.error(MESSAGES[lang].get('jobs_invalid', "--jobs must be at least 1"))
     return Config(
         delete_target_files=args.delete_target_files,
         delete_empty_folders=args.delete_empty_folders,
@@ -558,6 +2955,25 @@ def parse_args() -> Config:
         remove_context_menu=args.remove_context_menu,
         max_unpacked_gb=args.max_unpacked_gb,
         max_files=args.max_files,
+        jobs=args.jobs,
+        watch=args.watch,
+        recursive=args.recursive,
+        max_depth=args.max_depth,
+        tree_quota=args.tree_quota,
+        use_cache=not args.no_cache,
+        runtime_guard=not args.no_runtime_guard,
+        separate_folders=args.separate_folders,
+        backend=args.backend,
+        batch_size=args.batch,
+        metrics_json=args.metrics_json,
+        metrics_textfile=args.metrics_textfile,
+        quiet=args.quiet,
+        log_format=args.log_format,
+        journal=not args.no_journal,
+        roots=args.paths,
+        roots_file=args.paths_from,
+        order=args.order,
+        dedup=not args.no_dedup,
         language=lang
     )
 
@@ -568,10 +2984,10 @@ def generate_default_delete_list_file(i18n: I18N) -> None:
     try:
         with open(filename, 'w', encoding='utf-8') as f:
             f.write(default_content)
-        logger.info(i18n._('generate_success', filename=filename))
-        logger.info(i18n._('generate_tip'))
+        logger.info(i18n.lazy('generate_success', filename=filename))
+        logger.info(i18n.lazy('generate_tip'))
     except Exception as e:
-        logger.error(i18n._('generate_fail', filename=filename, error=str(e)))
+        logger.error(i18n.lazy('generate_fail', filename=filename, error=str(e)))
         sys.exit(1)
     sys.exit(0)
 
@@ -586,7 +3002,7 @@ def load_delete_list_from_file(filepath: str, i18n: I18N) -> Set[str]:
                     continue
                 file_set.add(stripped)
     except Exception as e:
-        logger.error(i18n._('list_file_read_fail', filepath=filepath, error=e))
+        logger.error(i18n.lazy('list_file_read_fail', filepath=filepath, error=e))
         sys.exit(1)
     return file_set
 
@@ -599,66 +3015,517 @@ def build_delete_file_set(config: Config, i18n: I18N) -> Set[str]:
         default_file = "delete_list.txt"
         if os.path.exists(default_file):
             file_set.update(load_delete_list_from_file(default_file, i18n))
+    try:
+        DeleteMatcher(file_set)
+    except ValueError as e:
+        logger.error(i18n.lazy('delete_rule_invalid', error=e))
+        sys.exit(1)
     return file_set
 
-def should_delete_target_files(config: Config, i18n: I18N) -> bool:
+def should_delete_target_files(config: Config, i18n: I18N, file_set: Set[str]) -> bool:
     """询问用户是否删除目标文件"""
     
-    if not FILE_NAME_SET:
-        logger.info(i18n._('no_target_files')+'\n')
+    if not file_set:
+        logger.info(i18n.lazy('no_target_files')+'\n')
         return False
     
     if config.auto_no:
         return False
     
-    print(i18n._('delete_target_intro'))
-    for filename in sorted(FILE_NAME_SET):
-        print(f" - {filename}")
+    automatic = config.auto_yes or config.delete_target_files
+    if not automatic or (config.log_format == 'text' and not config.quiet):
+        flush_logs()
+        print(i18n._('delete_target_intro'))
+        for filename in sorted(file_set):
+            print(f" - {filename}")
 
-    if config.auto_yes or config.delete_target_files:
+    if automatic:
         return True
     return input("\n"+i18n._('prompt_delete_files')+"\n").lower() == 'y'
 
 def should_delete_empty_folders(config: Config, i18n: I18N) -> bool:
     """询问用户是否删除空文件夹"""
     if config.auto_yes or config.delete_empty_folders:
-        print("\n" + i18n._('delete_empty_dirs_intro'))
+        if config.log_format == 'text' and not config.quiet:
+            flush_logs()
+            print("\n" + i18n._('delete_empty_dirs_intro'))
         return True
     
     if config.auto_no:
         return False
     
+    flush_logs()
     return input(i18n._('prompt_delete_dirs')+"\n").lower() == 'y'
 
-def run_main_loop(i18n: I18N, config: Config) -> None:
-    """主处理循环"""
-    logger.info("="*50)
-    logger.info(i18n._('welcome'))
+def process_pending_files(
+    session: 'Session',
+    index: DirectoryIndex,
+    interval: float = 1,
+    quota: Optional[TreeQuota] = None
+) -> None:
+    """反复检测与解压，直到索引前沿中没有可处理的文件；interval 为相邻两轮之间的等待时间"""
+    i18n = session.i18n
+    first = True
+    while True:
+        session.check_cancelled()
+        has_undetected, has_archives = _check_files(index)
+        if not has_undetected and not has_archives:
+            return
+        if not first and interval:
+            METRICS.sleep(interval, reason='pass_interval')
+        first = False
+        if has_undetected:
+            logger.info(i18n.lazy('detecting_undetected'))
+            with METRICS.timer('stage_seconds', stage='detect'):
+                detect_and_rename_archives(session, index)
+        if has_archives:
+            logger.info(i18n.lazy('detecting_archives'))
+            with METRICS.timer('stage_seconds', stage='extract'):
+                unzip(session, index, quota)
+
+def process_recursive(session: 'Session', root_index: DirectoryIndex, interval: float = 1) -> None:
+    """
+    以广度优先的工作队列递归处理 root_index 及其子目录。
+
+    父目录处理完毕（解压产物已写入）后才展开其子目录，因此每个子目录只需遍历一次；
+    已完成的目录记录在会话的 finished_dirs 中，监视模式下再次触发时不会重复遍历，
+    直到目录收到新的文件事件被移出 finished_dirs。
+    """
+    config = session.config
+    # 配额按轮计算：一轮处理会把嵌套的压缩包全部展开，下一轮（监视模式的下一批）重新计数
+    session.tree_quota.reset()
+    queue = deque([(root_index, 0)])
+    while queue:
+        index, depth = queue.popleft()
+        process_pending_files(session, index, interval if depth == 0 else 0, session.tree_quota)
+        session.finished_dirs.add(index.root)
+        if depth >= config.max_depth:
+            continue
+        for name in sorted(index.subdirs):
+            path = os.path.join(index.root, name)
+            if path in session.finished_dirs:
+                continue
+            try:
+                child = DirectoryIndex(path, session, tree=name if depth == 0 else index.tree)
+            except FileNotFoundError:
+                # 监视模式下子目录在两批事件之间被删除或移走
+                index.subdirs.discard(name)
+                continue
+            except OSError as e:
+                logger.error(session.i18n.lazy('dir_access_failed', path=path, error=e))
+                session.finished_dirs.add(path)
+                continue
+            queue.append((child, depth + 1))
+
+def process_directory(session: 'Session', index: DirectoryIndex, interval: float = 1) -> None:
+    """按配置处理单个目录或整棵目录树"""
+    if session.config.recursive:
+        process_recursive(session, index, interval)
+    else:
+        process_pending_files(session, index, interval)
+
+# =============================================================================
+# 嵌入接口
+# =============================================================================
+
+@dataclass
+class ArchiveOutcome:
+    """单个压缩包（分卷组以入口文件为代表）的处理结果"""
+    path: str
+    status: str                          # success / unsafe / failed / incomplete / quota / resumed / duplicate
+    reason: str = ''                     # 失败原因（成功时为空）
+    outputs: List[str] = field(default_factory=list)  # 提交到目标目录的顶层条目路径
+
+@dataclass
+class SessionResult:
+    """一次会话的结构化结果；各字典以文件路径为键"""
+    root: str
+    archives: List[ArchiveOutcome]
+    renamed: Dict[str, str]              # 原路径 → 按实际格式重命名后的路径
+    detection_failed: Dict[str, str]     # 路径 → 检测失败原因
+    failed: Dict[str, str]               # 路径 → 解压失败原因（含安全检查与不完整分卷）
+    elapsed: float
+    interrupted: bool = False
+    error: Optional[str] = None          # 与多个根目录一起运行时，使会话中止的异常
+
+    @property
+    def extracted(self) -> List[ArchiveOutcome]:
+        """成功解压（含从断点恢复提交）的压缩包"""
+        return [outcome for outcome in self.archives if outcome.status in ('success', 'resumed')]
+
+_LOCATE = object()
+
+class Extractor:
+    """
+    解压引擎：持有可在多个会话间共享的资源（配置、后端、7-Zip 路径、吞吐量估计、磁盘缓存
+    与全局解压工作池）。
+
+    每个根目录由 session(root) 创建独立的 Session，处理状态互不共享，同一进程中可在多个线程里
+    并发运行多个会话（但不要让两个会话处理同一目录树）；run_many() 同时处理多个根目录，
+    所有根目录的解压任务经同一个 FairScheduler 公平调度，总并发不超过 config.jobs。
+    过程信息写入模块 logger，运行指标记入进程级的 METRICS。
+
+        extractor = Extractor(Config(recursive=True), backend='7z')
+        result = extractor.run('/data/inbox')
+        for outcome in result.archives:
+            print(outcome.path, outcome.status, outcome.reason)
+    """
+
+    def __init__(
+        self,
+        config: Optional[Config] = None,
+        backend=None,
+        *,
+        i18n: Optional[I18N] = None,
+        sevenzip=_LOCATE,
+        delete_rules: Iterable[str] = (),
+        cache_dir: Optional[str] = None
+    ):
+        """
+        backend 为后端名（'auto'/'python'/'7z'，默认取 config.backend）、ExtractionBackend 实例或实例列表；
+        sevenzip 为 7z 可执行文件路径，默认自动查找，None 表示不使用 7-Zip；
+        delete_rules 为 cleanup() 使用的删除规则。后端名或删除规则无效时抛出 ValueError。
+        """
+        self.config = config if config is not None else Config()
+        self.i18n = i18n if i18n is not None else I18N(self.config.language)
+        self.sevenzip = locate_7zip() if sevenzip is _LOCATE else sevenzip
+        if backend is None or isinstance(backend, str):
+            self.backends = create_backends(backend or self.config.backend, self.sevenzip)
+        elif isinstance(backend, ExtractionBackend):
+            self.backends = [backend]
+        else:
+            self.backends = list(backend)
+        self.delete_rules = set(delete_rules)
+        DeleteMatcher(self.delete_rules)
+        self.throughput = ThroughputEstimator()
+        self.scheduler = FairScheduler(self.config.jobs)
+        self.disk_ledger = DiskLedger()
+        self.active_sessions = 0
+        self._lock = threading.Lock()
+        self.safety_cache: Optional[FileResultCache] = None
+        self.detection_cache: Optional[FileResultCache] = None
+        self.hash_cache: Optional[FileResultCache] = None
+        if self.config.use_cache:
+            cache_dir = cache_dir or get_cache_dir()
+            self.safety_cache = FileResultCache(os.path.join(cache_dir, SAFETY_CACHE_FILE), SAFETY_CACHE_VERSION)
+            self.detection_cache = FileResultCache(os.path.join(cache_dir, DETECTION_CACHE_FILE), DETECTION_CACHE_VERSION)
+            self.hash_cache = FileResultCache(os.path.join(cache_dir, HASH_CACHE_FILE), HASH_CACHE_VERSION)
+
+    def session(self, root: str) -> 'Session':
+        return Session(self, root)
+
+    def run(self, root: str) -> 'SessionResult':
+        """处理 root 并返回结构化结果（相当于 session(root).run()）"""
+        return self.session(root).run()
+
+    def run_many(self, roots: Iterable[str]) -> List['SessionResult']:
+        """同时处理多个根目录，按给出的顺序返回各自的结果"""
+        return self.run_sessions([self.session(root) for root in roots])
+
+    def run_sessions(self, sessions: List['Session']) -> List['SessionResult']:
+        """
+        运行一组会话。只有一个会话时直接在当前线程运行；多个会话各在一个处理线程中运行，
+        其中一个出错只记录在它的结果中，不影响其他根目录。
+
+        KeyboardInterrupt（Ctrl+C）时撤下所有排队的解压任务，通知各会话停止，
+        等待它们收尾（最多 SESSION_SHUTDOWN_GRACE 秒）后重新抛出。
+        """
+        if len(sessions) == 1:
+            return [sessions[0].run()]
+
+        def _drive(session: 'Session') -> None:
+            from concurrent.futures import CancelledError
+            try:
+                session.run()
+            except (KeyboardInterrupt, CancelledError):
+                pass
+            except Exception as e:
+                session.error = f"{type(e).__name__}: {e}"
+                logger.error(self.i18n.lazy('root_failed', path=session.root, error=session.error))
+
+        threads = [threading.Thread(target=_drive, args=(session,), name=f"root-{i}", daemon=True)
+                   for i, session in enumerate(sessions)]
+        for session, thread in zip(sessions, threads):
+            logger.info(self.i18n.lazy('root_started', path=session.root))
+            thread.start()
+        try:
+            for thread in threads:
+                # 带超时的 join 才能让主线程及时响应 Ctrl+C
+                while thread.is_alive():
+                    thread.join(0.5)
+        except KeyboardInterrupt:
+            for session in sessions:
+                session.cancel()
+            self.scheduler.cancel()
+            deadline = time.monotonic() + SESSION_SHUTDOWN_GRACE
+            for thread in threads:
+                thread.join(max(0.0, deadline - time.monotonic()))
+            raise
+        return [session.result() for session in sessions]
+
+    def close(self) -> None:
+        """停止全局工作池（正在运行的解压会继续到结束）"""
+        self.scheduler.close()
+
+    def save_caches(self) -> None:
+        """写回所有已启用的磁盘缓存"""
+        for cache in (self.safety_cache, self.detection_cache, self.hash_cache):
+            if cache is not None:
+                cache.save()
+
+class Session:
+    """
+    对单个根目录的一次处理；保存本次处理的全部状态（已处理文件、失败原因、产物与断点日志）。
+
+    同一会话内的并行解压线程通过 _lock 共享这些状态；不同会话之间没有任何共享的可变状态
+    （引擎的缓存与吞吐量估计自带锁）。
+    """
+
+    def __init__(self, extractor: Extractor, root: str):
+        self.extractor = extractor
+        self.root = os.path.abspath(root)
+        self.config = extractor.config
+        self.i18n = extractor.i18n
+        self.sevenzip = extractor.sevenzip
+        self.backends = extractor.backends
+        self.throughput = extractor.throughput
+        self.disk_ledger = extractor.disk_ledger
+        self.safety_cache = extractor.safety_cache
+        self.detection_cache = extractor.detection_cache
+        self.hash_cache = extractor.hash_cache
+        self.detected: Set[str] = set()
+        self.failed: Dict[str, str] = {}
+        self.detection_failed: Dict[str, str] = {}
+        self.renamed: Dict[str, str] = {}
+        self.outcomes: List[ArchiveOutcome] = []
+        self.finished_dirs: Set[str] = set()
+        self.tree_quota = TreeQuota(self.config.tree_quota)
+        self.journal: Optional['ProcessingJournal'] = None
+        self.index: Optional[DirectoryIndex] = None
+        self.started = time.monotonic()
+        self.interrupted = False
+        self.error: Optional[str] = None
+        self.cancelled = threading.Event()   # 由 cancel() 设置，处理循环与目录监视据此停止
+        self._outputs: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+
+    # ---------------- 处理状态 ----------------
+
+    def mark_processed(
+        self,
+        file_path: str,
+        *,
+        failed_reason: Optional[str] = None,
+        is_detection_failed: bool = False
+    ) -> None:
+        """标记文件为已处理，记录失败原因（如果有）；线程安全"""
+        with self._lock:
+            self.detected.add(file_path)
+            if failed_reason:
+                if is_detection_failed:
+                    self.detection_failed[file_path] = failed_reason
+                else:
+                    self.failed[file_path] = failed_reason
+        if failed_reason:
+            self.journal_record(file_path, 'failed', reason=failed_reason)
+
+    def reset_processed(self, path: str) -> None:
+        """清除文件的处理记录（含失败原因），使其可被重新处理；线程安全"""
+        with self._lock:
+            self.detected.discard(path)
+            self.failed.pop(path, None)
+            self.detection_failed.pop(path, None)
+
+    def cancel(self) -> None:
+        """请求停止：会话在下一个检查点以 KeyboardInterrupt 结束（可从其他线程调用）"""
+        self.cancelled.set()
+
+    def check_cancelled(self) -> None:
+        if self.cancelled.is_set():
+            raise KeyboardInterrupt
+
+    def is_processed(self, path: str) -> bool:
+        """文件是否已被某个阶段最终处理（成功或失败）"""
+        return path in self.detected or path in self.failed or path in self.detection_failed
+
+    def add_outputs(self, archive_path: str, root: str, names: List[str]) -> None:
+        """记录压缩包提交到 root 的顶层条目"""
+        with self._lock:
+            self._outputs.setdefault(archive_path, []).extend(os.path.join(root, name) for name in names)
+
+    def record_outcome(self, archive_path: str, status: Optional[str] = None) -> None:
+        """记录一个压缩包的最终结果并计入 archives_total；status 省略时按失败原因推断"""
+        reason = self.failed.get(archive_path, '')
+        if status is None:
+            if not reason:
+                status = 'success'
+            elif reason.startswith("Safety check failed"):
+                status = 'unsafe'
+            else:
+                status = 'failed'
+        if status != 'resumed':
+            METRICS.inc('archives_total', result=status)
+        with self._lock:
+            self.outcomes.append(ArchiveOutcome(archive_path, status, reason, self._outputs.pop(archive_path, [])))
+
+    # ---------------- 断点续处理日志 ----------------
+
+    def journal_record(self, path: str, state: str, **fields) -> None:
+        """向断点续处理日志追加一条状态转换（未启用日志时什么也不做）"""
+        if self.journal is not None:
+            self.journal.record(path, state, **fields)
+
+    def journal_extracting(self, archive_path: str, staging: str) -> None:
+        if self.journal is not None:
+            self.journal.record(archive_path, 'extracting', staging=self.journal.rel(staging))
+
+    def journal_committing(self, archive_path: str, output: str, root: str, folder: Optional[str],
+                           sources: List[str], staging: Optional[str] = None) -> None:
+        """记录即将提交：暂存结果位置、提交目标与源文件身份（恢复时据此确认源文件未被替换）"""
+        journal = self.journal
+        if journal is None:
+            return
+        identities = []
+        for path in sources:
+            try:
+                identities.append([journal.rel(path), FileResultCache.make_key(os.stat(path))])
+            except OSError:
+                continue
+        fields = {'output': journal.rel(output), 'root': journal.rel(root), 'folder': folder, 'sources': identities}
+        if staging is not None:
+            fields['staging'] = journal.rel(staging)
+        journal.record(archive_path, 'committing', **fields)
+
+    def journal_sync(self) -> None:
+        if self.journal is not None:
+            self.journal.sync()
+
+    def checkpoint(self) -> None:
+        """检查点：把检测与分析结果写回磁盘缓存后清空日志（调用时不能有进行中的解压）"""
+        self.extractor.save_caches()
+        if self.journal is not None:
+            self.journal.reset()
+
+    # ---------------- 运行 ----------------
+
+    def run(self) -> SessionResult:
+        """
+        处理根目录直到没有可处理的文件（配置了 watch 时持续监视）。KeyboardInterrupt 会向上传播，
+        断点日志随之保留，下次对同一目录运行时从中断处继续。
+        """
+        from concurrent.futures import CancelledError
+        completed = False
+        with self.extractor._lock:
+            self.extractor.active_sessions += 1
+        try:
+            if self.config.journal:
+                open_journal(self)
+            self.index = DirectoryIndex(self.root, self)
+            process_directory(self, self.index)
+            logger.info(self.i18n.lazy('no_files_left'))
+            if self.config.watch:
+                run_watch_loop(self, self.index)
+            completed = True
+        except (KeyboardInterrupt, CancelledError):
+            self.interrupted = True
+            raise
+        finally:
+            with self.extractor._lock:
+                self.extractor.active_sessions -= 1
+            self.extractor.save_caches()
+            close_journal(self, completed)
+        return self.result()
+
+    def cleanup(self, remove_files: bool = True, remove_empty_dirs: bool = False) -> CleanupStats:
+        """按引擎的删除规则清理根目录（删除匹配的文件和/或空文件夹）"""
+        return remove_target(self.root, self.extractor.delete_rules, remove_files, remove_empty_dirs, self.i18n)
+
+    def result(self) -> SessionResult:
+        with self._lock:
+            return SessionResult(
+                root=self.root,
+                archives=list(self.outcomes),
+                renamed=dict(self.renamed),
+                detection_failed=dict(self.detection_failed),
+                failed=dict(self.failed),
+                elapsed=time.monotonic() - self.started,
+                interrupted=self.interrupted,
+                error=self.error
+            )
+
+def run_main_loop(extractor: Extractor, sessions: List[Session]) -> None:
+    """主处理循环：同时处理全部根目录"""
+    i18n = extractor.i18n
+    config = extractor.config
+    logger.info("="*50, extra=_TEXT_ONLY)
+    logger.info(i18n.lazy('welcome'))
     for feat in MESSAGES[i18n.lang]['features']:
-        logger.info(feat)
-    logger.info(i18n._('safety_limits', max_gb=config.max_unpacked_gb, max_files=config.max_files))
-    logger.info(i18n._('start_processing'))
+        logger.info(feat, extra=_TEXT_ONLY)
+    logger.info(i18n.lazy('safety_limits', max_gb=config.max_unpacked_gb, max_files=config.max_files))
+    logger.info(i18n.lazy('start_processing'))
     try:
-        while True:
-            has_undetected, has_archives = _check_files()
-            if not has_undetected and not has_archives:
-                logger.info(i18n._('no_files_left'))
-                break
-            if has_undetected:
-                logger.info(i18n._('detecting_undetected'))
-                detect_and_rename_archives(i18n)
-            if has_archives:
-                logger.info(i18n._('detecting_archives'))
-                unzip(i18n, config)
-            time.sleep(1)
+        extractor.run_sessions(sessions)
     except KeyboardInterrupt:
-        logger.info(i18n._('interrupted')+'\n')
-    finally:
-        logger.info(i18n._('main_loop_done'))
-        if not FAILED_ARCHIVES:
-            logger.info(i18n._('processing_done')+'\n')
-        else:
-            print()
+        logger.log(SUMMARY, i18n.lazy('interrupted')+'\n')
+    logger.info(i18n.lazy('main_loop_done'))
+    if not any(session.failed or session.error for session in sessions):
+        logger.log(SUMMARY, i18n.lazy('processing_done')+'\n')
+    elif config.log_format == 'text' and not config.quiet:
+        flush_logs()
+        print()
+
+def load_roots_from_file(filepath: str, i18n: I18N) -> List[str]:
+    """从列表文件读取根目录（每行一个，空行与 // 注释忽略）；'-' 表示标准输入"""
+    roots = []
+    try:
+        f = sys.stdin if filepath == '-' else open(filepath, 'r', encoding='utf-8')
+        with f:
+            for line in f:
+                stripped = line.strip()
+                if stripped.startswith('//') or not stripped:
+                    continue
+                roots.append(stripped)
+    except Exception as e:
+        logger.error(i18n.lazy('roots_file_read_fail', filepath=filepath, error=e))
+        sys.exit(1)
+    return roots
+
+def resolve_roots(config: Config, i18n: I18N) -> List[str]:
+    """
+    汇总命令行与列表文件中的根目录，转为绝对路径并去重；不存在的目录跳过。
+    递归模式下位于另一个根目录之内的根目录也会跳过，避免同一目录树被两个会话同时处理。
+    未给出任何根目录时处理当前目录；给出了但全部无效时退出。
+    """
+    requested = list(config.roots)
+    if config.roots_file:
+        requested.extend(load_roots_from_file(config.roots_file, i18n))
+    if not requested:
+        return [os.getcwd()]
+    roots: List[str] = []
+    seen: Set[str] = set()
+    for path in requested:
+        root = os.path.abspath(path)
+        key = os.path.normcase(root)
+        if key in seen:
+            continue
+        seen.add(key)
+        if not os.path.isdir(root):
+            logger.error(i18n.lazy('root_invalid', path=path))
+            continue
+        roots.append(root)
+    if config.recursive:
+        # 先处理较短的路径，祖先目录总在其子孙之前
+        kept: List[str] = []
+        for root in sorted(roots, key=len):
+            parent = next((p for p in kept if os.path.normcase(root).startswith(os.path.normcase(os.path.join(p, '')))), None)
+            if parent is not None:
+                logger.warning(i18n.lazy('root_nested', path=root, parent=parent))
+                continue
+            kept.append(root)
+        roots = [root for root in roots if root in kept]
+    if not roots:
+        sys.exit(1)
+    return roots
 
 def print_cikezzz_colored():
     """打印彩色 CikeZZZ Logo"""
@@ -689,8 +3556,22 @@ def print_cikezzz_colored():
 
 def main() -> None:
     """程序主入口"""
-    print_cikezzz_colored()
+    # 禁用输出缓冲（子进程继承该环境变量），标准输出按行刷新
+    os.environ["PYTHONUNBUFFERED"] = "1"
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(line_buffering=True)
+    else:
+        sys.stdout = os.fdopen(sys.stdout.fileno(), 'w', 1)
+    logging.basicConfig(
+        format=LOG_FORMAT,
+        level=logging.INFO,
+        datefmt=LOG_DATEFMT,
+        force=True
+    )
     config = parse_args()
+    if config.log_format == 'text' and not config.quiet and sys.stdout.isatty():
+        print_cikezzz_colored()
+    configure_logging(config)
     i18n = I18N(config.language)
 
     # 优先处理右键菜单命令（早退出）
@@ -701,19 +3582,33 @@ def main() -> None:
     if config.generate_delete_list_file:
         generate_default_delete_list_file(i18n)
 
-    global SEVENZIP, FILE_NAME_SET
-    FILE_NAME_SET = build_delete_file_set(config, i18n)
-    SEVENZIP = locate_7zip()
-    run_main_loop(i18n, config)
-    
-    remove_target_files = should_delete_target_files(config, i18n)
-    remove_empty_dirs = should_delete_empty_folders(config, i18n)
-    remove_target(".", FILE_NAME_SET, remove_target_files, remove_empty_dirs, i18n)
-    
-    print_detection_failure_report(i18n)
-    print_failure_report(i18n)
-    
-    logger.info(i18n._('all_done')+'\n')
+    roots = resolve_roots(config, i18n)
+    extractor = Extractor(config, i18n=i18n, delete_rules=build_delete_file_set(config, i18n))
+    if extractor.sevenzip is None:
+        logger.warning(i18n.lazy('sevenzip_missing'))
+    sessions = [extractor.session(root) for root in roots]
+    try:
+        run_main_loop(extractor, sessions)
+        results = [session.result() for session in sessions]
+
+        remove_target_files = should_delete_target_files(config, i18n, extractor.delete_rules)
+        remove_empty_dirs = should_delete_empty_folders(config, i18n)
+        cleanup = CleanupStats()
+        with METRICS.timer('stage_seconds', stage='cleanup'):
+            for session in sessions:
+                stats = session.cleanup(remove_target_files, remove_empty_dirs)
+                cleanup.files += stats.files
+                cleanup.folders += stats.folders
+                cleanup.failed += stats.failed
+
+        print_detection_failure_report(i18n, {path: reason for result in results for path, reason in result.detection_failed.items()})
+        print_failure_report(i18n, {path: reason for result in results for path, reason in result.failed.items()})
+        print_run_summary(i18n, results, cleanup)
+    finally:
+        export_metrics(i18n, config)
+
+    logger.log(SUMMARY, i18n.lazy('all_done')+'\n')
+    flush_logs()
 
     if not any([
         config.auto_yes, config.auto_no,
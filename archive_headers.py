@@ -0,0 +1,476 @@
+# archive_headers.py
+"""
+进程内读取常见压缩格式的头部/目录信息，得到解压总大小与文件数，
+避免为每个压缩包启动一次 `7z l -slt` 子进程。
+
+支持：zip 中央目录、tar 头遍历、gzip ISIZE 尾部、xz 索引、lzma-alone 头、
+7z 头（含 LZMA/LZMA2 压缩的头）。其余格式（rar、bz2 等）返回 None，由调用方回退到 7z。
+"""
+import lzma
+import os
+import re
+import struct
+import tarfile
+import zipfile
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+__all__ = ['ArchiveStats', 'read_archive_stats', 'sniff_archive_type', 'SNIFF_SIZE']
+
+# 识别格式所需的最少头部字节（ustar 魔数位于偏移 257）
+SNIFF_SIZE = 262
+HEADER_PROBE_SIZE = 265
+# deflate 的最大压缩比约为 1032:1，gzip 的 ISIZE 只有在 压缩大小 × 该值 < 2^32 时才不可能回绕
+DEFLATE_MAX_RATIO = 1032
+TAR_BLOCK_SIZE = 512
+
+# gzip 成员头：魔数 + deflate + 保留位为 0 的 FLG + MTIME(4) + XFL(0/2/4) + OS(0-13 或 255)
+_GZIP_MEMBER_HEADER = re.compile(rb'\x1f\x8b\x08[\x00-\x1f][\s\S]{4}[\x00\x02\x04][\x00-\x0d\xff]')
+
+SEVENZIP_SIGNATURE = b'7z\xbc\xaf\x27\x1c'
+XZ_SIGNATURE = b'\xfd7zXZ\x00'
+GZIP_SIGNATURE = b'\x1f\x8b'
+ZIP_SIGNATURES = (b'PK\x03\x04', b'PK\x05\x06')
+
+# (偏移, 魔数, 扩展名, MIME)，覆盖 SUPPORTED_ARCHIVE_TYPES 中的全部格式
+ARCHIVE_SIGNATURES = [
+    (0, b'Rar!\x1a\x07', 'rar', 'application/x-rar-compressed'),
+    (0, b'PK\x03\x04', 'zip', 'application/zip'),
+    (0, b'PK\x05\x06', 'zip', 'application/zip'),
+    (0, b'PK\x07\x08', 'zip', 'application/zip'),
+    (0, SEVENZIP_SIGNATURE, '7z', 'application/x-7z-compressed'),
+    (0, b'\x1f\x8b\x08', 'gz', 'application/gzip'),
+    (0, XZ_SIGNATURE, 'xz', 'application/x-xz'),
+    (0, b'\x5d\x00\x00', 'lzma', 'application/x-lzma'),
+    (257, b'ustar', 'tar', 'application/x-tar'),
+    (0, b'\x1f\x9d', 'z', 'application/x-compress'),
+    (0, b'\x1f\xa0', 'z', 'application/x-compress'),
+]
+
+
+@dataclass
+class ArchiveStats:
+    unpacked_bytes: int     # 解压后总字节数
+    file_count: int         # 文件数（不含目录）
+
+
+class _UnsupportedArchive(Exception):
+    """头部结构超出本模块支持范围，需回退到 7z"""
+
+
+def sniff_archive_type(head: bytes) -> Optional[Tuple[str, str]]:
+    """根据文件头（至少 SNIFF_SIZE 字节，文件较短时可更少）识别压缩格式，返回 (扩展名, MIME)"""
+    for offset, magic, extension, mime in ARCHIVE_SIGNATURES:
+        if head[offset:offset + len(magic)] == magic:
+            return extension, mime
+    # bzip2：'BZh' + 块大小 1-9 + 块魔数（或空流结束魔数），避免文本文件误判
+    if head[:3] == b'BZh' and head[3:4].isdigit() and head[3:4] != b'0' and \
+            head[4:10] in (b'1AY&SY', b'\x17\x72\x45\x38\x50\x90'):
+        return 'bz2', 'application/x-bzip2'
+    return None
+
+def read_archive_stats(path: str) -> Optional[ArchiveStats]:
+    """按魔数选择原生解析器；不支持或解析失败时返回 None"""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(HEADER_PROBE_SIZE)
+            if head.startswith(ZIP_SIGNATURES):
+                return _read_zip(f)
+            if head.startswith(SEVENZIP_SIGNATURE):
+                return _read_7z(f)
+            if head.startswith(XZ_SIGNATURE):
+                return _read_xz(f)
+            if head.startswith(GZIP_SIGNATURE):
+                return _read_gzip(f)
+            if head[257:262] == b'ustar':
+                return _read_tar(f)
+            if path.lower().endswith('.lzma'):
+                return _read_lzma_alone(head)
+    except (OSError, EOFError, ValueError, IndexError, struct.error, lzma.LZMAError,
+            zipfile.BadZipFile, tarfile.TarError, _UnsupportedArchive):
+        return None
+    return None
+
+# ---------------- zip / tar / gzip / lzma ----------------
+
+def _read_zip(f) -> ArchiveStats:
+    """读取 zip 中央目录（zipfile 只读取目录，不解压数据）"""
+    f.seek(0)
+    with zipfile.ZipFile(f) as zf:
+        infos = zf.infolist()
+    files = [info for info in infos if not info.is_dir()]
+    return ArchiveStats(sum(info.file_size for info in files), len(files))
+
+def _read_tar(f) -> ArchiveStats:
+    """逐个遍历 tar 头，跳过数据块；tarfile 读到文件尾会静默结束，成员之后没有结束块说明文件被截断（如分卷 tar 的第一卷），交给 7z"""
+    f.seek(0)
+    total = 0
+    count = 0
+    with tarfile.open(fileobj=f, mode='r:') as tf:
+        for member in tf:
+            if member.isfile():
+                total += member.size
+                count += 1
+        f.seek(tf.offset)
+        if f.read(TAR_BLOCK_SIZE) != bytes(TAR_BLOCK_SIZE):
+            raise _UnsupportedArchive("tar truncated before the end-of-archive block")
+    return ArchiveStats(total, count)
+
+def _read_gzip(f) -> ArchiveStats:
+    """gzip 尾部的 ISIZE 为原始大小对 2^32 取模，只对按最大压缩比也解压不到 4 GB 的文件（约 4 MB 以内）可信，其余交给 7z"""
+    size = f.seek(0, os.SEEK_END)
+    if size < 18 or size * DEFLATE_MAX_RATIO >= 1 << 32:
+        raise _UnsupportedArchive("gzip size out of range")
+    # 尾部只记录最后一个成员的大小：由多个成员拼接成的文件（不到 4 MB，整体读入）无法由 ISIZE 得出总大小
+    f.seek(0)
+    data = f.read()
+    if _GZIP_MEMBER_HEADER.search(data, 10):
+        raise _UnsupportedArchive("multi-member gzip")
+    (isize,) = struct.unpack('<I', data[-4:])
+    return ArchiveStats(isize, 1)
+
+def _read_lzma_alone(head: bytes) -> ArchiveStats:
+    """lzma-alone 头：属性(1) + 字典大小(4) + 解压大小(8，全 1 表示未知)"""
+    if len(head) < 13:
+        raise _UnsupportedArchive("truncated lzma header")
+    (unpacked,) = struct.unpack_from('<Q', head, 5)
+    if unpacked == 0xFFFFFFFFFFFFFFFF:
+        raise _UnsupportedArchive("lzma size unknown")
+    return ArchiveStats(unpacked, 1)
+
+# ---------------- xz ----------------
+
+def _read_xz_varint(buf: bytes, pos: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+        if shift > 63:
+            raise _UnsupportedArchive("xz varint overflow")
+
+def _read_xz(f) -> ArchiveStats:
+    """从文件尾向前逐个读取 xz 流的索引，累加所有块的解压大小"""
+    pos = f.seek(0, os.SEEK_END)
+    total = 0
+    while pos > 0:
+        # 跳过流填充（4 字节对齐的 0）
+        f.seek(pos - 4)
+        if f.read(4) == b'\0\0\0\0':
+            pos -= 4
+            continue
+        if pos < 24:
+            raise _UnsupportedArchive("truncated xz stream")
+        f.seek(pos - 12)
+        footer = f.read(12)
+        if footer[10:12] != b'YZ':
+            raise _UnsupportedArchive("bad xz footer")
+        index_size = (struct.unpack_from('<I', footer, 4)[0] + 1) * 4
+        index_start = pos - 12 - index_size
+        f.seek(index_start)
+        index = f.read(index_size)
+        if index[0] != 0:
+            raise _UnsupportedArchive("bad xz index")
+        count, p = _read_xz_varint(index, 1)
+        blocks_size = 0
+        for _ in range(count):
+            unpadded, p = _read_xz_varint(index, p)
+            uncompressed, p = _read_xz_varint(index, p)
+            blocks_size += (unpadded + 3) & ~3
+            total += uncompressed
+        stream_start = index_start - blocks_size - 12
+        f.seek(stream_start)
+        if stream_start < 0 or f.read(6) != XZ_SIGNATURE:
+            raise _UnsupportedArchive("bad xz stream header")
+        pos = stream_start
+    return ArchiveStats(total, 1)
+
+# ---------------- 7z ----------------
+
+_K_END = 0x00
+_K_HEADER = 0x01
+_K_ARCHIVE_PROPERTIES = 0x02
+_K_ADDITIONAL_STREAMS_INFO = 0x03
+_K_MAIN_STREAMS_INFO = 0x04
+_K_FILES_INFO = 0x05
+_K_PACK_INFO = 0x06
+_K_UNPACK_INFO = 0x07
+_K_SUBSTREAMS_INFO = 0x08
+_K_SIZE = 0x09
+_K_CRC = 0x0A
+_K_FOLDER = 0x0B
+_K_CODERS_UNPACK_SIZE = 0x0C
+_K_NUM_UNPACK_STREAM = 0x0D
+_K_EMPTY_STREAM = 0x0E
+_K_EMPTY_FILE = 0x0F
+_K_ENCODED_HEADER = 0x17
+
+_CODEC_COPY = b'\x00'
+_CODEC_LZMA = b'\x03\x01\x01'
+_CODEC_LZMA2 = b'\x21'
+
+
+class _Reader:
+    """7z 头部字节流读取器"""
+
+    def __init__(self, buf: bytes):
+        self.buf = buf
+        self.pos = 0
+
+    def byte(self) -> int:
+        value = self.buf[self.pos]
+        self.pos += 1
+        return value
+
+    def bytes(self, n: int) -> bytes:
+        if self.pos + n > len(self.buf):
+            raise _UnsupportedArchive("truncated 7z header")
+        value = self.buf[self.pos:self.pos + n]
+        self.pos += n
+        return value
+
+    def number(self) -> int:
+        """7z 变长整数：首字节高位连续 1 的个数为附加字节数"""
+        first = self.byte()
+        mask = 0x80
+        value = 0
+        for i in range(8):
+            if not first & mask:
+                return value | ((first & (mask - 1)) << (8 * i))
+            value |= self.byte() << (8 * i)
+            mask >>= 1
+        return value
+
+    def bits(self, n: int) -> List[bool]:
+        result = []
+        mask = 0
+        byte = 0
+        for _ in range(n):
+            if mask == 0:
+                byte = self.byte()
+                mask = 0x80
+            result.append(bool(byte & mask))
+            mask >>= 1
+        return result
+
+    def defined_bits(self, n: int) -> List[bool]:
+        all_defined = self.byte()
+        return [True] * n if all_defined else self.bits(n)
+
+
+@dataclass
+class _Folder:
+    coders: List[Tuple[bytes, bytes]]       # (codec id, properties)
+    num_out_streams: int
+    bound_out_streams: List[int]
+    unpack_sizes: List[int]
+    crc_defined: bool = False
+
+    @property
+    def unpack_size(self) -> int:
+        """主输出流（未被绑定的输出流）的大小"""
+        for i in reversed(range(self.num_out_streams)):
+            if i not in self.bound_out_streams:
+                return self.unpack_sizes[i]
+        return 0
+
+
+@dataclass
+class _StreamsInfo:
+    pack_pos: int
+    pack_sizes: List[int]
+    folders: List[_Folder]
+    substream_sizes: List[int]
+
+
+def _read_folder(r: _Reader) -> _Folder:
+    coders = []
+    total_in = 0
+    total_out = 0
+    for _ in range(r.number()):
+        flag = r.byte()
+        codec = r.bytes(flag & 0x0F)
+        if flag & 0x10:
+            num_in, num_out = r.number(), r.number()
+        else:
+            num_in, num_out = 1, 1
+        props = r.bytes(r.number()) if flag & 0x20 else b''
+        if flag & 0x80:
+            raise _UnsupportedArchive("alternative coder methods")
+        coders.append((codec, props))
+        total_in += num_in
+        total_out += num_out
+    bound_out = []
+    for _ in range(total_out - 1):
+        r.number()
+        bound_out.append(r.number())
+    num_packed = total_in - (total_out - 1)
+    if num_packed > 1:
+        for _ in range(num_packed):
+            r.number()
+    return _Folder(coders, total_out, bound_out, [])
+
+def _skip_digests(r: _Reader, n: int) -> List[bool]:
+    defined = r.defined_bits(n)
+    r.bytes(4 * sum(defined))
+    return defined
+
+def _read_streams_info(r: _Reader) -> _StreamsInfo:
+    info = _StreamsInfo(0, [], [], [])
+    prop = r.byte()
+    if prop == _K_PACK_INFO:
+        info.pack_pos = r.number()
+        num_pack = r.number()
+        prop = r.byte()
+        while prop != _K_END:
+            if prop == _K_SIZE:
+                info.pack_sizes = [r.number() for _ in range(num_pack)]
+            elif prop == _K_CRC:
+                _skip_digests(r, num_pack)
+            else:
+                raise _UnsupportedArchive(f"unexpected pack info property {prop}")
+            prop = r.byte()
+        prop = r.byte()
+    if prop == _K_UNPACK_INFO:
+        if r.byte() != _K_FOLDER:
+            raise _UnsupportedArchive("missing folder list")
+        num_folders = r.number()
+        if r.byte() != 0:
+            raise _UnsupportedArchive("external folder data")
+        info.folders = [_read_folder(r) for _ in range(num_folders)]
+        if r.byte() != _K_CODERS_UNPACK_SIZE:
+            raise _UnsupportedArchive("missing coder unpack sizes")
+        for folder in info.folders:
+            folder.unpack_sizes = [r.number() for _ in range(folder.num_out_streams)]
+        prop = r.byte()
+        while prop != _K_END:
+            if prop == _K_CRC:
+                for folder, defined in zip(info.folders, _skip_digests(r, num_folders)):
+                    folder.crc_defined = defined
+            else:
+                raise _UnsupportedArchive(f"unexpected unpack info property {prop}")
+            prop = r.byte()
+        prop = r.byte()
+    num_streams = [1] * len(info.folders)
+    if prop == _K_SUBSTREAMS_INFO:
+        prop = r.byte()
+        if prop == _K_NUM_UNPACK_STREAM:
+            num_streams = [r.number() for _ in info.folders]
+            prop = r.byte()
+        sizes: List[int] = []
+        has_sizes = prop == _K_SIZE
+        for folder, n in zip(info.folders, num_streams):
+            if n == 0:
+                continue
+            consumed = 0
+            if has_sizes:
+                for _ in range(n - 1):
+                    size = r.number()
+                    sizes.append(size)
+                    consumed += size
+            sizes.append(folder.unpack_size - consumed)
+        info.substream_sizes = sizes
+        if has_sizes:
+            prop = r.byte()
+        while prop != _K_END:
+            if prop == _K_CRC:
+                num_digests = sum(n for folder, n in zip(info.folders, num_streams)
+                                  if not (n == 1 and folder.crc_defined))
+                _skip_digests(r, num_digests)
+            else:
+                raise _UnsupportedArchive(f"unexpected substreams property {prop}")
+            prop = r.byte()
+        prop = r.byte()
+    else:
+        info.substream_sizes = [folder.unpack_size for folder in info.folders]
+    if prop != _K_END:
+        raise _UnsupportedArchive(f"unexpected streams info property {prop}")
+    return info
+
+def _read_files_info(r: _Reader) -> int:
+    """返回非目录文件数"""
+    num_files = r.number()
+    num_dirs = 0
+    empty_stream: List[bool] = []
+    while True:
+        prop = r.number()
+        if prop == _K_END:
+            break
+        size = r.number()
+        end = r.pos + size
+        if prop == _K_EMPTY_STREAM:
+            empty_stream = r.bits(num_files)
+            num_dirs = sum(empty_stream)
+        elif prop == _K_EMPTY_FILE:
+            num_dirs -= sum(r.bits(sum(empty_stream)))
+        r.pos = end
+    return num_files - num_dirs
+
+def _decode_folder(f, info: _StreamsInfo) -> bytes:
+    """解码压缩过的 7z 头（仅支持单编码器 Copy/LZMA/LZMA2）"""
+    if len(info.folders) != 1 or len(info.folders[0].coders) != 1 or not info.pack_sizes:
+        raise _UnsupportedArchive("complex encoded header")
+    folder = info.folders[0]
+    codec, props = folder.coders[0]
+    f.seek(32 + info.pack_pos)
+    packed = f.read(info.pack_sizes[0])
+    size = folder.unpack_size
+    if codec == _CODEC_COPY:
+        return packed[:size]
+    if codec == _CODEC_LZMA and len(props) == 5:
+        d = props[0]
+        filters = [{
+            'id': lzma.FILTER_LZMA1,
+            'lc': d % 9, 'lp': (d // 9) % 5, 'pb': d // 45,
+            'dict_size': struct.unpack_from('<I', props, 1)[0],
+        }]
+    elif codec == _CODEC_LZMA2 and len(props) == 1:
+        bits = props[0]
+        dict_size = 0xFFFFFFFF if bits == 40 else (2 | (bits & 1)) << (bits // 2 + 11)
+        filters = [{'id': lzma.FILTER_LZMA2, 'dict_size': dict_size}]
+    else:
+        raise _UnsupportedArchive("unsupported header codec")
+    decompressor = lzma.LZMADecompressor(format=lzma.FORMAT_RAW, filters=filters)
+    data = decompressor.decompress(packed, max_length=size)
+    if len(data) != size:
+        raise _UnsupportedArchive("short encoded header")
+    return data
+
+def _read_7z(f) -> ArchiveStats:
+    f.seek(0)
+    start = f.read(32)
+    next_offset, next_size = struct.unpack_from('<QQ', start, 12)
+    file_size = f.seek(0, os.SEEK_END)
+    if next_size == 0:
+        return ArchiveStats(0, 0)
+    if 32 + next_offset + next_size > file_size:
+        # 分卷的第一卷：头部位于最后一卷
+        raise _UnsupportedArchive("7z header outside this file")
+    f.seek(32 + next_offset)
+    r = _Reader(f.read(next_size))
+    prop = r.byte()
+    while prop == _K_ENCODED_HEADER:
+        r = _Reader(_decode_folder(f, _read_streams_info(r)))
+        prop = r.byte()
+    if prop != _K_HEADER:
+        raise _UnsupportedArchive("missing 7z header")
+    prop = r.byte()
+    if prop == _K_ARCHIVE_PROPERTIES:
+        while r.byte() != _K_END:
+            r.bytes(r.number())
+        prop = r.byte()
+    if prop == _K_ADDITIONAL_STREAMS_INFO:
+        _read_streams_info(r)
+        prop = r.byte()
+    total = 0
+    if prop == _K_MAIN_STREAMS_INFO:
+        total = sum(_read_streams_info(r).substream_sizes)
+        prop = r.byte()
+    file_count = 0
+    if prop == _K_FILES_INFO:
+        file_count = _read_files_info(r)
+    return ArchiveStats(total, file_count)
@@ -0,0 +1,279 @@
+# bench.py
+"""
+AutoExtract 分阶段性能基准。
+
+在语料副本上依次运行 扫描 → 检测 → 安全分析 → 解压 → 清理 五个阶段，分别记录
+耗时、每秒处理项数、MB/s 与峰值内存（本进程采样的 RSS，以及子进程中最大的 RSS），
+结果以 JSON 输出，便于在不同版本之间比较：
+
+    python benchmarks/bench.py run --scale small --output before.json
+    python benchmarks/bench.py run --scale small --output after.json
+    python benchmarks/bench.py compare before.json after.json
+
+语料只生成一次（默认缓存在系统临时目录，按规模与种子区分），每轮运行前复制一份，复制不计入耗时。
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+import AutoExtract  # noqa: E402
+from archive_headers import SNIFF_SIZE  # noqa: E402
+from corpus import SCALES, JUNK_FILES, generate_corpus  # noqa: E402
+
+STAGES = ('scan', 'detect', 'analyze', 'extract', 'cleanup')
+RSS_SAMPLE_INTERVAL = 0.01     # RSS 采样间隔（秒）
+RESULT_FORMAT_VERSION = 2
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def _current_rss() -> int:
+    """当前进程的常驻内存（字节），无法获取时返回 0"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is not None:
+        # 非 Linux：退化为进程生命周期内的峰值（macOS 单位为字节，其余为 KB）
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    return 0
+
+
+def _children_peak_rss() -> int:
+    """
+    已结束子进程中最大的峰值内存（字节）。RUSAGE_CHILDREN 的 ru_maxrss 在进程生命周期内只增不减，
+    无法按阶段或按轮区分，因此只在整份报告中给出一次。
+    """
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class StageTimer:
+    """测量一个阶段：墙钟时间与采样得到的峰值 RSS"""
+
+    def __init__(self):
+        self.peak_rss = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self) -> None:
+        while True:
+            self.peak_rss = max(self.peak_rss, _current_rss())
+            if self._stop.wait(RSS_SAMPLE_INTERVAL):
+                return
+
+    def __enter__(self) -> 'StageTimer':
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.wall = time.perf_counter() - self.started
+        self._stop.set()
+        self._thread.join()
+        self.peak_rss = max(self.peak_rss, _current_rss())
+
+
+def _tree_stats(root: str) -> Dict[str, int]:
+    files = 0
+    total = 0
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, name))
+                files += 1
+            except OSError:
+                pass
+    return {'files': files, 'bytes': total}
+
+
+def _stage_record(timer: StageTimer, items: int, nbytes: int) -> Dict[str, float]:
+    wall = timer.wall
+    return {
+        'wall_s': round(wall, 4),
+        'items': items,
+        'items_per_s': round(items / wall, 2) if wall > 0 else None,
+        'bytes': nbytes,
+        'mb_per_s': round(nbytes / (1024**2) / wall, 2) if wall > 0 else None,
+        'peak_rss_mb': round(timer.peak_rss / (1024**2), 2),
+    }
+
+
+def run_once(corpus_dir: str, work_root: str, config: 'AutoExtract.Config', i18n: 'AutoExtract.I18N',
+             sevenzip: Optional[str]) -> Dict:
+    """在语料副本上完整运行一次全部阶段，返回各阶段的指标；每轮使用全新的引擎（空缓存、初始吞吐量估计）"""
+    work_dir = os.path.join(work_root, 'work')
+    shutil.rmtree(work_dir, ignore_errors=True)
+    shutil.copytree(corpus_dir, work_dir)
+    cache_dir = os.path.join(work_root, 'cache')
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    extractor = AutoExtract.Extractor(config, i18n=i18n, sevenzip=sevenzip,
+                                      delete_rules=JUNK_FILES, cache_dir=cache_dir)
+    session = extractor.session(work_dir)
+    input_stats = _tree_stats(work_dir)
+    stages = {}
+
+    with StageTimer() as timer:
+        index = AutoExtract.DirectoryIndex(work_dir, session)
+    stages['scan'] = _stage_record(timer, len(index.entries), 0)
+
+    candidates = [entry for entry in index.pending_entries() if not entry.is_archive_candidate]
+    with StageTimer() as timer:
+        AutoExtract.detect_and_rename_archives(session, index)
+    stages['detect'] = _stage_record(timer, len(candidates), len(candidates) * SNIFF_SIZE)
+
+    archives = [entry.path for entry in index.archive_entries()]
+    archive_bytes = sum(os.path.getsize(path) for path in archives)
+    with StageTimer() as timer:
+        for path in archives:
+            AutoExtract.analyze_archive_safety(session, path, config.max_unpacked_gb, config.max_files)
+    stages['analyze'] = _stage_record(timer, len(archives), archive_bytes)
+
+    with StageTimer() as timer:
+        AutoExtract.process_directory(session, index, interval=0)
+    output_stats = _tree_stats(work_dir)
+    result = session.result()
+    stages['extract'] = _stage_record(timer, len(result.extracted), output_stats['bytes'])
+    stages['extract']['failed'] = len(result.failed)
+    stages['extract']['output_files'] = output_stats['files']
+
+    with StageTimer() as timer:
+        session.cleanup(remove_files=True, remove_empty_dirs=True)
+    after_cleanup = _tree_stats(work_dir)
+    stages['cleanup'] = _stage_record(timer, output_stats['files'], 0)
+    stages['cleanup']['removed_files'] = output_stats['files'] - after_cleanup['files']
+
+    shutil.rmtree(work_dir, ignore_errors=True)
+    return {'input': input_stats, 'stages': stages}
+
+
+def _median(values: List[float]) -> Optional[float]:
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return None
+    mid = len(values) // 2
+    return values[mid] if len(values) % 2 else round((values[mid - 1] + values[mid]) / 2, 4)
+
+
+def _summarize(runs: List[Dict]) -> Dict:
+    """各阶段各指标取多轮的中位数"""
+    summary = {}
+    for stage in STAGES:
+        records = [run['stages'][stage] for run in runs]
+        summary[stage] = {key: _median([r.get(key) for r in records])
+                          for key in records[0] if isinstance(records[0][key], (int, float))}
+    return summary
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=os.path.dirname(BENCH_DIR),
+                             capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def command_run(args: argparse.Namespace) -> None:
+    logging.getLogger().setLevel(logging.ERROR)
+    AutoExtract.logger.setLevel(logging.ERROR)
+    i18n = AutoExtract.I18N('en')
+    sevenzip = AutoExtract.locate_7zip()
+    config = AutoExtract.Config(
+        delete_target_files=True, delete_empty_folders=True, auto_yes=True, language='en',
+        max_unpacked_gb=args.max_unpacked_gb,
+        jobs=args.jobs, recursive=True, use_cache=not args.no_cache,
+        backend=args.backend, batch_size=args.batch, journal=False,
+    )
+    corpus_dir = args.corpus or os.path.join(tempfile.gettempdir(), f'autoextract-corpus-{args.scale}-{args.seed}')
+    corpus_counts = None
+    if not os.path.isdir(corpus_dir):
+        corpus_counts = generate_corpus(corpus_dir, SCALES[args.scale], args.seed)
+    work_root = tempfile.mkdtemp(prefix='autoextract-bench-', dir=args.work_dir)
+    try:
+        runs = [run_once(corpus_dir, work_root, config, i18n, sevenzip) for _ in range(args.repeat)]
+    finally:
+        shutil.rmtree(work_root, ignore_errors=True)
+    report = {
+        'format': RESULT_FORMAT_VERSION,
+        'revision': _git_revision(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'sevenzip': sevenzip,
+        'corpus': {'dir': corpus_dir, 'scale': args.scale, 'seed': args.seed, 'generated': corpus_counts},
+        'config': {'jobs': args.jobs, 'backend': args.backend, 'batch': args.batch,
+                   'cache': not args.no_cache, 'max_unpacked_gb': args.max_unpacked_gb},
+        'runs': runs,
+        'summary': _summarize(runs),
+        # 本进程全部轮次中子进程（7z）的最大峰值内存，累计值，不对应任何单个阶段
+        'children_peak_rss_mb': round(_children_peak_rss() / (1024**2), 2),
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    print(text)
+
+
+def command_compare(args: argparse.Namespace) -> None:
+    """比较两份结果的中位数，输出各阶段耗时与吞吐量的变化（JSON）"""
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)['summary']
+    with open(args.candidate, encoding='utf-8') as f:
+        candidate = json.load(f)['summary']
+    diff = {}
+    for stage in STAGES:
+        diff[stage] = {}
+        for key in ('wall_s', 'items_per_s', 'mb_per_s', 'peak_rss_mb'):
+            old, new = baseline.get(stage, {}).get(key), candidate.get(stage, {}).get(key)
+            change = round((new - old) / old * 100, 1) if old and new is not None else None
+            diff[stage][key] = {'baseline': old, 'candidate': new, 'change_pct': change}
+    print(json.dumps(diff, ensure_ascii=False, indent=2))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AutoExtract 分阶段性能基准")
+    sub = parser.add_subparsers(dest='command', required=True)
+    run = sub.add_parser('run', help="生成（或复用）语料并运行基准")
+    run.add_argument('--scale', choices=sorted(SCALES), default='small', help="语料规模，默认 small")
+    run.add_argument('--seed', type=int, default=0, help="语料随机种子，默认 0")
+    run.add_argument('--corpus', help="已有语料目录（不修改，每轮复制一份）")
+    run.add_argument('--work-dir', help="运行时副本所在目录，默认系统临时目录")
+    run.add_argument('--repeat', type=int, default=3, help="运行轮数，汇总取中位数，默认 3")
+    run.add_argument('--jobs', type=int, default=1, help="并行解压任务数，默认 1")
+    run.add_argument('--backend', choices=['auto', 'python', '7z'], default='auto', help="解压后端，默认 auto")
+    run.add_argument('--batch', type=int, default=0, help="批量解压的小压缩包数，默认 0（不批量）")
+    run.add_argument('--no-cache', action='store_true', help="不使用安全分析缓存")
+    run.add_argument('--max-unpacked-gb', type=int, default=50, help="最大允许解压大小（GB），默认 50")
+    run.add_argument('--output', help="同时把结果写入该 JSON 文件")
+    run.set_defaults(func=command_run)
+    compare = sub.add_parser('compare', help="比较两份基准结果")
+    compare.add_argument('baseline', help="基线结果 JSON")
+    compare.add_argument('candidate', help="待比较结果 JSON")
+    compare.set_defaults(func=command_compare)
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
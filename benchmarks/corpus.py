@@ -0,0 +1,182 @@
+# corpus.py
+"""
+生成用于性能基准的合成压缩包语料（仅使用标准库，给定种子时结果可复现）。
+
+语料包含：大量小 zip、少量大 zip、多层嵌套压缩包、VOLUME_PATTERNS 中每种命名方案的分卷组
+（含一个缺卷的不完整组）、以 SAFE_EXTENSIONS 扩展名伪装的压缩包、高压缩比的“炸弹式”文件，
+以及与清理阶段对应的垃圾文件。分卷组按字节切分生成，用于衡量扫描、分组与完整性检查；
+只有 .001 方案能被 7-Zip 真正合并解压，其余方案在没有 rar/分段 zip 工具时预期解压失败。
+
+用法：python benchmarks/corpus.py 输出目录 [--scale small|medium|large] [--seed N]
+"""
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import tarfile
+import zipfile
+from dataclasses import dataclass, asdict
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from AutoExtract import SAFE_EXTENSIONS  # noqa: E402
+
+# 清理阶段要删除的垃圾文件名（与基准中使用的删除列表一致）
+JUNK_FILES = ['Thumbs.db', '.DS_Store', 'desktop.ini', '广告.url']
+
+
+@dataclass
+class CorpusSpec:
+    tiny_zips: int          # 小 zip 数量
+    huge_zips: int          # 大 zip 数量
+    huge_mb: int            # 每个大 zip 的大小（MB，内容不可压缩）
+    nested: int             # 嵌套压缩包数量
+    nested_depth: int       # 嵌套层数
+    volume_mb: int          # 每个分卷组的总大小（MB）
+    disguised: int          # 伪装扩展名的压缩包数量
+    bombs: int              # 高压缩比文件数量
+    bomb_mb: int            # 每个高压缩比文件解压后的大小（MB）
+
+
+SCALES: Dict[str, CorpusSpec] = {
+    'small': CorpusSpec(tiny_zips=200, huge_zips=1, huge_mb=16, nested=5, nested_depth=3,
+                        volume_mb=4, disguised=20, bombs=2, bomb_mb=64),
+    'medium': CorpusSpec(tiny_zips=2000, huge_zips=2, huge_mb=128, nested=20, nested_depth=4,
+                         volume_mb=32, disguised=100, bombs=4, bomb_mb=512),
+    'large': CorpusSpec(tiny_zips=10000, huge_zips=4, huge_mb=1024, nested=50, nested_depth=5,
+                        volume_mb=256, disguised=500, bombs=8, bomb_mb=2048),
+}
+
+
+def _zip_bytes(files: Dict[str, bytes], compression: int = zipfile.ZIP_DEFLATED) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression) as zf:
+        for name, data in files.items():
+            zf.writestr(name, data)
+    return buffer.getvalue()
+
+
+def _tar_gz_bytes(files: Dict[str, bytes]) -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode='w:gz') as tf:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+def _write(path: str, data: bytes) -> int:
+    with open(path, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+
+def _small_files(rng: random.Random, prefix: str) -> Dict[str, bytes]:
+    files = {}
+    for i in range(rng.randint(1, 3)):
+        text = ' '.join(rng.choice(('alpha', 'beta', 'gamma', 'delta')) for _ in range(rng.randint(10, 200)))
+        files[f'{prefix}/file{i}.txt'] = text.encode()
+    if rng.random() < 0.3:
+        files[f'{prefix}/{rng.choice(JUNK_FILES)}'] = b'junk'
+    return files
+
+
+def _write_huge_zip(path: str, rng: random.Random, size_mb: int) -> int:
+    """不可压缩内容的大 zip，分块写入以限制内存占用"""
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED) as zf:
+        with zf.open('huge/payload.bin', 'w', force_zip64=True) as f:
+            chunk = 1024 * 1024
+            for _ in range(size_mb):
+                f.write(rng.randbytes(chunk))
+    return os.path.getsize(path)
+
+
+def _write_bomb(path: str, size_mb: int) -> int:
+    """全零内容的高压缩比 zip（解压后 size_mb MB）"""
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED, compresslevel=9) as zf:
+        with zf.open('zeros.bin', 'w', force_zip64=True) as f:
+            zeros = bytes(1024 * 1024)
+            for _ in range(size_mb):
+                f.write(zeros)
+    return os.path.getsize(path)
+
+
+def _split(data: bytes, parts: int) -> List[bytes]:
+    size = -(-len(data) // parts)
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def generate_corpus(root: str, spec: CorpusSpec, seed: int = 0) -> Dict[str, int]:
+    """在 root 下生成语料，返回各类别的文件数与总字节数"""
+    rng = random.Random(seed)
+    os.makedirs(root, exist_ok=True)
+    counts: Dict[str, int] = {}
+    total = 0
+
+    def _count(category: str, size: int) -> None:
+        nonlocal total
+        counts[category] = counts.get(category, 0) + 1
+        total += size
+
+    for i in range(spec.tiny_zips):
+        _count('tiny', _write(os.path.join(root, f'tiny_{i:05d}.zip'), _zip_bytes(_small_files(rng, f'tiny_{i:05d}'))))
+
+    for i in range(spec.huge_zips):
+        _count('huge', _write_huge_zip(os.path.join(root, f'huge_{i}.zip'), rng, spec.huge_mb))
+
+    for i in range(spec.nested):
+        data = _tar_gz_bytes(_small_files(rng, f'nested_{i}/leaf'))
+        name = 'leaf.tar.gz'
+        for depth in range(spec.nested_depth - 1):
+            data = _zip_bytes({f'nested_{i}/level{depth}/{name}': data}, zipfile.ZIP_STORED)
+            name = f'level{depth}.zip'
+        _count('nested', _write(os.path.join(root, f'nested_{i}.zip'), data))
+
+    # 每种分卷命名方案一组（对应 VOLUME_PATTERNS 的顺序），另加一个缺少中间卷的组
+    payload = _zip_bytes({'volume/payload.bin': rng.randbytes(spec.volume_mb * 1024 * 1024)}, zipfile.ZIP_STORED)
+    parts = _split(payload, 4)
+    schemes = {
+        'part': [f'vset.part{n}.rar' for n in range(1, len(parts) + 1)],
+        'zip_split': [f'vzip.z{n:02d}' for n in range(1, len(parts))] + ['vzip.zip'],
+        'numbered': [f'vnum.zip.{n:03d}' for n in range(1, len(parts) + 1)],
+    }
+    for names in schemes.values():
+        for name, part in zip(names, parts):
+            _count('volume', _write(os.path.join(root, name), part))
+    for n, part in enumerate(parts, 1):
+        if n != 2:
+            _count('volume_incomplete', _write(os.path.join(root, f'vgap.zip.{n:03d}'), part))
+
+    disguises = sorted(SAFE_EXTENSIONS)
+    for i in range(spec.disguised):
+        files = _small_files(rng, f'disguised_{i}')
+        data = _zip_bytes(files) if i % 2 == 0 else _tar_gz_bytes(files)
+        _count('disguised', _write(os.path.join(root, f'disguised_{i:04d}{disguises[i % len(disguises)]}'), data))
+
+    for i in range(spec.bombs):
+        _count('bomb', _write_bomb(os.path.join(root, f'bomb_{i}.zip'), spec.bomb_mb))
+
+    for name in JUNK_FILES:
+        _count('junk', _write(os.path.join(root, name), b'junk'))
+
+    counts['total_bytes'] = total
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="生成性能基准用的合成压缩包语料")
+    parser.add_argument('output', help="输出目录")
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small', help="语料规模，默认 small")
+    parser.add_argument('--seed', type=int, default=0, help="随机种子，默认 0")
+    args = parser.parse_args()
+    counts = generate_corpus(args.output, SCALES[args.scale], args.seed)
+    json.dump({'scale': args.scale, 'seed': args.seed, 'spec': asdict(SCALES[args.scale]), 'counts': counts},
+              sys.stdout, ensure_ascii=False, indent=2)
+    print()
+
+
+if __name__ == '__main__':
+    main()
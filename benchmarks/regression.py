@@ -0,0 +1,254 @@
+# regression.py
+"""
+AutoExtract 回归检查：为评审中发现过的问题各构造一个最小场景，逐项运行并报告结果。
+
+    python benchmarks/regression.py              # 运行全部检查
+    python benchmarks/regression.py batch_crash  # 只运行指定的检查
+    python benchmarks/regression.py --list
+
+每项检查在独立的临时目录中运行，不读写用户缓存；任何一项失败时以状态码 1 退出。
+需要特定 7-Zip 行为的检查使用脚本生成的模拟 7z（仅 POSIX 系统），不依赖系统安装的 7-Zip。
+"""
+import argparse
+import gzip
+import io
+import logging
+import os
+import sys
+import tempfile
+import time
+import traceback
+import tarfile
+import zipfile
+from typing import Callable, Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+import AutoExtract  # noqa: E402
+from archive_headers import read_archive_stats  # noqa: E402
+
+CHECKS: Dict[str, Callable[[str], None]] = {}
+
+# 模拟 7z：单个解压（x 压缩包 -o目录）正常解出全部成员；批量解压（x -an -ai@列表 -o目录/*）依次处理列表，
+# 遇到名称以 crash 开头的压缩包时只写出第一个成员就以 SIGKILL 结束自身，模拟 7z 崩溃或被终止
+FAKE_7Z = '''#!{python}
+import os, signal, sys, zipfile
+args = sys.argv[1:]
+out = next(a[2:] for a in args if a.startswith('-o'))
+if args[0] != 'x':
+    sys.exit(7)
+if '-an' in args:
+    targets = open(next(a[4:] for a in args if a.startswith('-ai@')), encoding='utf-8').read().split()
+else:
+    targets = [a for a in args[1:] if not a.startswith('-')]
+for path in targets:
+    dest = out.replace('*', os.path.splitext(os.path.basename(path))[0])
+    os.makedirs(dest, exist_ok=True)
+    if '-an' in args:
+        print('Extracting archive: ' + path, flush=True)
+    with zipfile.ZipFile(path) as z:
+        for i, name in enumerate(z.namelist()):
+            z.extract(name, dest)
+            print('- ' + name, flush=True)
+            if '-an' in args and os.path.basename(path).startswith('crash'):
+                os.kill(os.getpid(), signal.SIGKILL)
+print('Everything is Ok')
+'''
+
+
+def check(func: Callable[[str], None]) -> Callable[[str], None]:
+    """注册一项检查：检查函数接收一个空的临时目录，结果不符合预期时抛出 AssertionError"""
+    CHECKS[func.__name__] = func
+    return func
+
+
+def _make_zip(path: str, members: Dict[str, bytes]) -> None:
+    with zipfile.ZipFile(path, 'w') as z:
+        for name, data in members.items():
+            z.writestr(name, data)
+
+
+def _write_fake_7z(directory: str) -> str:
+    path = os.path.join(directory, 'fake-7z')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(FAKE_7Z.format(python=sys.executable))
+    os.chmod(path, 0o755)
+    return path
+
+
+def _extractor(config: 'AutoExtract.Config', **kwargs) -> 'AutoExtract.Extractor':
+    config.use_cache = False
+    return AutoExtract.Extractor(config, i18n=AutoExtract.I18N('en'), **kwargs)
+
+
+@check
+def batch_crash(work: str) -> None:
+    """[user-015] 批量解压中 7z 异常退出时，正在处理的压缩包不得按成功提交（否则残缺结果会替换源文件）"""
+    if os.name != 'posix':
+        raise NotImplementedError("needs a POSIX shell script as fake 7z")
+    sevenzip = _write_fake_7z(work)
+    root = os.path.join(work, 'root')
+    os.mkdir(root)
+    expected = {}
+    for stem in ('a', 'crash', 'z'):
+        members = {f'{stem}-{n}.txt': f'{stem} {n}\n'.encode() for n in range(3)}
+        _make_zip(os.path.join(root, f'{stem}.zip'), members)
+        expected.update(members)
+    config = AutoExtract.Config(backend='7z', batch_size=8)
+    result = _extractor(config, sevenzip=sevenzip).run(root)
+    statuses = {os.path.basename(o.path): o.status for o in result.archives}
+    assert statuses == {'a.zip': 'success', 'crash.zip': 'success', 'z.zip': 'success'}, statuses
+    for name, data in expected.items():
+        path = os.path.join(root, name)
+        assert os.path.isfile(path), f"missing {name}"
+        with open(path, 'rb') as f:
+            assert f.read() == data, f"wrong content in {name}"
+    leftovers = sorted(n for n in os.listdir(root) if n not in expected)
+    assert not leftovers, f"unexpected entries: {leftovers}"
+
+
+@check
+def separate_folder_mode(work: str) -> None:
+    """[user-012] 按单独文件夹解压时，输出文件夹的权限按 umask 创建，而不是暂存目录的 0700"""
+    if os.name != 'posix':
+        raise NotImplementedError("POSIX permissions only")
+    root = os.path.join(work, 'root')
+    os.mkdir(root)
+    _make_zip(os.path.join(root, 'album.zip'), {'01.txt': b'x', 'cd2/02.txt': b'y'})
+    previous = os.umask(0o022)
+    try:
+        _extractor(AutoExtract.Config(separate_folders=True, backend='python')).run(root)
+    finally:
+        os.umask(previous)
+    mode = os.stat(os.path.join(root, 'album')).st_mode & 0o777
+    assert mode == 0o755, oct(mode)
+
+
+@check
+def native_listing_partial(work: str) -> None:
+    """[user-005] 原生头部解析遇到分卷 tar 的第一卷或多成员 gzip 时交给 7z，而不是给出偏小的统计"""
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode='w') as tf:
+        for n in range(4):
+            info = tarfile.TarInfo(f'file{n}')
+            info.size = 3000
+            tf.addfile(info, io.BytesIO(bytes(info.size)))
+    data = buf.getvalue()
+    whole = os.path.join(work, 'whole.tar')
+    with open(whole, 'wb') as f:
+        f.write(data)
+    stats = read_archive_stats(whole)
+    assert stats is not None and (stats.unpacked_bytes, stats.file_count) == (12000, 4), stats
+    # 在成员边界与成员数据中间切开，模拟 x.tar.001
+    for cut in (3584, 5000):
+        first = os.path.join(work, f'split{cut}.tar.001')
+        with open(first, 'wb') as f:
+            f.write(data[:cut])
+        assert read_archive_stats(first) is None, f"truncated tar at {cut} was accepted"
+    multi = os.path.join(work, 'multi.gz')
+    with open(multi, 'wb') as f:
+        f.write(gzip.compress(bytes(100_000)) + gzip.compress(b'tail'))
+    assert read_archive_stats(multi) is None, "multi-member gzip was accepted"
+
+
+@check
+def volume_name_lookalikes(work: str) -> None:
+    """[user-011] 只是名字像分卷的普通文件不构成分卷组，不会被报告为不完整的分卷组"""
+    root = os.path.join(work, 'root')
+    os.mkdir(root)
+    plain = {'notes.001': b'first\n', 'notes.002': b'second\n', 'report_part1.pdf': b'%PDF-1.4\n',
+             'report_part3.pdf': b'%PDF-1.4\n', 'volume2.txt': b'text\n'}
+    for name, data in plain.items():
+        with open(os.path.join(root, name), 'wb') as f:
+            f.write(data)
+    # 真正的分卷组缺卷时仍应报告：第一卷是压缩包，或第一卷缺失但文件名带压缩扩展名
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w') as zf:
+        zf.writestr('payload.bin', bytes(4096))
+    data = buf.getvalue()
+    for name, part in (('real.zip.001', data[:1000]), ('real.zip.003', data[2000:]), ('gap.7z.002', data[1000:2000])):
+        with open(os.path.join(root, name), 'wb') as f:
+            f.write(part)
+    result = _extractor(AutoExtract.Config(backend='python')).run(root)
+    statuses = {os.path.basename(o.path): o.status for o in result.archives}
+    assert statuses == {'real.zip.001': 'incomplete', 'gap.7z.002': 'incomplete'}, statuses
+    missing = [name for name in plain if not os.path.isfile(os.path.join(root, name))]
+    assert not missing, missing
+
+
+def _nested_zip(path: str, depth: int) -> None:
+    """生成 depth 层嵌套的 zip：最外层 n0.zip 中是 n1.zip，依此类推，最内层是 leaf.txt"""
+    data = None
+    for level in reversed(range(depth)):
+        inner_path = f"{path}.{level}"
+        _make_zip(inner_path, {f'n{level + 1}.zip': data} if data is not None else {'leaf.txt': b'leaf\n'})
+        with open(inner_path, 'rb') as f:
+            data = f.read()
+        os.remove(inner_path)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+@check
+def tree_quota_scope(work: str) -> None:
+    """[user-004] 树配额不计根目录自身的压缩包、每轮重新计数，但仍限制同一子树中层层嵌套的压缩包"""
+    root = os.path.join(work, 'root')
+    sub = os.path.join(root, 'sub')
+    os.makedirs(sub)
+    session = _extractor(AutoExtract.Config(recursive=True, tree_quota=2, backend='python')).session(root)
+    index = AutoExtract.DirectoryIndex(root, session)
+    # 模拟监视模式下的三批：每批向根目录和子目录各放入两个压缩包，配额为 2 时都应全部解压
+    for batch in range(3):
+        for n in range(2):
+            _make_zip(os.path.join(root, f'top{batch}{n}.zip'), {f'top{batch}{n}.txt': b'x'})
+            _make_zip(os.path.join(sub, f'sub{batch}{n}.zip'), {f'sub{batch}{n}.txt': b'x'})
+        index.scan()
+        session.finished_dirs.clear()
+        AutoExtract.process_directory(session, index, interval=0)
+    statuses = {os.path.basename(o.path): o.status for o in session.outcomes}
+    assert len(statuses) == 12 and set(statuses.values()) == {'success'}, statuses
+    # 同一子树中的嵌套链：配额用完后其余层不再展开
+    nested = os.path.join(work, 'nested')
+    os.makedirs(os.path.join(nested, 'sub'))
+    _nested_zip(os.path.join(nested, 'sub', 'n0.zip'), 5)
+    result = _extractor(AutoExtract.Config(recursive=True, tree_quota=2, backend='python')).run(nested)
+    statuses = {os.path.basename(o.path): o.status for o in result.archives}
+    assert statuses == {'n0.zip': 'success', 'n1.zip': 'success', 'n2.zip': 'quota'}, statuses
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AutoExtract 回归检查")
+    parser.add_argument('checks', nargs='*', help="要运行的检查名，默认全部")
+    parser.add_argument('--list', action='store_true', help="列出全部检查后退出")
+    parser.add_argument('-v', '--verbose', action='store_true', help="显示 AutoExtract 的日志输出")
+    args = parser.parse_args()
+    if args.list:
+        for name, func in CHECKS.items():
+            print(f"{name:24} {func.__doc__.strip()}")
+        return
+    unknown = [name for name in args.checks if name not in CHECKS]
+    if unknown:
+        parser.error(f"unknown checks: {', '.join(unknown)}")
+    if not args.verbose:
+        logging.disable(logging.CRITICAL)
+    failed: List[str] = []
+    for name in args.checks or list(CHECKS):
+        started = time.perf_counter()
+        with tempfile.TemporaryDirectory(prefix='autoextract-regression-') as work:
+            try:
+                CHECKS[name](work)
+            except NotImplementedError as e:
+                status = f"SKIP ({e})"
+            except Exception:
+                failed.append(name)
+                status = "FAIL"
+                traceback.print_exc()
+            else:
+                status = "ok"
+        print(f"{name:24} {status} ({time.perf_counter() - started:.2f}s)")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
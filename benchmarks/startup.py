@@ -0,0 +1,136 @@
+# startup.py
+"""
+AutoExtract 启动耗时基准。
+
+在空的临时目录中多次启动全新的解释器，测量“没有任何压缩包可处理”的一次运行（-n --no-cache）
+以及 --version 的墙钟耗时，并以 `python -c pass` 作为解释器本身的基线，结果以 JSON 输出：
+
+    python benchmarks/startup.py --repeat 20
+    python benchmarks/startup.py --importtime 15     # 同时列出累计导入耗时最多的模块
+
+测量前会先编译字节码（设置了 PYTHONDONTWRITEBYTECODE 时每次启动都要重新编译，结果会失真）。
+以脚本形式（python AutoExtract.py）运行时主模块总是从源码编译，python -m AutoExtract 则使用缓存的字节码。
+"""
+import argparse
+import compileall
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+SCRIPT = os.path.join(REPO_DIR, 'AutoExtract.py')
+RESULT_FORMAT_VERSION = 1
+
+
+def _commands() -> Dict[str, List[str]]:
+    return {
+        'interpreter': [sys.executable, '-c', 'pass'],
+        'module_noop': [sys.executable, '-m', 'AutoExtract', '-n', '--no-cache'],
+        'script_noop': [sys.executable, SCRIPT, '-n', '--no-cache'],
+        'version': [sys.executable, '-m', 'AutoExtract', '--version'],
+    }
+
+
+def _environment() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [REPO_DIR, env.get('PYTHONPATH')]))
+    return env
+
+
+def _time_command(command: List[str], cwd: str, env: Dict[str, str]) -> float:
+    """启动一次命令并返回耗时（毫秒）"""
+    started = time.perf_counter()
+    subprocess.run(command, cwd=cwd, env=env, stdin=subprocess.DEVNULL,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+    return (time.perf_counter() - started) * 1000
+
+
+def _median(values: List[float]) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    mid = len(ordered) // 2
+    return ordered[mid] if len(ordered) % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+
+
+def _import_breakdown(cwd: str, env: Dict[str, str], top: int) -> List[Dict]:
+    """用 -X importtime 运行一次，返回累计耗时最多的顶层导入"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-m', 'AutoExtract', '-n', '--no-cache'],
+                            cwd=cwd, env=env, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, text=True, check=False)
+    entries = []
+    for line in result.stderr.splitlines():
+        # 格式：import time: 自身(us) | 累计(us) | 模块名（缩进表示被其他模块间接导入）
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        if name.startswith('  '):
+            continue
+        entries.append({'module': name.strip(),
+                        'self_ms': int(fields[0]) / 1000,
+                        'cumulative_ms': int(fields[1]) / 1000})
+    entries.sort(key=lambda e: e['cumulative_ms'], reverse=True)
+    return entries[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="测量 AutoExtract 的启动耗时")
+    parser.add_argument('--repeat', type=int, default=10, help="每条命令的启动次数，默认 10")
+    parser.add_argument('--importtime', type=int, metavar='N', default=0,
+                        help="同时列出累计导入耗时最多的 N 个顶层模块，默认 0（不列出）")
+    parser.add_argument('--budget-ms', type=float, help="module_noop 的中位数超过该值（毫秒）时以状态码 1 退出")
+    parser.add_argument('--output', help="同时把结果写入该 JSON 文件")
+    args = parser.parse_args()
+
+    compileall.compile_dir(REPO_DIR, quiet=1, maxlevels=1)
+    env = _environment()
+    commands = _commands()
+    samples: Dict[str, List[float]] = {name: [] for name in commands}
+    with tempfile.TemporaryDirectory(prefix='autoextract-startup-') as cwd:
+        for name, command in commands.items():
+            _time_command(command, cwd, env)  # 预热：填充页缓存与字节码缓存
+        # 交替运行各命令，避免系统负载的波动集中影响某一条
+        for _ in range(args.repeat):
+            for name, command in commands.items():
+                samples[name].append(_time_command(command, cwd, env))
+        breakdown = _import_breakdown(cwd, env, args.importtime) if args.importtime else None
+
+    baseline = _median(samples['interpreter'])
+    results = {}
+    for name, values in samples.items():
+        median = _median(values)
+        results[name] = {
+            'min_ms': min(values),
+            'median_ms': median,
+            'max_ms': max(values),
+            'over_interpreter_ms': median - baseline,
+        }
+    report = {
+        'format_version': RESULT_FORMAT_VERSION,
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'repeat': args.repeat,
+        'results': results,
+    }
+    if breakdown is not None:
+        report['imports'] = breakdown
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    if args.budget_ms is not None and results['module_noop']['median_ms'] > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,14 +6,16 @@ copy "7z\7z.exe" .
 copy "7z\7z.dll" .
 
 REM 使用 Nuitka 打包
+REM 语言包由 i18n.py 按需动态导入，Nuitka 无法自动发现，需要显式包含 locales 包
 call nuitka --standalone --onefile ^
        --include-data-file=7z.exe=7z.exe ^
        --include-data-file=7z.dll=7z.dll ^
-       unzip.py
+       --include-package=locales ^
+       AutoExtract.py
 
 REM 清理工作区
 del 7z.exe
 del 7z.dll
-rmdir /S /Q Unzip.build
-rmdir /S /Q Unzip.dist
-rmdir /S /Q Unzip.onefile-build
\ No newline at end of file
+rmdir /S /Q AutoExtract.build
+rmdir /S /Q AutoExtract.dist
+rmdir /S /Q AutoExtract.onefile-build
\ No newline at end of file
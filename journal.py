@@ -0,0 +1,209 @@
+# journal.py
+"""
+断点续处理日志：以 JSON Lines 追加记录每个文件的状态转换，进程崩溃、断电或被中断后，
+下一次运行据此把半途的解压恢复到一致状态，并跳过已经完成的检测与分析。
+
+每条记录占一行：{"path": 相对于根目录的路径, "state": 状态, ...附加字段}，按写入顺序重放；
+崩溃时写了一半的末行在重放时忽略。普通记录只写入操作系统缓冲（进程崩溃不会丢失，断电可能丢失），
+sync() 才会 fsync 落盘，因此调用方只需在不可逆的操作（提交解压结果）之前同步一次。
+
+日志文件在打开期间持有排他锁，同一目录上的第二个进程无法使用它，也就不会误判对方的进行中状态。
+"""
+import json
+import os
+import threading
+from typing import Dict, Iterator, List, Optional
+
+__all__ = ['ProcessingJournal', 'DETECTED', 'ANALYZED', 'EXTRACTING', 'COMMITTING', 'COMMITTED', 'DELETED', 'FAILED']
+
+# 状态转换：detected → analyzed → extracting → committing → committed → deleted，任一步都可能转为 failed
+DETECTED = 'detected'        # 已读取文件头（附 key 与识别结果）
+ANALYZED = 'analyzed'        # 已读取压缩包列表（附 key 与列表结果）
+EXTRACTING = 'extracting'    # 正在解压到暂存目录
+COMMITTING = 'committing'    # 暂存目录已完整，即将提交（此记录落盘后才开始提交）
+COMMITTED = 'committed'      # 解压结果已提交到目标目录，源文件尚未删除
+DELETED = 'deleted'          # 源文件已删除，处理完成
+FAILED = 'failed'            # 处理失败（附原因）
+
+
+def _lock_file(fd: int) -> None:
+    """对日志文件加非阻塞排他锁，已被其他进程占用时抛出 OSError"""
+    try:
+        import fcntl
+    except ImportError:
+        import msvcrt
+        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    else:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+def _sync_directory(path: str) -> None:
+    """fsync 目录本身，保证新建的日志文件名落盘（Windows 不支持打开目录，直接跳过）"""
+    if os.name == 'nt':
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class ProcessingJournal:
+    """
+    单个根目录的追加式状态日志；record() 可在多个解压线程中并发调用。
+
+    写入失败（例如磁盘已满）时日志自动停用并把异常保存在 error 中，不影响正在进行的处理。
+    """
+
+    def __init__(self, path: str, root: str):
+        self.path = path
+        self.root = os.path.abspath(root)
+        self.error: Optional[OSError] = None
+        self.records: List[dict] = []
+        self._lock = threading.Lock()
+        self._fd: Optional[int] = None
+        self._opened = False
+        self._owner = False     # 是否由本进程成功打开并锁定（只有所有者才能删除日志文件）
+        self._written = False   # 上次清空以来是否写入过记录
+        # 没有遗留日志时推迟到第一条记录才创建文件，无事可做的运行不会在目录中留下任何痕迹
+        if os.path.exists(path):
+            self._open()
+
+    def _open(self) -> None:
+        """打开（必要时创建）日志文件并加锁，随后重放已有记录；失败时抛出 OSError"""
+        self._opened = True
+        created = not os.path.exists(self.path)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_APPEND | getattr(os, 'O_BINARY', 0), 0o644)
+        try:
+            _lock_file(fd)
+            self._load(fd)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+        self._owner = True
+        if created:
+            _sync_directory(os.path.dirname(os.path.abspath(self.path)))
+
+    def _load(self, fd: int) -> None:
+        with open(fd, 'rb', closefd=False) as f:
+            data = f.read()
+        for line in data.splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and 'path' in record and 'state' in record:
+                self.records.append(record)
+        if data and not data.endswith(b'\n'):
+            # 上次在写某一行时崩溃：补上换行，避免下一条记录与残行粘连
+            os.write(fd, b'\n')
+
+    def _writable(self) -> bool:
+        """调用方需持有 _lock；首次写入时才创建日志文件"""
+        if not self._opened:
+            try:
+                self._open()
+            except OSError as e:
+                self.error = e
+        return self._fd is not None
+
+    # ---------------- 路径 ----------------
+
+    def rel(self, path: str) -> str:
+        """把路径转换为相对根目录的形式（整个目录被移动后日志依然有效）"""
+        return os.path.relpath(os.path.abspath(path), self.root)
+
+    def resolve(self, rel_path: str) -> str:
+        return os.path.join(self.root, rel_path)
+
+    # ---------------- 读写 ----------------
+
+    def replay(self) -> Iterator[dict]:
+        """按写入顺序返回上次运行留下的记录"""
+        return iter(self.records)
+
+    def last_states(self) -> Dict[str, dict]:
+        """
+        每个路径当前的解压状态（键为相对路径）。同一轮处理（以 extracting 开始）的记录按顺序合并，
+        后写入的字段覆盖先写入的；detected/analyzed 不改变解压状态，不参与合并。
+        """
+        states: Dict[str, dict] = {}
+        for record in self.records:
+            state = record['state']
+            if state in (DETECTED, ANALYZED):
+                continue
+            current = states.get(record['path'])
+            if state == EXTRACTING or current is None:
+                states[record['path']] = dict(record)
+            else:
+                current.update(record)
+        return states
+
+    def record(self, path: str, state: str, **fields) -> None:
+        """追加一条状态转换；path 为实际路径，附加字段原样写入"""
+        line = json.dumps({'path': self.rel(path), 'state': state, **fields},
+                          ensure_ascii=False, separators=(',', ':')) + '\n'
+        with self._lock:
+            if not self._writable():
+                return
+            try:
+                os.write(self._fd, line.encode('utf-8'))
+            except OSError as e:
+                self._disable(e)
+            else:
+                self._written = True
+
+    def sync(self) -> None:
+        """把已写入的记录 fsync 到磁盘"""
+        with self._lock:
+            if self._fd is None:
+                return
+            try:
+                os.fsync(self._fd)
+            except OSError as e:
+                self._disable(e)
+
+    def reset(self) -> None:
+        """清空日志（调用方应保证此时没有进行中的解压，且检测与分析结果已另行保存）"""
+        with self._lock:
+            self.records = []
+            self._written = False
+            if self._fd is None:
+                return
+            try:
+                os.ftruncate(self._fd, 0)
+                os.fsync(self._fd)
+            except OSError as e:
+                self._disable(e)
+
+    @property
+    def pending(self) -> bool:
+        """日志中是否有下次运行仍需重放的记录（上次运行遗留的，或上次清空后新写入的）"""
+        return bool(self.records) or self._written
+
+    def close(self, remove: bool = False) -> None:
+        """关闭日志；remove 为真时删除日志文件（本次运行已全部完成，无需续处理）"""
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+            if remove and self._owner:
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    pass
+
+    def _disable(self, error: OSError) -> None:
+        self.error = error
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = None
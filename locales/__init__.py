@@ -0,0 +1,5 @@
+# locales/__init__.py
+"""
+各语言的界面文本，每种语言一个模块（模块名见 i18n.LANGUAGE_MODULES），各自定义 MESSAGES 字典。
+语言包由 i18n 按需导入，启动时只加载所选语言；新增文本时需在每个语言包中添加同名键。
+"""
@@ -0,0 +1,142 @@
+# locales/en.py
+"""英文语言包"""
+
+MESSAGES = {
+    # Main flow
+    'welcome': "Intelligent Archive Processor",
+    'features': [
+        "- Auto-detect disguised archives (e.g., a .jpg file that is actually a .zip)",
+        "- Safely extract split/multi-volume archives (.part1, .z01, .001, etc.)",
+        "- ZIP bomb protection with real-time disk space monitoring",
+        "- Auto-clean specified files and folders",
+        "- Supports common split formats: part1/vol1, .z01, .001, etc."
+    ],
+    'start_processing': "Starting file processing…",
+    'detecting_undetected': "🔍 Detected potential archives — identifying…",
+    'detecting_archives': "📦 Archive(s) detected — starting safe extraction…",
+    'no_files_left': "✅ No processable files found. Done.",
+    'processing_done': "✅ All archives extracted successfully!",
+    'interrupted': "⚠️ Process interrupted by user",
+    'main_loop_done': "✅ Processing complete",
+
+    # Extraction & detection
+    'rename_success': "✅ Renamed: {old} → {new} (type: {mime})",
+    'rename_skipped': "Target file {new_path} already exists — skipping {old}",
+    'file_verified': "🔍 Verified: {name} is a regular file",
+    'file_verified_with_mime': "🔍 Verified: {name} is a regular file ({mime})",
+    'detect_failed': "Detection failed: {name} → {error}",
+    'unzipping': "Extracting: {name}",
+    'unzip_success_delete': "Successfully extracted and deleted source: {name}",
+    'volume_deleted': "Deleted volume file: {name}",
+    'unzip_failed': "Extraction failed: {name} → {error}",
+    'unsafe_archive': "⚠️ Skipped potentially unsafe archive: {name} → {reason}",
+    'disk_low': "Skipped {name} — insufficient disk space",
+
+    # Cleanup
+    'delete_target_intro': "🗑️ The following files will be deleted:",
+    'delete_empty_dirs_intro': "🗑️ Deleting empty folders…",
+    'file_deleted': "🗑️ Deleted file: {path}",
+    'folder_deleted': "🧹 Deleted empty folder: {path}",
+    'delete_failed': "❌ Failed to delete {path}: {error}",
+    'dir_access_failed': "📁 Unable to access directory: {path} ({error})",
+
+    # Reports
+    'detect_fail_report_header': "⚠️ File type detection failures ({count} file(s)):",
+    'unzip_fail_report_header': "❌ Extraction failures ({count} file(s)):",
+    'file_label': "File: {name}",
+    'path_label': "Path: {path}",
+    'reason_label': "Reason: {reason}",
+
+    # Prompts
+    'prompt_delete_files': "❓ Delete these files? (y/N): ",
+    'prompt_delete_dirs': "❓ Delete empty folders? (y/N): ",
+    'press_enter_exit': "🔚 Press Enter to exit…",
+
+    # Misc
+    'all_done': "✅ All operations completed!",
+    'no_target_files': "⚠️ No target files specified (delete list is empty)",
+    'generate_success': "✅ Delete list file generated: {filename}",
+    'generate_tip': "💡 Edit this file, then run the program to perform cleanup.",
+    'generate_fail': "❌ Unable to write file: {filename} ({error})",
+    'list_file_read_fail': "❌ Unable to read delete list file: {filepath} ({error})",
+    'yes_no_conflict': "Arguments -y and -n cannot be used together",
+    'safety_limits': "Safety limits: max unpacked size {max_gb} GB, max files {max_files}",
+    'jobs_invalid': "Argument --jobs must be at least 1",
+    'watch_started': "👀 Watching {path} ({backend}) — press Ctrl+C to stop",
+    'extraction_rolled_back': "↩️ Rolled back partial output of {name} ({count} file(s) removed)",
+    'extraction_progress': "⏳ {name}: {percent}% done, {speed} MB/s",
+    'volume_set_incomplete': "Volume set {name} is incomplete (missing: {missing}), deferring extraction",
+    'sevenzip_missing': "⚠️ 7-Zip not found; only zip/tar/gz/bz2/xz can be extracted (rar, 7z and split archives need 7-Zip)",
+    'batch_extracting': "📦 Batch-extracting {count} small archives in one 7-Zip call",
+    'metrics_write_failed': "⚠️ Failed to write metrics to {path}: {error}",
+    'cleanup_summary': "🧹 Cleanup finished: deleted {files} files and {folders} empty folders, {failed} failed ({seconds}s)",
+    'delete_rule_invalid': "❌ Invalid delete rule: {error}",
+    'run_summary': "📊 Extracted {extracted} archives, {failed} failed, {deleted} items cleaned up in {seconds}s",
+    'journal_unavailable': "⚠️ Cannot use the resume journal {path}: {error}",
+    'journal_committed': "♻️ Finished committing an extraction interrupted last time: {name}",
+    'journal_resumed': "♻️ Resumed from the interrupted run: finished {finished} extracted archive(s), discarded {discarded} partial extraction(s)",
+    'root_started': "📂 Processing folder: {path}",
+    'root_failed': "❌ Error while processing folder {path}: {error}",
+    'root_invalid': "❌ Not an existing folder, skipped: {path}",
+    'root_nested': "⚠️ Folder {path} is inside {parent} and will be covered by recursion, skipped",
+    'roots_file_read_fail': "❌ Unable to read folder list file: {filepath} ({error})",
+    'duplicate_found': "🔁 {name} has the same content as {original}; extracting only one copy",
+    'duplicate_deleted': "🗑️ Deleted duplicate {name} (same as {original})",
+    # argparse localization
+    'argparse': {
+        'description': "Intelligent Archive Processor: Safely handle disguised, split, and malicious archives.",
+        'epilog': "Example: %(prog)s -y",
+        'yes': "Auto-answer yes to all prompts",
+        'no': "Auto-answer no to all prompts",
+        'delete_target': "Delete specified junk files",
+        'delete_empty': "Delete empty directories",
+        'delete_list': "Filenames to delete (space-separated)",
+        'list_file': "Read delete list from file",
+        'gen_list': "Generate delete_list.txt",
+        'language': "Interface language (auto|zh|zh-Hant|en|ja)",
+        'add_context_menu': "Add this program to Windows right-click context menu (on folders and background)",
+        'remove_context_menu': "Remove this program from Windows right-click context menu",
+        'max_unpacked_gb': "Maximum allowed unpacked size in GB (default: 50)",
+        'max_files': "Maximum allowed number of files (default: 10000)",
+        'jobs': "Maximum number of archives extracted in parallel (default: 1, sequential)",
+        'watch': "Keep watching the folder after processing and handle newly added files",
+        'recursive': "Recurse into subfolders, including folders created by extraction",
+        'max_depth': "Maximum folder depth in recursive mode (default: 5)",
+        'tree_quota': "Max archives extracted per top-level subfolder per pass in recursive mode (archives directly in the folder are not counted), 0 = unlimited (default: 1000)",
+        'no_cache': "Disable the on-disk safety analysis cache (always re-read archive metadata)",
+        'no_runtime_guard': "Disable live output size/file count enforcement during extraction",
+        'separate_folders': "Extract each archive into its own folder named after the archive",
+        'backend': "Extraction backend: auto (default; zip/tar/gz/bz2/xz in-process, others via 7-Zip), python, 7z",
+        'batch': "Extract up to N small archives (≤8 MB) per 7-Zip invocation; default 0 (disabled)",
+        'metrics_json': "Write per-stage counters and timings as JSON at exit (- for stdout)",
+        'metrics_textfile': "Write metrics for the Prometheus textfile collector (.prom); refreshed after each batch in watch mode",
+        'quiet': "Quiet mode: print only summaries, warnings and errors",
+        'log_format': "Log format: text (default) or json (one JSON event per line, for dashboards)",
+        'no_journal': "Do not keep the resume journal (by default a crash or interruption can be resumed from where it stopped)",
+        'paths': "Folders to process, any number (default: current folder); all folders share --jobs parallel extractions, scheduled in turn",
+        'paths_from': "Read folders to process from a file (one per line, // starts a comment; - for stdin)",
+        'order': "Extraction order: name (default), smallest (smallest first, finishes the most archives soonest) or largest (largest first, packs the disk)",
+        'no_dedup': "Do not deduplicate by content (by default identical archives are extracted once and the copies deleted afterwards)",
+    },
+    # Context menu
+    'context_menu_folder_label': "Auto-extract with CikeZZZ-AutoExtract",
+    'context_menu_bg_label': "Auto-extract with CikeZZZ-AutoExtract (current folder)",
+    'context_menu_added': "✅ Successfully added to Windows context menu! Executable path: {path}",
+    'context_menu_add_failed': "❌ Failed to add to context menu: {error}, please try running this program with administrator privileges.",
+    'context_menu_removed': "✅ Successfully removed from Windows context menu.",
+    'context_menu_remove_failed': "❌ Failed to remove from context menu: {error}, please try running this program with administrator privileges.",
+    'not_windows': "⚠️ This feature is only supported on Windows.",
+
+    # delete_list.txt localization template
+    'delete_list_template': """// delete_list.txt
+// One filename per line; // means comment
+// Wildcards are supported (e.g. *.tmp, ~$*); lines starting with re: are regular expressions matched against the whole filename (e.g. re:.*\\.bak\\d*)
+// Edit this file to add or remove files to clean up
+// Example:
+// malware.exe
+// temp.tmp
+// .DS_Store
+// Thumbs.db
+// desktop.ini
+"""
+}
@@ -0,0 +1,143 @@
+# locales/ja.py
+"""日文语言包"""
+
+MESSAGES = {
+    # Main flow
+    'welcome': "スマートアーカイブ処理ツール",
+    'features': [
+        "- 偽装アーカイブを自動検出（例：拡張子が .jpg でも実体は .zip など）",
+        "- 分割アーカイブを安全に展開（.part1、.z01、.001 など対応）",
+        "- ZIP爆弾対策 + ディスク容量の動的チェック",
+        "- 不要ファイルを自動クリーンアップ",
+        "- 分割形式に対応：part1/vol1、.z01、.001 など"
+    ],
+    'start_processing': "ファイルの処理を開始しています…",
+    'detecting_undetected': "🔍 潜在的なアーカイブを検出中…",
+    'detecting_archives': "📦 アーカイブを検出しました。安全に展開を開始します…",
+    'no_files_left': "✅ 処理対象のファイルが見つかりませんでした。完了しました。",
+    'processing_done': "✅ すべてのアーカイブを正常に展開しました！",
+    'interrupted': "⚠️ ユーザーによって処理が中断されました",
+    'main_loop_done': "✅ 処理が完了しました",
+
+    # Extraction & detection
+    'rename_success': "✅ ファイル名を変更しました：{old} → {new}（タイプ：{mime}）",
+    'rename_skipped': "対象ファイル {new_path} が存在するため、{old} をスキップしました",
+    'file_verified': "🔍 {name} は通常のファイルです",
+    'file_verified_with_mime': "🔍 {name} は通常のファイルです（{mime}）",
+    'detect_failed': "検出に失敗しました：{name} → {error}",
+    'unzipping': "{name} を展開中…",
+    'unzip_success_delete': "正常に展開し、元のファイルを削除しました：{name}",
+    'volume_deleted': "分割ファイルを削除しました：{name}",
+    'unzip_failed': "展開に失敗しました：{name} → {error}",
+    'unsafe_archive': "⚠️ 危険なファイルのためスキップしました：{name} → {reason}",
+    'disk_low': "{name} はディスク容量不足のためスキップしました",
+
+    # Cleanup
+    'delete_target_intro': "🗑️ 以下のファイルを削除します：",
+    'delete_empty_dirs_intro': "🗑️ 空のフォルダを削除します…",
+    'file_deleted': "🗑️ ファイルを削除しました：{path}",
+    'folder_deleted': "🧹 空のフォルダを削除しました：{path}",
+    'delete_failed': "❌ {path} の削除に失敗しました：{error}",
+    'dir_access_failed': "📁 ディレクトリ {path} にアクセスできません：{error}",
+
+    # Reports
+    'detect_fail_report_header': "⚠️ ファイル形式の検出に失敗しました（{count} 件）：",
+    'unzip_fail_report_header': "❌ 展開に失敗したファイル（{count} 件）：",
+    'file_label': "ファイル：{name}",
+    'path_label': "パス：{path}",
+    'reason_label': "理由：{reason}",
+
+    # Prompts
+    'prompt_delete_files': "❓ これらのファイルを削除しますか？（y/N）：",
+    'prompt_delete_dirs': "❓ 空のフォルダを削除しますか？（y/N）：",
+    'press_enter_exit': "🔚 Enter キーを押して終了してください…",
+
+    # Misc
+    'all_done': "✅ すべての操作が完了しました！",
+    'no_target_files': "⚠️ 削除対象のファイルが指定されていません（削除リストが空です）",
+    'generate_success': "✅ 削除リストファイルを生成しました：{filename}",
+    'generate_tip': "💡 このファイルを編集後、再度実行するとクリーンアップできます。",
+    'generate_fail': "❌ {filename} に書き込めません：{error}",
+    'list_file_read_fail': "❌ 削除リストファイル {filepath} を読み込めません：{error}",
+    'yes_no_conflict': "引数 -y と -n は同時に使用できません",
+    'safety_limits': "安全制限：最大展開サイズ {max_gb} GB、最大ファイル数 {max_files} 個",
+    'jobs_invalid': "引数 --jobs は 1 以上を指定してください",
+    'watch_started': "👀 {path} を監視中（{backend}）— Ctrl+C で終了",
+    'extraction_rolled_back': "↩️ {name} の途中まで展開された内容を取り消しました（{count} 個のファイルを削除）",
+    'extraction_progress': "⏳ {name}：{percent}% 完了、{speed} MB/s",
+    'volume_set_incomplete': "分割アーカイブ {name} が不完全です（不足：{missing}）。解凍を保留します",
+    'sevenzip_missing': "⚠️ 7-Zip が見つかりません。zip/tar/gz/bz2/xz のみ展開できます（rar・7z・分割アーカイブには 7-Zip が必要です）",
+    'batch_extracting': "📦 小さなアーカイブ {count} 個を 1 回の 7-Zip 呼び出しで一括展開中",
+    'metrics_write_failed': "⚠️ メトリクスを {path} に書き込めませんでした：{error}",
+    'cleanup_summary': "🧹 クリーンアップ完了：ファイル {files} 個、空フォルダ {folders} 個を削除、失敗 {failed} 件（{seconds} 秒）",
+    'delete_rule_invalid': "❌ 無効な削除ルール：{error}",
+    'run_summary': "📊 アーカイブ {extracted} 個を展開、失敗 {failed} 個、{deleted} 項目をクリーンアップ（{seconds} 秒）",
+    'journal_unavailable': "⚠️ 再開用ジャーナル {path} を使用できません：{error}",
+    'journal_committed': "♻️ 中断前の展開結果の確定を完了しました：{name}",
+    'journal_resumed': "♻️ 前回の中断から再開しました：展開済み {finished} 件を確定、未完了の展開 {discarded} 件を破棄",
+    'root_started': "📂 フォルダを処理します：{path}",
+    'root_failed': "❌ フォルダ {path} の処理中にエラーが発生しました：{error}",
+    'root_invalid': "❌ 存在しないかフォルダではないためスキップしました：{path}",
+    'root_nested': "⚠️ フォルダ {path} は {parent} の内側にあり、再帰処理で対象になるためスキップしました",
+    'roots_file_read_fail': "❌ フォルダ一覧ファイル {filepath} を読み込めません：{error}",
+    'duplicate_found': "🔁 {name} は {original} と内容が同じため、1 つだけ解凍します",
+    'duplicate_deleted': "🗑️ 重複コピー {name} を削除しました（{original} と同一）",
+    
+    # argparse localization
+    'argparse': {
+        'description': "偽装・分割・悪意のあるアーカイブを安全に自動処理します。",
+        'epilog': "例: %(prog)s -y",
+        'yes': "すべてのプロンプトに自動で「はい」と回答",
+        'no': "すべてのプロンプトに自動で「いいえ」と回答",
+        'delete_target': "指定された不要ファイルを削除",
+        'delete_empty': "空のフォルダを削除",
+        'delete_list': "削除するファイル名（スペース区切り）",
+        'list_file': "ファイルから削除リストを読み込む",
+        'gen_list': "delete_list.txt を生成",
+        'language': "インターフェース言語 (auto|zh|zh-Hant|en|ja)",
+        'add_context_menu': "このプログラムを Windows の右クリックメニューに追加（フォルダと背景）",
+        'remove_context_menu': "このプログラムを Windows の右クリックメニューから削除",
+        'max_unpacked_gb': "許容される最大展開サイズ（GB単位、デフォルト: 50）",
+        'max_files': "許容される最大ファイル数（デフォルト: 10000）",
+        'jobs': "並列で展開するアーカイブの最大数（デフォルト: 1、逐次処理）",
+        'watch': "処理後もフォルダを監視し、新しく追加されたファイルを自動処理",
+        'recursive': "サブフォルダ（展開で作成されたものを含む）を再帰的に処理",
+        'max_depth': "再帰モードでの最大フォルダ深度（デフォルト: 5）",
+        'tree_quota': "再帰モードで各トップレベルサブフォルダごとに 1 回の処理で展開できるアーカイブ数の上限（フォルダ直下のアーカイブは数えない）、0 は無制限（デフォルト: 1000）",
+        'no_cache': "安全性分析のディスクキャッシュを使用しない（毎回メタデータを再読み込み）",
+        'no_runtime_guard': "展開中の出力サイズ・ファイル数のリアルタイム制限を無効化",
+        'separate_folders': "各アーカイブを同名の個別フォルダーに展開",
+        'backend': "展開バックエンド：auto（既定。zip/tar/gz/bz2/xz はプロセス内で展開し、その他は 7-Zip）、python、7z",
+        'batch': "1 回の 7-Zip 呼び出しで一括展開する小さなアーカイブ（≤8 MB）の最大数。既定 0（無効）",
+        'metrics_json': "終了時に各段階のカウンタと所要時間を JSON に書き出す（- は標準出力）",
+        'metrics_textfile': "Prometheus textfile collector 形式（.prom）でメトリクスを書き出す。監視モードではバッチごとに更新",
+        'quiet': "静音モード：サマリー・警告・エラーのみを出力",
+        'log_format': "ログ形式：text（既定）または json（1 行に 1 つの JSON イベント。ダッシュボード向け）",
+        'no_journal': "再開用ジャーナルを記録しない（既定ではクラッシュや中断の後、中断した所から再開できます）",
+        'paths': "処理するフォルダ（複数指定可、既定は現在のフォルダ）。すべてのフォルダで --jobs 個の並列解凍を共有し、順番にスケジュールします",
+        'paths_from': "処理するフォルダをファイルから読み込む（1 行に 1 つ、// で始まる行はコメント、- は標準入力）",
+        'order': "解凍順序：name（既定、名前順）、smallest（小さい順、より多くのアーカイブを早く完了）、largest（大きい順、ディスクに詰めやすい）",
+        'no_dedup': "内容による重複排除を行わない（既定では同一内容のアーカイブは 1 つだけ解凍し、成功後にコピーを削除）",
+    },
+    # Context menu
+    'context_menu_folder_label': "CikeZZZ-AutoExtract で自動展開",
+    'context_menu_bg_label': "CikeZZZ-AutoExtract で自動展開（現在のフォルダ）",
+    'context_menu_added': "✅ Windows の右クリックメニューに正常に追加されました！実行ファイルパス：{path}",
+    'context_menu_add_failed': "❌ 右クリックメニューへの追加に失敗しました：{error}、管理者権限での実行を試みてください。",
+    'context_menu_removed': "✅ Windows の右クリックメニューから正常に削除されました。",
+    'context_menu_remove_failed': "❌ 右クリックメニューからの削除に失敗しました：{error}、管理者権限での実行を試みてください。",
+    'not_windows': "⚠️ この機能は Windows のみ対応しています。",
+
+    # delete_list.txt localization template
+    'delete_list_template': """// delete_list.txt
+// 1行に1つのファイル名を記述（// はコメント）
+// ワイルドカードに対応（例：*.tmp、~$*）。re: で始まる行は正規表現としてファイル名全体に照合（例：re:.*\\.bak\\d*）
+// 削除するファイルを追加・削除するにはこのファイルを編集してください
+// 例：
+// 悪意あるプログラム.exe
+// 一時ファイル.tmp
+// .DS_Store
+// Thumbs.db
+// desktop.ini
+"""
+}
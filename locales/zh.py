@@ -0,0 +1,144 @@
+# locales/zh.py
+"""简体中文语言包"""
+
+MESSAGES = {
+    # 主流程
+    'welcome': "智能压缩包处理工具",
+    'features': [
+        "- 自动识别伪装压缩包（如 .jpg 实为 .zip）",
+        "- 安全解压分卷文件（.part1、.z01、.001 等）",
+        "- 防御 ZIP 炸弹 + 动态磁盘空间检查",
+        "- 自动清理指定文件",
+        "- 支持分卷格式：part1/vol1、.z01、.001 等"
+    ],
+    'start_processing': "开始处理文件……",
+    'detecting_undetected': "🔍 检测到潜在压缩文件，正在识别……",
+    'detecting_archives': "📦 检测到压缩文件，开始安全解压……",
+    'no_files_left': "✅ 未检测到可处理的文件，处理完成",
+    'processing_done': "✅ 所有压缩包均已成功解压！",
+    'interrupted': "⚠️ 程序被用户中断",
+    'main_loop_done': "✅ 处理流程已结束",
+
+    # 解压与检测
+    'rename_success': "✅ 重命名：{old} → {new}（类型：{mime}）",
+    'rename_skipped': "目标文件 {new_path} 已存在，跳过 {old}",
+    'file_verified': "🔍 验证：{name} 是普通文件",
+    'file_verified_with_mime': "🔍 验证：{name} 是普通文件（{mime}）",
+    'detect_failed': "检测失败：{name} → {error}",
+    'unzipping': "正在解压：{name}",
+    'unzip_success_delete': "解压成功并删除源文件：{name}",
+    'volume_deleted': "已删除分卷文件：{name}",
+    'unzip_failed': "解压失败：{name} → {error}",
+    'unsafe_archive': "⚠️ 跳过危险文件：{name} → {reason}",
+    'disk_low': "磁盘空间不足，已跳过 {name}",
+
+    # 清理
+    'delete_target_intro': "🗑️ 将删除以下指定文件：",
+    'delete_empty_dirs_intro': "🗑️ 将删除空文件夹……",
+    'file_deleted': "🗑️ 已删除文件：{path}",
+    'folder_deleted': "🧹 已删除空文件夹：{path}",
+    'delete_failed': "❌ 删除失败 {path}：{error}",
+    'dir_access_failed': "📁 无法访问目录 {path}：{error}",
+
+    # 报告
+    'detect_fail_report_header': "⚠️ 文件类型检测失败（共 {count} 个文件）：",
+    'unzip_fail_report_header': "❌ 解压失败报告（共 {count} 个文件）：",
+    'file_label': "文件：{name}",
+    'path_label': "路径：{path}",
+    'reason_label': "原因：{reason}",
+
+    # 交互提示
+    'prompt_delete_files': "❓ 是否删除这些文件？(y/N)：",
+    'prompt_delete_dirs': "❓ 是否删除空文件夹？(y/N)：",
+    'press_enter_exit': "🔚 按回车键退出……",
+
+    # 其他
+    'all_done': "✅ 所有操作已完成！",
+    'no_target_files': "⚠️ 未指定任何要删除的文件（删除列表为空）",
+    'generate_success': "✅ 已生成删除列表文件：{filename}",
+    'generate_tip': "💡 你可以编辑此文件，然后运行本程序进行清理。",
+    'generate_fail': "❌ 无法写入文件 {filename}：{error}",
+    'list_file_read_fail': "❌ 无法读取删除列表文件 {filepath}：{error}",
+    'yes_no_conflict': "参数 -y 和 -n 不能同时使用",
+    'safety_limits': "安全限制：最大解压 {max_gb} GB，最多 {max_files} 个文件",
+    'jobs_invalid': "参数 --jobs 必须大于等于 1",
+    'watch_started': "👀 正在监视目录 {path}（{backend}），按 Ctrl+C 退出",
+    'extraction_rolled_back': "↩️ 已回滚 {name} 的部分解压结果（删除 {count} 个文件）",
+    'extraction_progress': "⏳ {name}：已完成 {percent}%，{speed} MB/s",
+    'volume_set_incomplete': "分卷组 {name} 不完整（缺少：{missing}），暂缓解压",
+    'sevenzip_missing': "⚠️ 未找到 7-Zip，仅能解压 zip/tar/gz/bz2/xz（rar、7z 与分卷需要 7-Zip）",
+    'batch_extracting': "📦 批量解压 {count} 个小压缩包（单次 7-Zip 调用）",
+    'metrics_write_failed': "⚠️ 无法写入运行指标 {path}：{error}",
+    'cleanup_summary': "🧹 清理完成：删除 {files} 个文件、{folders} 个空文件夹，失败 {failed} 项（用时 {seconds} 秒）",
+    'delete_rule_invalid': "❌ 删除规则无效：{error}",
+    'run_summary': "📊 本次共解压 {extracted} 个压缩包，失败 {failed} 个，清理 {deleted} 项，用时 {seconds} 秒",
+    'journal_unavailable': "⚠️ 无法使用断点续处理日志 {path}：{error}",
+    'journal_committed': "♻️ 已完成中断前的解压提交：{name}",
+    'journal_resumed': "♻️ 已从上次中断处恢复：完成 {finished} 个已解压的压缩包，丢弃 {discarded} 个未完成的解压",
+    'root_started': "📂 开始处理目录：{path}",
+    'root_failed': "❌ 处理目录 {path} 时出错：{error}",
+    'root_invalid': "❌ 目录不存在或不是文件夹，已跳过：{path}",
+    'root_nested': "⚠️ 目录 {path} 位于 {parent} 之内，递归处理时会一并处理，已跳过",
+    'roots_file_read_fail': "❌ 无法读取目录列表文件 {filepath}：{error}",
+    'duplicate_found': "🔁 {name} 与 {original} 内容相同，只解压一份",
+    'duplicate_deleted': "🗑️ 已删除重复副本 {name}（与 {original} 相同）",
+    
+    # argparse 本地化（用于 --help）
+    'argparse': {
+        'description': "智能压缩包处理工具：安全处理伪装、分卷及恶意压缩包",
+        'epilog': "示例：%(prog)s -y",
+        'yes': "自动回答所有提示为“是”",
+        'no': "自动回答所有提示为“否”",
+        'delete_target': "删除指定的垃圾文件",
+        'delete_empty': "删除空文件夹",
+        'delete_list': "要删除的文件名（空格分隔）",
+        'list_file': "从文件读取删除列表",
+        'gen_list': "生成 delete_list.txt",
+        'language': "界面语言（{auto|zh|zh-Hant|en|ja}）",
+        'add_context_menu': "将本程序添加到 Windows 右键菜单（文件夹和空白处）",
+        'remove_context_menu': "从 Windows 右键菜单中移除本程序",
+        'max_unpacked_gb': "最大允许解压大小（GB），默认 50 GB",
+        'max_files': "最大允许文件数，默认 10000 个",
+        'jobs': "并行解压的最大任务数，默认 1（串行）",
+        'watch': "处理完成后继续监视目录，自动处理新加入的文件",
+        'recursive': "递归处理子目录（包括解压产生的子目录）",
+        'max_depth': "递归模式下的最大目录深度，默认 5",
+        'tree_quota': "递归模式下每个顶层子目录每轮最多解压的压缩包数（目录本身的压缩包不计入），0 表示不限，默认 1000",
+        'no_cache': "不使用安全分析磁盘缓存（每次重新读取压缩包元数据）",
+        'no_runtime_guard': "关闭解压过程中的实时输出大小/文件数限制",
+        'separate_folders': "将每个压缩包解压到单独的同名文件夹",
+        'backend': "解压后端：auto（默认，zip/tar/gz/bz2/xz 进程内解压，其余使用 7-Zip）、python、7z",
+        'batch': "每次 7-Zip 调用批量解压的小压缩包（≤8 MB）数量上限，默认 0（不批量）",
+        'metrics_json': "退出时把各阶段计数与耗时写入 JSON 文件（- 表示输出到标准输出）",
+        'metrics_textfile': "写出 Prometheus textfile collector 格式的指标文件（.prom），监视模式下每批处理后刷新",
+        'quiet': "安静模式：只输出汇总、警告与错误",
+        'log_format': "日志格式：text（默认）或 json（每行一个 JSON 事件，便于仪表盘采集）",
+        'no_journal': "不记录断点续处理日志（默认在处理目录中记录，崩溃或中断后可从中断处继续）",
+        'paths': "要处理的目录，可给出多个（默认为当前目录）；所有目录共用 --jobs 个并发解压，按目录轮流调度",
+        'paths_from': "从文件读取要处理的目录（每行一个，// 开头为注释；- 表示标准输入）",
+        'order': "解压顺序：name（默认，按名称）、smallest（小的优先，尽快完成更多压缩包）、largest（大的优先，便于在磁盘上排布）",
+        'no_dedup': "不按内容去重（默认内容相同的压缩包只解压一份，副本在解压成功后删除）",
+    },
+
+    # 上下文菜单
+    'context_menu_folder_label': "使用 CikeZZZ-AutoExtract 自动解压",
+    'context_menu_bg_label': "使用 CikeZZZ-AutoExtract 自动解压（当前目录）",
+    'context_menu_added': "✅ 已成功添加到 Windows 右键菜单！程序路径：{path}",
+    'context_menu_add_failed': "❌ 添加右键菜单失败：{error}，请尝试使用管理员权限运行本程序",
+    'context_menu_removed': "✅ 已从 Windows 右键菜单中移除。",
+    'context_menu_remove_failed': "❌ 移除右键菜单失败：{error}，请尝试使用管理员权限运行本程序",
+    'not_windows': "⚠️ 此功能仅支持 Windows 系统。",
+
+    # delete_list.txt 本地化模板
+    'delete_list_template': """// delete_list.txt
+// 每行一个文件名，// 表示注释
+// 支持通配符（如 *.tmp、~$*）；以 re: 开头的行为正则表达式（匹配整个文件名，如 re:.*\\.bak\\d*）
+// 编辑此文件以添加或删除要清理的文件
+// 示例：
+// 恶意脚本.exe
+// 临时文件.tmp
+// .DS_Store
+// Thumbs.db
+// desktop.ini
+"""
+}
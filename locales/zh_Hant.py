@@ -0,0 +1,140 @@
+# locales/zh_Hant.py
+"""繁体中文语言包"""
+
+MESSAGES = {
+    # 主流程
+    'welcome': "智能壓縮檔處理工具",
+    'features': [
+        "- 自動識別偽裝壓縮檔（例如副檔名為 .jpg，實際為 .zip）",
+        "- 安全解壓分卷檔（如 .part1、.z01、.001 等）",
+        "- 防禦 ZIP 炸彈攻擊，並動態檢查磁碟空間",
+        "- 自動清理指定檔案",
+        "- 支援常見分卷格式：part1/vol1、.z01、.001 等"
+    ],
+    'start_processing': "開始處理檔案……",
+    'detecting_undetected': "🔍 發現潛在壓縮檔，正在識別……",
+    'detecting_archives': "📦 檢測到壓縮檔，開始安全解壓……",
+    'no_files_left': "✅ 未發現可處理的檔案，處理完成",
+    'processing_done': "✅ 所有壓縮檔均已成功解壓！",
+    'interrupted': "⚠️ 程式已被使用者中斷",
+    'main_loop_done': "✅ 處理流程已結束",
+
+    # 解壓與檢測
+    'rename_success': "✅ 重新命名：{old} → {new}（類型：{mime}）",
+    'rename_skipped': "目標檔案 {new_path} 已存在，跳過 {old}",
+    'file_verified': "🔍 驗證：{name} 為一般檔案",
+    'file_verified_with_mime': "🔍 驗證：{name} 為一般檔案（{mime}）",
+    'detect_failed': "識別失敗：{name} → {error}",
+    'unzipping': "正在解壓：{name}",
+    'unzip_success_delete': "解壓成功並已刪除原始檔案：{name}",
+    'volume_deleted': "已刪除分卷檔：{name}",
+    'unzip_failed': "解壓失敗：{name} → {error}",
+    'unsafe_archive': "⚠️ 已跳過危險檔案：{name} → {reason}",
+    'disk_low': "磁碟空間不足，已跳過 {name}",
+
+    # 清理
+    'delete_target_intro': "🗑️ 即將刪除以下指定檔案：",
+    'delete_empty_dirs_intro': "🗑️ 即將刪除空資料夾……",
+    'file_deleted': "🗑️ 已刪除檔案：{path}",
+    'folder_deleted': "🧹 已刪除空資料夾：{path}",
+    'delete_failed': "❌ 刪除失敗 {path}：{error}",
+    'dir_access_failed': "📁 無法存取目錄 {path}：{error}",
+
+    # 報告
+    'detect_fail_report_header': "⚠️ 檔案類型識別失敗（共 {count} 個檔案）：",
+    'unzip_fail_report_header': "❌ 解壓失敗報告（共 {count} 個檔案）：",
+    'file_label': "檔案：{name}",
+    'path_label': "路徑：{path}",
+    'reason_label': "原因：{reason}",
+
+    # 交互提示
+    'prompt_delete_files': "❓ 是否刪除這些檔案？(y/N)：",
+    'prompt_delete_dirs': "❓ 是否刪除空資料夾？(y/N)：",
+    'press_enter_exit': "🔚 請按 Enter 鍵結束……",
+
+    # 其他
+    'all_done': "✅ 所有操作已完成！",
+    'no_target_files': "⚠️ 未指定任何待刪除的檔案（刪除清單為空）",
+    'generate_success': "✅ 已成功產生刪除清單檔案：{filename}",
+    'generate_tip': "💡 您可編輯此清單檔案，再執行本程式進行清理。",
+    'generate_fail': "❌ 無法寫入檔案 {filename}：{error}",
+    'list_file_read_fail': "❌ 無法讀取刪除清單檔案 {filepath}：{error}",
+    'yes_no_conflict': "參數 -y 和 -n 不能同時使用",
+    'safety_limits': "安全限制：最大解壓 {max_gb} GB，最多 {max_files} 個檔案",
+    'jobs_invalid': "參數 --jobs 必須大於等於 1",
+    'watch_started': "👀 正在監視目錄 {path}（{backend}），按 Ctrl+C 結束",
+    'extraction_rolled_back': "↩️ 已復原 {name} 的部分解壓結果（刪除 {count} 個檔案）",
+    'extraction_progress': "⏳ {name}：已完成 {percent}%，{speed} MB/s",
+    'volume_set_incomplete': "分卷組 {name} 不完整（缺少：{missing}），暫緩解壓",
+    'sevenzip_missing': "⚠️ 找不到 7-Zip，僅能解壓 zip/tar/gz/bz2/xz（rar、7z 與分卷需要 7-Zip）",
+    'batch_extracting': "📦 批次解壓 {count} 個小壓縮檔（單次 7-Zip 呼叫）",
+    'metrics_write_failed': "⚠️ 無法寫入執行指標 {path}：{error}",
+    'cleanup_summary': "🧹 清理完成：刪除 {files} 個檔案、{folders} 個空資料夾，失敗 {failed} 項（用時 {seconds} 秒）",
+    'delete_rule_invalid': "❌ 刪除規則無效：{error}",
+    'run_summary': "📊 本次共解壓 {extracted} 個壓縮檔，失敗 {failed} 個，清理 {deleted} 項，用時 {seconds} 秒",
+    'journal_unavailable': "⚠️ 無法使用斷點續處理日誌 {path}：{error}",
+    'journal_committed': "♻️ 已完成中斷前的解壓提交：{name}",
+    'journal_resumed': "♻️ 已從上次中斷處恢復：完成 {finished} 個已解壓的壓縮檔，捨棄 {discarded} 個未完成的解壓",
+    'root_started': "📂 開始處理目錄：{path}",
+    'root_failed': "❌ 處理目錄 {path} 時出錯：{error}",
+    'root_invalid': "❌ 目錄不存在或不是資料夾，已略過：{path}",
+    'root_nested': "⚠️ 目錄 {path} 位於 {parent} 之內，遞迴處理時會一併處理，已略過",
+    'roots_file_read_fail': "❌ 無法讀取目錄清單檔案 {filepath}：{error}",
+    'duplicate_found': "🔁 {name} 與 {original} 內容相同，只解壓一份",
+    'duplicate_deleted': "🗑️ 已刪除重複副本 {name}（與 {original} 相同）",
+    # argparse 本地化
+    'argparse': {
+        'description': "智能壓縮檔處理工具：安全處理偽裝、分卷及惡意壓縮檔",
+        'epilog': "範例：%(prog)s -y",
+        'yes': "自動回答所有提示為「是」",
+        'no': "自動回答所有提示為「否」",
+        'delete_target': "刪除指定的垃圾檔案",
+        'delete_empty': "刪除空資料夾",
+        'delete_list': "要刪除的檔案名稱（以空格分隔）",
+        'list_file': "從檔案讀取刪除清單",
+        'gen_list': "產生 delete_list.txt",
+        'language': "介面語言（auto|zh|zh-Hant|en|ja）",
+        'add_context_menu': "將本程式新增至 Windows 右鍵選單（資料夾和目錄背景處）",
+        'remove_context_menu': "從 Windows 右鍵選單中移除本程式",
+        'max_unpacked_gb': "最大允許解壓大小（GB），預設 50 GB",
+        'max_files': "最大允許檔案數，預設 10000 個",
+        'jobs': "並行解壓的最大任務數，預設 1（依序執行）",
+        'watch': "處理完成後持續監視目錄，自動處理新加入的檔案",
+        'recursive': "遞迴處理子目錄（包括解壓產生的子目錄）",
+        'max_depth': "遞迴模式下的最大目錄深度，預設 5",
+        'tree_quota': "遞迴模式下每個頂層子目錄每輪最多解壓的壓縮檔數（目錄本身的壓縮檔不計入），0 表示不限，預設 1000",
+        'no_cache': "不使用安全分析磁碟快取（每次重新讀取壓縮檔中繼資料）",
+        'no_runtime_guard': "關閉解壓過程中的即時輸出大小／檔案數限制",
+        'separate_folders': "將每個壓縮檔解壓到單獨的同名資料夾",
+        'backend': "解壓後端：auto（預設，zip/tar/gz/bz2/xz 於行程內解壓，其餘使用 7-Zip）、python、7z",
+        'batch': "每次 7-Zip 呼叫批次解壓的小壓縮檔（≤8 MB）數量上限，預設 0（不批次）",
+        'metrics_json': "結束時把各階段計數與耗時寫入 JSON 檔案（- 表示輸出到標準輸出）",
+        'metrics_textfile': "寫出 Prometheus textfile collector 格式的指標檔案（.prom），監視模式下每批處理後更新",
+        'quiet': "安靜模式：只輸出彙總、警告與錯誤",
+        'log_format': "日誌格式：text（預設）或 json（每行一個 JSON 事件，便於儀表板收集）",
+        'no_journal': "不記錄斷點續處理日誌（預設在處理目錄中記錄，當機或中斷後可從中斷處繼續）",
+        'paths': "要處理的目錄，可給出多個（預設為目前目錄）；所有目錄共用 --jobs 個並行解壓，依目錄輪流排程",
+        'paths_from': "從檔案讀取要處理的目錄（每行一個，// 開頭為註解；- 表示標準輸入）",
+        'order': "解壓順序：name（預設，依名稱）、smallest（小的優先，盡快完成更多壓縮檔）、largest（大的優先，便於在磁碟上排布）",
+        'no_dedup': "不依內容去重（預設內容相同的壓縮檔只解壓一份，副本在解壓成功後刪除）",
+    },
+    # 上下文選單
+    'context_menu_folder_label': "使用 CikeZZZ-AutoExtract 自動解壓",
+    'context_menu_bg_label': "使用 CikeZZZ-AutoExtract 自動解壓（目前目錄）",
+    'context_menu_added': "✅ 已成功新增至 Windows 右鍵選單！程式路徑：{path}",
+    'context_menu_add_failed': "❌ 新增右鍵選單失敗：{error}，請嘗試使用系統管理員權限執行本程式",
+    'context_menu_removed': "✅ 已從 Windows 右鍵選單中移除。",
+    'context_menu_remove_failed': "❌ 移除右鍵選單失敗：{error}，請嘗試使用系統管理員權限執行本程式",
+    'not_windows': "⚠️ 此功能僅支援 Windows 系統。",
+    'delete_list_template': """// delete_list.txt
+// 每行一個檔案名稱，// 表示註解
+// 支援萬用字元（如 *.tmp、~$*）；以 re: 開頭的行為正規表示式（比對整個檔案名稱，如 re:.*\\.bak\\d*）
+// 編輯此檔案以新增或刪除要清理的檔案
+// 範例：
+// 惡意程式.exe
+// 暫存檔案.tmp
+// .DS_Store
+// Thumbs.db
+// desktop.ini
+"""
+}
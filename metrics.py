@@ -0,0 +1,232 @@
+# metrics.py
+"""
+运行指标：线程安全的计数器、仪表与直方图，可导出为 JSON 摘要或 Prometheus 文本格式
+（供 node_exporter 的 textfile collector 采集）。
+
+指标以 (名称, 标签) 区分，标签为关键字参数，例如 inc('deleted_total', kind='file')。
+直方图使用固定的累计分桶，与 Prometheus 的 histogram 语义一致。
+"""
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+__all__ = ['MetricsRegistry', 'DEFAULT_BUCKETS', 'write_atomic']
+
+# 耗时直方图的默认分桶上界（秒）：覆盖从单次 scandir 到长时间解压的范围
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 1800)
+
+_LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, object]) -> _LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: _LabelKey, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def write_atomic(path: str, text: str) -> None:
+    """先写入同目录的临时文件再重命名，采集方不会读到写了一半的文件"""
+    import tempfile
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix='.metrics-', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class _Histogram:
+    __slots__ = ('bounds', 'counts', 'count', 'sum', 'min', 'max')
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def cumulative(self) -> Iterator[Tuple[float, int]]:
+        """按 Prometheus 语义返回 (上界, 累计数)，最后一项为 +Inf"""
+        running = 0
+        for bound, count in zip(self.bounds, self.counts):
+            running += count
+            yield bound, running
+        yield math.inf, self.count
+
+
+class MetricsRegistry:
+    """进程内的指标注册表；所有方法均可在多个解压线程中并发调用"""
+
+    def __init__(self, namespace: str = 'autoextract', buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.namespace = namespace
+        self.buckets = tuple(sorted(buckets))
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._help: Dict[str, str] = {}
+        self._counters: Dict[str, Dict[_LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[_LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[_LabelKey, _Histogram]] = {}
+
+    def describe(self, name: str, text: str) -> None:
+        """登记指标说明（导出为 Prometheus 的 # HELP 行）"""
+        self._help[name] = text
+
+    def reset(self) -> None:
+        """清空全部数据并重新开始计时（说明保留）"""
+        with self._lock:
+            self.started = time.time()
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    # ---------------- 记录 ----------------
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def value(self, name: str, **labels) -> float:
+        """返回计数器的当前值，尚未记录时为 0"""
+        with self._lock:
+            return self._counters.get(name, {}).get(_label_key(labels), 0)
+
+    def set(self, name: str, value: float, **labels) -> None:
+        with self._lock:
+            self._gauges.setdefault(name, {})[_label_key(labels)] = value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(self.buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels) -> Iterator[None]:
+        """把 with 块的耗时（秒）记入直方图 name，异常退出时同样记录"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def sleep(self, seconds: float, **labels) -> None:
+        """time.sleep 并把实际等待时间累加到 sleep_seconds_total"""
+        started = time.perf_counter()
+        try:
+            time.sleep(seconds)
+        finally:
+            self.inc('sleep_seconds_total', time.perf_counter() - started, **labels)
+
+    # ---------------- 导出 ----------------
+
+    def snapshot(self) -> dict:
+        """返回可直接序列化为 JSON 的摘要；带标签的序列以 Prometheus 形式的 name{k="v"} 为键"""
+        with self._lock:
+            counters = {name + _format_labels(key): value
+                        for name, series in sorted(self._counters.items())
+                        for key, value in sorted(series.items())}
+            gauges = {name + _format_labels(key): value
+                      for name, series in sorted(self._gauges.items())
+                      for key, value in sorted(series.items())}
+            histograms = {}
+            for name, series in sorted(self._histograms.items()):
+                for key, h in sorted(series.items()):
+                    histograms[name + _format_labels(key)] = {
+                        'count': h.count,
+                        'sum': h.sum,
+                        'min': h.min if h.count else None,
+                        'max': h.max if h.count else None,
+                        'mean': h.sum / h.count if h.count else None,
+                        'buckets': {_format_value(bound): n for bound, n in h.cumulative()},
+                    }
+        return {
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%S%z', time.localtime(self.started)),
+            'duration_seconds': time.time() - self.started,
+            'counters': counters,
+            'gauges': gauges,
+            'histograms': histograms,
+        }
+
+    def to_prometheus(self) -> str:
+        """按 Prometheus 文本格式（0.0.4）输出全部指标，名称自动加上命名空间前缀"""
+        lines = []
+
+        def _header(name: str, kind: str) -> str:
+            full = f'{self.namespace}_{name}'
+            if name in self._help:
+                lines.append(f'# HELP {full} {self._help[name]}')
+            lines.append(f'# TYPE {full} {kind}')
+            return full
+
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                full = _header(name, 'counter')
+                for key, value in sorted(series.items()):
+                    lines.append(f'{full}{_format_labels(key)} {_format_value(value)}')
+            for name, series in sorted(self._gauges.items()):
+                full = _header(name, 'gauge')
+                for key, value in sorted(series.items()):
+                    lines.append(f'{full}{_format_labels(key)} {_format_value(value)}')
+            for name, series in sorted(self._histograms.items()):
+                full = _header(name, 'histogram')
+                for key, h in sorted(series.items()):
+                    for bound, n in h.cumulative():
+                        lines.append(f'{full}_bucket{_format_labels(key, (("le", _format_value(bound)),))} {n}')
+                    lines.append(f'{full}_sum{_format_labels(key)} {_format_value(h.sum)}')
+                    lines.append(f'{full}_count{_format_labels(key)} {h.count}')
+        return '\n'.join(lines) + '\n'
+
+    def write_json(self, path: Optional[str]) -> None:
+        """写出 JSON 摘要；path 为 '-' 时输出到标准输出"""
+        import json
+        text = json.dumps(self.snapshot(), ensure_ascii=False, indent=2) + '\n'
+        if path == '-':
+            print(text, end='')
+        else:
+            write_atomic(path, text)
+
+    def write_prometheus(self, path: str) -> None:
+        """写出 textfile collector 文件（node_exporter 只读取 .prom 扩展名的文件）"""
+        write_atomic(path, self.to_prometheus())
@@ -0,0 +1,278 @@
+# stream_extract.py
+"""
+纯标准库的进程内流式解压（zipfile / tarfile / gzip / bz2 / lzma），无需启动 7z 子进程。
+
+数据按固定大小的块复制，内存占用与压缩包大小无关；未压缩 tar 中的文件在系统支持时
+通过 copy_file_range / sendfile 在内核中直接复制。每写出一块都会检查大小、文件数与时限，
+超限立即停止。遇到本模块不处理的内容（加密 zip、不支持的压缩方法、链接与设备文件、
+不安全的路径等）时抛出 UnsupportedArchive，由调用方回退到 7z。
+"""
+import bz2
+import gzip
+import locale
+import lzma
+import os
+import re
+import stat
+import sys
+import tarfile
+import time
+import zipfile
+from typing import Callable, List, Optional
+
+from archive_headers import sniff_archive_type, SNIFF_SIZE
+
+__all__ = [
+    'StreamExtractor', 'detect_stream_format',
+    'UnsupportedArchive', 'ExtractionLimitExceeded', 'ExtractionTimeout',
+]
+
+COPY_CHUNK_SIZE = 1024 * 1024      # 每次复制的块大小（字节），也是检查限制的粒度
+ZIP_UTF8_FLAG = 0x800
+ZIP_ENCRYPTED_FLAG = 0x1
+ZIP_METHODS = {zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED, zipfile.ZIP_BZIP2, zipfile.ZIP_LZMA}
+SINGLE_FILE_OPENERS = {'gz': gzip.open, 'bz2': bz2.open, 'xz': lzma.open, 'lzma': lzma.open}
+SINGLE_FILE_SUFFIXES = ('.gz', '.bz2', '.xz', '.lzma')
+WINDOWS_INVALID_CHARS = re.compile(r'[<>:"|?*\x00-\x1f]')
+
+
+class UnsupportedArchive(Exception):
+    """内容超出本模块支持范围，需回退到 7z"""
+
+
+class ExtractionLimitExceeded(Exception):
+    """写出的大小或文件数超出限制"""
+
+
+class ExtractionTimeout(Exception):
+    """超过解压时限"""
+
+
+def detect_stream_format(path: str) -> Optional[str]:
+    """
+    按文件头判断能否进程内解压，返回 'zip'、'tar'、'tar-stream'（压缩的 tar）、
+    'gz'/'bz2'/'xz'/'lzma'（单文件压缩）；不支持时返回 None。
+    """
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(SNIFF_SIZE)
+    except OSError:
+        return None
+    sniffed = sniff_archive_type(head)
+    if sniffed is None:
+        return None
+    kind = sniffed[0]
+    if kind in ('zip', 'tar'):
+        return kind
+    if kind not in SINGLE_FILE_OPENERS:
+        return None
+    # 解压出开头一个块，判断内层是否为 tar
+    try:
+        with SINGLE_FILE_OPENERS[kind](path, 'rb') as f:
+            inner = f.read(SNIFF_SIZE)
+    except (OSError, EOFError, lzma.LZMAError):
+        return None
+    if inner[257:262] == b'ustar' and kind != 'lzma':
+        return 'tar-stream'
+    return kind
+
+
+def _kernel_copy_function() -> Optional[Callable[[int, int, int, int], int]]:
+    """返回 (src_fd, dst_fd, offset, count) -> 复制字节数 的内核复制函数，不支持时返回 None"""
+    if hasattr(os, 'copy_file_range'):
+        return lambda src_fd, dst_fd, offset, count: os.copy_file_range(src_fd, dst_fd, count, offset)
+    if sys.platform.startswith('linux') and hasattr(os, 'sendfile'):
+        return lambda src_fd, dst_fd, offset, count: os.sendfile(dst_fd, src_fd, offset, count)
+    return None
+
+
+def _safe_relpath(name: str) -> str:
+    """把条目名转为安全的相对路径；绝对路径、盘符、“..”或非法字符交给 7z 处理"""
+    parts = [part for part in re.split(r'[\\/]+', name) if part not in ('', '.')]
+    if not parts or '..' in parts or re.match(r'^[A-Za-z]:', parts[0]) or name.startswith(('/', '\\')):
+        raise UnsupportedArchive(f"unsafe entry path: {name!r}")
+    if os.name == 'nt' and any(WINDOWS_INVALID_CHARS.search(part) for part in parts):
+        raise UnsupportedArchive(f"entry name not valid on Windows: {name!r}")
+    return os.path.join(*parts)
+
+
+def _zip_member_name(info: zipfile.ZipInfo) -> str:
+    """未设置 UTF-8 标志的非 ASCII 文件名依次按 UTF-8、系统编码解码（zipfile 默认按 cp437）"""
+    name = info.filename
+    if info.flag_bits & ZIP_UTF8_FLAG or name.isascii():
+        return name
+    raw = name.encode('cp437')
+    for encoding in ('utf-8', locale.getpreferredencoding(False)):
+        try:
+            return raw.decode(encoding)
+        except (UnicodeDecodeError, LookupError):
+            continue
+    return name
+
+
+class StreamExtractor:
+    """
+    把一个压缩包解压到 out_dir。written 按写出顺序记录相对路径，
+    bytes_written / files_written 为已写出的字节数与文件数；on_chunk(bytes_written) 在每块写出后调用。
+    """
+
+    def __init__(
+        self,
+        out_dir: str,
+        max_bytes: int,
+        max_files: int,
+        guard: bool = True,
+        timeout: Optional[float] = None,
+        on_chunk: Optional[Callable[[int], None]] = None
+    ):
+        self.out_dir = out_dir
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.guard = guard
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.on_chunk = on_chunk
+        self.written: List[str] = []
+        self.bytes_written = 0
+        self.files_written = 0
+
+    def extract(self, path: str, fmt: Optional[str] = None) -> None:
+        """按格式解压；fmt 为 detect_stream_format() 的结果，省略时重新识别"""
+        fmt = fmt or detect_stream_format(path)
+        if fmt == 'zip':
+            self._extract_zip(path)
+        elif fmt == 'tar':
+            self._extract_tar(path, 'r:')
+        elif fmt == 'tar-stream':
+            self._extract_tar(path, 'r|*')
+        elif fmt in SINGLE_FILE_OPENERS:
+            self._extract_single(path, fmt)
+        else:
+            raise UnsupportedArchive(f"unsupported format: {fmt}")
+
+    # ---------------- 限制检查 ----------------
+
+    def _check(self, extra_bytes: int = 0) -> None:
+        if self.guard:
+            total = self.bytes_written + extra_bytes
+            if total > self.max_bytes:
+                raise ExtractionLimitExceeded(f"Runtime size limit exceeded (>{total / (1024**3):.2f} GB written)")
+            if self.files_written > self.max_files:
+                raise ExtractionLimitExceeded(f"Runtime file limit exceeded (>{self.max_files} files written)")
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise ExtractionTimeout("extraction timeout")
+
+    def _advance(self, size: int) -> None:
+        self.bytes_written += size
+        self._check()
+        if self.on_chunk is not None:
+            self.on_chunk(self.bytes_written)
+
+    def _begin_file(self, rel: str, size_hint: int = 0) -> str:
+        """登记即将写出的文件，按声明的大小提前检查限制，返回目标路径"""
+        self.files_written += 1
+        self._check(size_hint)
+        dest = os.path.join(self.out_dir, rel)
+        os.makedirs(os.path.dirname(dest) or self.out_dir, exist_ok=True)
+        self.written.append(rel)
+        return dest
+
+    def _make_dir(self, rel: str) -> None:
+        os.makedirs(os.path.join(self.out_dir, rel), exist_ok=True)
+        self.written.append(rel)
+
+    # ---------------- 复制 ----------------
+
+    def _copy_stream(self, src, dst) -> None:
+        """有界缓冲的流式复制"""
+        view = memoryview(bytearray(COPY_CHUNK_SIZE))
+        while True:
+            n = src.readinto(view)
+            if not n:
+                return
+            dst.write(view[:n])
+            self._advance(n)
+
+    def _copy_range(self, src_fd: int, dst_fd: int, offset: int, length: int) -> None:
+        """从 src_fd 的 offset 处复制 length 字节；系统支持时在内核中完成，不经过用户态缓冲"""
+        kernel_copy = _kernel_copy_function()
+        while length > 0:
+            count = min(length, COPY_CHUNK_SIZE)
+            copied = 0
+            if kernel_copy is not None:
+                try:
+                    copied = kernel_copy(src_fd, dst_fd, offset, count)
+                except OSError:
+                    # 跨文件系统、不支持的文件系统等：改用普通读写
+                    kernel_copy = None
+            if not copied:
+                data = os.pread(src_fd, count, offset)
+                if not data:
+                    raise EOFError("unexpected end of archive data")
+                os.write(dst_fd, data)
+                copied = len(data)
+            offset += copied
+            length -= copied
+            self._advance(copied)
+
+    # ---------------- 各格式 ----------------
+
+    def _extract_zip(self, path: str) -> None:
+        with zipfile.ZipFile(path) as zf:
+            infos = zf.infolist()
+            for info in infos:
+                if info.flag_bits & ZIP_ENCRYPTED_FLAG:
+                    raise UnsupportedArchive("encrypted zip entry")
+                if info.compress_type not in ZIP_METHODS:
+                    raise UnsupportedArchive(f"zip compression method {info.compress_type}")
+                if info.create_system == 3 and stat.S_ISLNK(info.external_attr >> 16):
+                    raise UnsupportedArchive("zip symlink entry")
+            for info in infos:
+                rel = _safe_relpath(_zip_member_name(info))
+                if info.is_dir():
+                    self._make_dir(rel)
+                    continue
+                dest = self._begin_file(rel, info.file_size)
+                with zf.open(info) as src, open(dest, 'wb') as dst:
+                    self._copy_stream(src, dst)
+                mode = (info.external_attr >> 16) & 0o777 if info.create_system == 3 else 0
+                self._finish_file(dest, info.date_time + (0, 0, -1), mode)
+
+    def _extract_tar(self, path: str, mode: str) -> None:
+        with open(path, 'rb') as raw, tarfile.open(fileobj=raw, mode=mode) as tf:
+            for member in tf:
+                rel = _safe_relpath(member.name)
+                if member.isdir():
+                    self._make_dir(rel)
+                    continue
+                if not member.isreg():
+                    raise UnsupportedArchive(f"tar entry type {member.type!r}")
+                dest = self._begin_file(rel, member.size)
+                with open(dest, 'wb') as dst:
+                    if mode == 'r:' and not member.sparse and hasattr(os, 'pread'):
+                        # 未压缩 tar：数据就在原文件中，直接按偏移复制
+                        self._copy_range(raw.fileno(), dst.fileno(), member.offset_data, member.size)
+                    else:
+                        self._copy_stream(tf.extractfile(member), dst)
+                self._finish_file(dest, member.mtime, member.mode & 0o777)
+
+    def _extract_single(self, path: str, fmt: str) -> None:
+        name = os.path.basename(path)
+        lower = name.lower()
+        suffix = next((s for s in SINGLE_FILE_SUFFIXES if lower.endswith(s)), '')
+        rel = name[:len(name) - len(suffix)] if suffix and len(name) > len(suffix) else name + '.out'
+        dest = self._begin_file(rel)
+        with SINGLE_FILE_OPENERS[fmt](path, 'rb') as src, open(dest, 'wb') as dst:
+            self._copy_stream(src, dst)
+        self._finish_file(dest, os.path.getmtime(path), 0)
+
+    @staticmethod
+    def _finish_file(dest: str, mtime, mode: int) -> None:
+        """恢复修改时间（时间戳或本地时间元组）与 Unix 权限位，失败时忽略"""
+        try:
+            if isinstance(mtime, tuple):
+                mtime = time.mktime(mtime)
+            if mode and os.name == 'posix':
+                os.chmod(dest, mode | stat.S_IRUSR | stat.S_IWUSR)
+            os.utime(dest, (mtime, mtime))
+        except (OSError, OverflowError, ValueError):
+            pass